@@ -27,13 +27,18 @@ __appname__ = 'edlio'
 __version__ = '0.3.5'
 
 import os
+import asyncio
+import functools
+import concurrent.futures
 from pathlib import Path
 
 import pint
-import tomlkit as toml
 
 from .unit import EDLError
+from .walk import iter_units
 from .group import EDLGroup
+from .index import MetadataIndex
+from .utils import load_toml
 from .dataset import EDLDataset, EDLDataFile, EDLDataPart
 from .collection import EDLCollection
 
@@ -47,6 +52,8 @@ __all__ = [
     'EDLDataFile',
     'EDLDataPart',
     'load',
+    'aload',
+    'iter_units',
 ]
 
 
@@ -55,7 +62,13 @@ ureg = pint.get_application_registry()
 Q_ = ureg.Quantity
 
 
-def load(path: str | os.PathLike[str]) -> EDLCollection | EDLGroup | EDLDataset:
+def load(
+    path: str | os.PathLike[str],
+    *,
+    lazy: bool = False,
+    use_index: bool = True,
+    jobs: int | None = None,
+) -> EDLCollection | EDLGroup | EDLDataset:
     """
     Open an EDL unit via its filesystem path.
 
@@ -68,6 +81,17 @@ def load(path: str | os.PathLike[str]) -> EDLCollection | EDLGroup | EDLDataset:
     ----------
     path
         The filesystem location of the EDL unit.
+    lazy
+        Only load the children of collections and groups once they are accessed.
+        This makes opening large collections fast, if only a part of them is used.
+    use_index
+        Take metadata from the index file of a collection, if it has one (see
+        :meth:`EDLCollection.write_index`). Only units that changed since the index
+        was written are read from their own files.
+    jobs
+        Number of threads to read metadata files of sibling units with.
+        Reading files in parallel speeds up loading large trees from network
+        filesystems with a high latency, like NFS or CephFS.
 
     Returns
     -------
@@ -76,12 +100,15 @@ def load(path: str | os.PathLike[str]) -> EDLCollection | EDLGroup | EDLDataset:
     """
 
     path = Path(path)
-    mf_path = path / 'manifest.toml'
-    if not mf_path.is_file():
-        raise EDLError('The directory "{}" is no valid EDL unit.'.format(path))
-
-    with open(mf_path, 'r', encoding='utf-8') as f:
-        mf = toml.load(f)
+    index = MetadataIndex.read(path) if use_index else None
+    entry = index.lookup(path.resolve()) if index else None
+    if entry is not None:
+        mf = entry['manifest']
+    else:
+        mf_path = path / 'manifest.toml'
+        if not mf_path.is_file():
+            raise EDLError('The directory "{}" is no valid EDL unit.'.format(path))
+        mf = load_toml(mf_path)
 
     unit_type = mf.get('type')
     unit: EDLCollection | EDLGroup | EDLDataset
@@ -94,5 +121,31 @@ def load(path: str | os.PathLike[str]) -> EDLCollection | EDLGroup | EDLDataset:
     else:
         raise EDLError('EDL unit type "{}" is unknown, data can not be loaded.'.format(unit_type))
 
-    unit.load(path, mf)
+    if isinstance(unit, EDLGroup):
+        attrs = entry['attributes'] or {} if entry is not None else None
+        unit.load(path, mf, lazy=lazy, attrs=attrs, index=index, jobs=jobs)
+    else:
+        unit.load(path, mf)
     return unit
+
+
+async def aload(
+    path: str | os.PathLike[str],
+    *,
+    lazy: bool = False,
+    use_index: bool = True,
+    jobs: int | None = None,
+    executor: concurrent.futures.Executor | None = None,
+) -> EDLCollection | EDLGroup | EDLDataset:
+    """
+    Open an EDL unit via its filesystem path asynchronously.
+
+    This is the asynchronous variant of :func:`load`, which reads all files in
+    :executor (or the default executor of the event loop), so the event loop
+    is not blocked while a large tree is loaded.
+    See :func:`load` for a description of the other parameters.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(load, path, lazy=lazy, use_index=use_index, jobs=jobs)
+    )
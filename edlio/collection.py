@@ -18,6 +18,7 @@
 # along with this software.  If not, see <http://www.gnu.org/licenses/>.
 
 from .group import EDLGroup
+from .index import INDEX_FNAME, write_index
 
 
 class EDLCollection(EDLGroup):
@@ -69,3 +70,19 @@ class EDLCollection(EDLGroup):
             parts.append(str(self.collection_id)[-8:])
 
         return '_'.join(parts).replace(' ', '')
+
+    def write_index(self) -> None:
+        """
+        Write a metadata index file for this collection.
+
+        The index contains the metadata of all units of this collection, so the
+        collection can be opened by reading just this one file. Units which changed
+        after the index was written are detected and read from their own files.
+        Once an index exists, it is updated whenever the whole collection is saved.
+        """
+        write_index(self.path)
+
+    def save(self) -> None:
+        EDLGroup.save(self)
+        if (self.path / INDEX_FNAME).is_file():
+            self.write_index()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Matthias Klumpp <matthias@tenstral.net>
+#
+# Licensed under the GNU Lesser General Public License Version 3
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the license, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this software.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Transparent reading of compressed data parts.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import queue
+import typing as T
+import threading
+
+# File extensions of compressed parts, and the compression method they indicate
+COMPRESSION_EXTENSIONS = {
+    'zst': 'zstd',
+    'gz': 'gzip',
+}
+
+# Media types of compressed data, which need the file type to determine the content
+COMPRESSION_MEDIA_TYPES = {
+    'application/zstd': 'zstd',
+    'application/gzip': 'gzip',
+}
+
+
+def compression_of(fname: os.PathLike[str] | str) -> str | None:
+    """Get the compression method of a file from its name, or None if it is not compressed."""
+    _, ext = os.path.splitext(str(fname))
+    return COMPRESSION_EXTENSIONS.get(ext[1:])
+
+
+def strip_compression_ext(file_type: str) -> str:
+    """Remove a compression extension from a file type, e.g. ``csv.zst`` -> ``csv``."""
+    base, _, ext = file_type.rpartition('.')
+    if base and ext in COMPRESSION_EXTENSIONS:
+        return base
+    return file_type
+
+
+def file_type_of(fname: os.PathLike[str] | str) -> str:
+    """Get the file type of a part from its name, keeping compression extensions (``csv.zst``)."""
+    root, ext = os.path.splitext(os.path.basename(str(fname)))
+    ext = ext[1:]
+    if ext in COMPRESSION_EXTENSIONS:
+        _, inner_ext = os.path.splitext(root)
+        if inner_ext:
+            return inner_ext[1:] + '.' + ext
+    return ext
+
+
+class _ReadAheadStream(io.RawIOBase):
+    """Read a stream in a background thread, ahead of its consumer.
+
+    Decompressors release the GIL while they work, so this lets decompression
+    run in parallel to parsing the data that was already decompressed.
+    """
+
+    def __init__(self, source: T.BinaryIO, chunk_size: int = 1024 * 1024, depth: int = 4):
+        super().__init__()
+        self._source = source
+        self._chunk_size = chunk_size
+        self._queue: queue.Queue[bytes | BaseException | None] = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._pending = memoryview(b'')
+        self._done = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: bytes | BaseException | None) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(self._chunk_size)
+                if not chunk:
+                    break
+                if not self._put(chunk):
+                    return
+            self._put(None)
+        except BaseException as e:
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: T.Any) -> int:
+        if not self._pending:
+            if self._done:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._done = True
+                return 0
+            if isinstance(item, BaseException):
+                self._done = True
+                raise item
+            self._pending = memoryview(item)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._stop.set()
+        # unblock the reader thread, in case it waits for space in the queue
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._source.close()
+        super().close()
+
+
+def open_part(
+    fname: os.PathLike[str] | str,
+    mode: str = 'rb',
+    *,
+    encoding: str = 'utf-8',
+    newline: str | None = None,
+    read_ahead: bool = True,
+) -> T.IO[T.Any]:
+    """Open a data part for reading, transparently decompressing it if needed.
+
+    Compressed parts are decompressed as a stream, and unless :read_ahead is
+    disabled, decompression happens in a background thread.
+
+    Parameters
+    ----------
+    fname
+        Path of the part to open.
+    mode
+        Either ``rb`` for binary or ``r`` for text mode.
+    encoding
+        Text encoding, in text mode.
+    newline
+        Newline handling, in text mode (see :func:`open`).
+    read_ahead
+        Decompress data in a background thread, ahead of it being read.
+    """
+    if mode not in ('r', 'rb'):
+        raise ValueError(
+            'Data parts can only be opened for reading, not with mode "{}"'.format(mode)
+        )
+    text = mode == 'r'
+
+    method = compression_of(fname)
+    if method is None:
+        if text:
+            return open(fname, 'r', encoding=encoding, newline=newline)
+        return open(fname, 'rb')
+
+    stream: T.BinaryIO
+    if method == 'zstd':
+        try:
+            import zstandard as zstd
+        except ImportError as e:
+            raise ImportError(
+                'Missing optional dependency "zstandard". Please install it with pip!'
+            ) from e
+
+        dctx = zstd.ZstdDecompressor()
+        stream = T.cast(T.BinaryIO, dctx.stream_reader(open(fname, 'rb'), closefd=True))
+    else:
+        import gzip
+
+        stream = T.cast(T.BinaryIO, gzip.open(fname, 'rb'))
+
+    if read_ahead:
+        stream = T.cast(T.BinaryIO, _ReadAheadStream(stream))
+    buffered = io.BufferedReader(T.cast(T.Any, stream), buffer_size=256 * 1024)
+    if text:
+        return io.TextIOWrapper(buffered, encoding=encoding, newline=newline)
+    return buffered
@@ -19,31 +19,558 @@
 
 from __future__ import annotations
 
+import io
+import os
 import csv
 import typing as T
+import itertools
 from pathlib import Path
 
+import numpy as np
+
+from .tabular import (
+    TimeRange,
+    slice_arrow,
+    slice_arrays,
+    column_indices,
+    import_pyarrow,
+    arrays_to_arrow,
+    slice_dataframe,
+    time_after_range,
+    time_before_range,
+    time_column_index,
+    compact_dataframes,
+    overlaps_time_range,
+)
+from .compressed import open_part, compression_of
+from .decodecache import (
+    CacheSetting,
+    ColumnWriter,
+    load_columns,
+    store_columns,
+    columns_to_frame,
+    frame_to_columns,
+)
+
 if T.TYPE_CHECKING:
     import pandas as pd
+    import pyarrow as pa
+
+# Types that are tried in order when guessing the type of a CSV column
+_INFER_DTYPES = (np.dtype(np.int64), np.dtype(np.float64), np.dtype(np.str_))
+
+
+class _WidenToStr(Exception):
+    """Raised internally if a column needs to be re-read as text."""
+
+    def __init__(self, column: str):
+        self.column = column
+        super().__init__(column)
+
+
+def _convert_values(values: T.Sequence[str], dtype: np.dtype) -> np.ndarray:
+    if dtype.kind == 'U':
+        return np.array(values, dtype=np.str_)
+    return np.array(values, dtype=np.str_).astype(dtype)
+
+
+def _parse_csv_line(line: bytes) -> list[str]:
+    return next(csv.reader(io.StringIO(line.decode('utf-8')), delimiter=';'), [])
+
+
+def _probe_time_bounds(fname: Path, time_column: str | None) -> tuple[float, float] | None:
+    """Read the times of the first and last row of a CSV file, without reading the rest.
+
+    Returns None if the bounds could not be determined.
+    """
+    if compression_of(fname):
+        # we can not seek to the end of compressed data cheaply
+        return None
+    try:
+        with open(fname, 'rb') as f:
+            header = _parse_csv_line(f.readline())
+            first_row = _parse_csv_line(f.readline())
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 64 * 1024))
+            tail_lines = [line for line in f.read().splitlines() if line.strip()]
+        if not first_row or not tail_lines:
+            return None
+        last_row = _parse_csv_line(tail_lines[-1])
+        ti = time_column_index(header, time_column, fname)
+        return float(first_row[ti]), float(last_row[ti])
+    except (ValueError, IndexError, UnicodeDecodeError):
+        return None
+
+
+def _part_in_time_range(fname: Path, time_range: TimeRange | None, time_column: str | None) -> bool:
+    if time_range is None:
+        return True
+    bounds = _probe_time_bounds(fname, time_column)
+    if bounds is None:
+        return True
+    return overlaps_time_range(bounds[0], bounds[1], time_range)
+
+
+def _iter_rows_in_range(
+    reader: T.Iterator[list[str]], time_index: int, time_range: TimeRange, fname: Path
+) -> T.Iterator[list[str]]:
+    """Yield the rows of a time-sorted table within :time_range, stopping early at its end."""
+    for row_no, row in enumerate(reader, start=2):
+        try:
+            t = float(row[time_index])
+        except (ValueError, IndexError):
+            raise ValueError(
+                'CSV file "{}" is malformed: Invalid time value in row {}.'.format(fname, row_no)
+            ) from None
+        if time_before_range(t, time_range):
+            continue
+        if time_after_range(t, time_range):
+            break
+        yield row
+
+
+def _read_csv_arrays_once(
+    fname: Path,
+    dtypes: T.Mapping[str, T.Any],
+    block_rows: int,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+) -> dict[str, np.ndarray]:
+    with open_part(fname, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter=';')
+        all_names = next(reader, None)
+        if all_names is None:
+            return {}
+        selected = column_indices(all_names, columns, fname)
+        names = [all_names[i] for i in selected]
+
+        rows_iter: T.Iterator[list[str]] = reader
+        if time_range is not None:
+            time_index = time_column_index(all_names, time_column, fname)
+            rows_iter = _iter_rows_in_range(reader, time_index, time_range, fname)
+
+        col_dtypes = [np.dtype(dtypes[n]) if n in dtypes else None for n in names]
+        blocks: list[list[np.ndarray]] = [[] for _ in names]
+        row_no = 1
+        while True:
+            # parse the table block by block, so only a bounded number of rows
+            # exists as Python strings at any time
+            rows = list(itertools.islice(rows_iter, block_rows))
+            if not rows:
+                break
+            for i, row in enumerate(rows):
+                if len(row) != len(all_names):
+                    raise ValueError(
+                        'CSV file "{}" is malformed: Row {} has {} fields, expected {}.'.format(
+                            fname, row_no + i + 1, len(row), len(all_names)
+                        )
+                    )
+            row_no += len(rows)
+
+            # only the selected columns are ever converted
+            for col, src_col in enumerate(selected):
+                values = [row[src_col] for row in rows]
+                name = names[col]
+                dtype = col_dtypes[col]
+                if dtype is not None and (name in dtypes or dtype.kind == 'U'):
+                    try:
+                        blocks[col].append(_convert_values(values, dtype))
+                    except ValueError as e:
+                        raise ValueError(
+                            'Unable to read column "{}" of "{}" as {}: {}'.format(
+                                name, fname, dtype, str(e)
+                            )
+                        ) from e
+                    continue
+
+                # guess the column type, widening it if the previous guess was too narrow
+                start = 0 if dtype is None else _INFER_DTYPES.index(dtype)
+                for cand in _INFER_DTYPES[start:]:
+                    try:
+                        arr = _convert_values(values, cand)
+                    except ValueError:
+                        continue
+                    if cand.kind == 'U' and blocks[col]:
+                        # converting already parsed numbers back to text is lossy,
+                        # so we need to read this column as text from the start
+                        raise _WidenToStr(name)
+                    if cand != dtype:
+                        blocks[col] = [b.astype(cand) for b in blocks[col]]
+                        col_dtypes[col] = cand
+                    blocks[col].append(arr)
+                    break
+
+    result = {}
+    for col, name in enumerate(names):
+        if blocks[col]:
+            result[name] = np.concatenate(blocks[col])
+        else:
+            dtype = col_dtypes[col]
+            result[name] = np.empty(0, dtype=dtype if dtype is not None else np.str_)
+    return result
+
+
+def _read_csv_arrays(
+    fname: Path,
+    dtypes: T.Mapping[str, T.Any] | None,
+    block_rows: int = 65536,
+    columns: T.Sequence[str] | None = None,
+    time_range: TimeRange | None = None,
+    time_column: str | None = None,
+) -> dict[str, np.ndarray]:
+    """Read a semicolon-separated CSV file into a dictionary of typed column arrays.
+
+    The first row is used as header. Column types are taken from :dtypes if set,
+    otherwise they are guessed as integer, floating-point or text (in that order).
+    """
+    dtypes = dict(dtypes) if dtypes else {}
+    while True:
+        try:
+            return _read_csv_arrays_once(
+                fname, dtypes, block_rows, columns, time_range, time_column
+            )
+        except _WidenToStr as e:
+            dtypes[e.column] = np.str_
+
+
+def _read_csv_rows(
+    fname: Path,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+) -> T.Iterator[list[str]]:
+    with open_part(fname, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter=';')
+        header = next(reader, None)
+        if header is None:
+            return
+        if columns is None and time_range is None:
+            yield header
+            yield from reader
+            return
+
+        selected = column_indices(header, columns, fname)
+        yield [header[i] for i in selected]
+        rows_iter: T.Iterator[list[str]] = reader
+        if time_range is not None:
+            time_index = time_column_index(header, time_column, fname)
+            rows_iter = _iter_rows_in_range(reader, time_index, time_range, fname)
+        for row in rows_iter:
+            yield [row[i] for i in selected]
+
+
+def _limit_chunksize(sample: pd.DataFrame, chunksize: int | None, max_memory: int) -> int:
+    """Limit the rows per chunk, so a chunk of rows like in :sample fits into :max_memory."""
+    if len(sample) == 0:
+        return chunksize or 1
+    row_bytes = int(sample.memory_usage(deep=True).sum()) / len(sample)
+    max_rows = max(1, int(max_memory // row_bytes))
+    return min(chunksize, max_rows) if chunksize else max_rows
+
+
+def _read_cached_arrays(
+    fname: Path, dtypes: T.Mapping[str, T.Any] | None, cache: CacheSetting
+) -> dict[str, np.ndarray]:
+    options = {'dtypes': {k: np.dtype(v).str for k, v in dtypes.items()}} if dtypes else {}
+    cached = load_columns(fname, 'arrays', cache, options)
+    if cached is not None:
+        return cached[0]
+    arrays = _read_csv_arrays(fname, dtypes)
+    store_columns(fname, 'arrays', cache, arrays, options=options)
+    return arrays
+
+
+def _read_cached_dataframes(
+    fname: Path,
+    chunksize: int | None,
+    max_memory: int | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+    cache: CacheSetting,
+) -> T.Iterator[pd.DataFrame]:
+    import pandas as pd
+
+    cached = load_columns(fname, 'frame', cache)
+    if cached is not None:
+        # chunks of the memory-mapped columns are views, so memory stays bounded
+        df = columns_to_frame(*cached)
+    elif chunksize or max_memory:
+        yield from _read_and_cache_dataframes(
+            fname, chunksize, max_memory, columns, time_range, time_column, cache
+        )
+        return
+    else:
+        # the whole table is decoded and cached, so any selection can be served from it later
+        with open_part(fname, 'r', newline='') as f:
+            df = pd.read_csv(f, sep=';')
+        arrays = frame_to_columns(df)
+        if arrays is not None:
+            store_columns(fname, 'frame', cache, arrays)
+    df = slice_dataframe(df, columns, time_range, time_column)
+
+    if max_memory:
+        chunksize = _limit_chunksize(df.iloc[:1000], chunksize, max_memory)
+    if not chunksize:
+        yield df
+        return
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start : start + chunksize]
+
+
+def _read_and_cache_dataframes(
+    fname: Path,
+    chunksize: int | None,
+    max_memory: int | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+    cache: CacheSetting,
+) -> T.Iterator[pd.DataFrame]:
+    """Read a part in chunks of bounded size, and fill the cache with all of its columns."""
+    import pandas as pd
+
+    if max_memory:
+        # all columns are decoded for the cache, so the sample must contain all of them too
+        with open_part(fname, 'r', newline='') as f:
+            sample = pd.read_csv(f, sep=';', nrows=1000)
+        chunksize = _limit_chunksize(sample, chunksize, max_memory)
+
+    writer = ColumnWriter(fname, 'frame', cache)
+    complete = False
+    try:
+        with (
+            open_part(fname, 'r', newline='') as f,
+            pd.read_csv(f, sep=';', chunksize=chunksize) as reader,
+        ):
+            for df in reader:
+                writer.append(frame_to_columns(df, ignore_index=True))
+                # the rest of the table is still read to be cached, even after the time range
+                df = slice_dataframe(df, columns, time_range, time_column)
+                if len(df) > 0 or time_range is None:
+                    yield df
+        complete = True
+    finally:
+        if complete:
+            writer.commit()
+        else:
+            writer.discard()
+
+
+def _read_dataframes(
+    fname: Path,
+    chunksize: int | None,
+    max_memory: int | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+) -> T.Iterator[pd.DataFrame]:
+    import pandas as pd
+
+    usecols: list[str] | None = None
+    if columns is not None:
+        usecols = list(columns)
+        if time_range is not None:
+            # we need the time column to select rows, even if it was not requested
+            with open_part(fname, 'r', newline='') as f:
+                header = next(csv.reader(f, delimiter=';'), [])
+            time_column = header[time_column_index(header, time_column, fname)]
+            if time_column not in usecols:
+                usecols.append(time_column)
+
+    if max_memory:
+        # estimate the in-memory size of a row from a small sample of the table
+        with open_part(fname, 'r', newline='') as f:
+            sample = pd.read_csv(f, sep=';', nrows=1000, usecols=usecols)
+        chunksize = _limit_chunksize(sample, chunksize, max_memory)
+
+    if not chunksize and time_range is None:
+        with open_part(fname, 'r', newline='') as f:
+            df = pd.read_csv(f, sep=';', usecols=usecols)
+        yield slice_dataframe(df, columns, None, None)
+        return
+
+    # pandas parses the header only once and applies it to every chunk
+    filtered = []
+    with (
+        open_part(fname, 'r', newline='') as f,
+        pd.read_csv(f, sep=';', usecols=usecols, chunksize=chunksize or 65536) as reader,
+    ):
+        for df in reader:
+            at_end = False
+            if time_range is not None and len(df) > 0:
+                times = df[time_column] if time_column is not None else df.iloc[:, 0]
+                # the table is sorted by time, nothing interesting can follow this chunk
+                at_end = time_after_range(times.iloc[-1], time_range)
+            df = slice_dataframe(df, columns, time_range, time_column)
+            if len(df) > 0 or time_range is None:
+                if chunksize:
+                    yield df
+                else:
+                    filtered.append(df)
+            if at_end:
+                break
+    if not chunksize:
+        if filtered:
+            yield pd.concat(filtered)
+        else:
+            with open_part(fname, 'r', newline='') as f:
+                empty = pd.read_csv(f, sep=';', usecols=usecols, nrows=0)
+            yield slice_dataframe(empty, columns, None, None)
+
+
+def _read_parts_dataframes(
+    part_paths: T.Iterable[Path],
+    chunksize: int | None,
+    max_memory: int | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+    cache: CacheSetting,
+) -> T.Iterator[pd.DataFrame]:
+    for fname in part_paths:
+        if not _part_in_time_range(fname, time_range, time_column):
+            continue
+        if cache:
+            yield from _read_cached_dataframes(
+                fname, chunksize, max_memory, columns, time_range, time_column, cache
+            )
+        else:
+            yield from _read_dataframes(
+                fname, chunksize, max_memory, columns, time_range, time_column
+            )
+
+
+def _read_arrow(
+    fname: Path,
+    dtypes: T.Mapping[str, T.Any] | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+) -> pa.Table:
+    """Read a CSV part into an Arrow table, using the native Arrow CSV parser."""
+    pa = import_pyarrow()
+    import pyarrow.csv as pa_csv
+
+    with open_part(fname, 'r', newline='') as f:
+        header = next(csv.reader(f, delimiter=';'), [])
+    include = [header[i] for i in column_indices(header, columns, fname)]
+    if time_range is not None:
+        # we need the time column to select rows, even if it was not requested
+        time_column = header[time_column_index(header, time_column, fname)]
+        if time_column not in include:
+            include.append(time_column)
+
+    column_types = {}
+    for name, dtype in (dtypes or {}).items():
+        if name in include:
+            dtype = np.dtype(dtype)
+            column_types[name] = pa.string() if dtype.kind == 'U' else pa.from_numpy_dtype(dtype)
+
+    batches = []
+    with (
+        open_part(fname, 'rb') as f,
+        pa_csv.open_csv(
+            f,
+            parse_options=pa_csv.ParseOptions(delimiter=';'),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=include, column_types=column_types
+            ),
+        ) as reader,
+    ):
+        schema = reader.schema
+        for batch in reader:
+            at_end = False
+            if time_range is not None and batch.num_rows > 0:
+                # the table is sorted by time, nothing interesting can follow this batch
+                last_time = batch.column(time_column)[batch.num_rows - 1].as_py()
+                at_end = time_after_range(last_time, time_range)
+                batch = slice_arrow(batch, None, time_range, time_column, fname)
+            if batch.num_rows > 0:
+                batches.append(batch)
+            if at_end:
+                break
+
+    table = pa.Table.from_batches(batches, schema=schema)
+    if columns is not None:
+        table = table.select(list(columns))
+    return table
 
 
 def load_data(
-    part_paths: T.Iterable[Path], aux_data_entries: T.Any, as_dataframe: bool = False
-) -> T.Iterator[pd.DataFrame | list[str]]:
+    part_paths: T.Iterable[Path],
+    aux_data_entries: T.Any,
+    as_dataframe: bool = False,
+    as_arrays: bool = False,
+    dtypes: T.Mapping[str, T.Any] | None = None,
+    chunksize: int | None = None,
+    max_memory: int | None = None,
+    columns: T.Sequence[str] | None = None,
+    time_range: TimeRange | None = None,
+    time_column: str | None = None,
+    cache: CacheSetting = False,
+    as_arrow: bool = False,
+    compact: bool = False,
+) -> T.Iterator[pd.DataFrame | pa.Table | dict[str, np.ndarray] | list[str]]:
     """Entry point for automatic dataset loading.
 
     This function is used internally to load CSV data.
+    Compressed parts (e.g. ``*.csv.zst``) are decompressed transparently.
+
+    If :as_arrays is set, each part is returned as a dictionary of column name to
+    typed NumPy array. Column types can be set via :dtypes (mapping column names to
+    NumPy type names), and are guessed for all other columns.
+
+    If :as_dataframe is set together with :chunksize (a number of rows) or :max_memory
+    (an approximate size in bytes), every part is returned as a series of DataFrame chunks
+    of bounded size instead of one DataFrame per part.
+
+    If :compact is set as well, DataFrame columns are converted to the smallest lossless
+    types: Numbers are downcast, text columns with few distinct values become
+    categoricals, and the time column is kept as 64-bit integer. The types are chosen
+    from the first chunk and used for all following ones, see
+    :func:`edlio.dataio.tabular.compact_dataframes`.
+
+    Only the :columns listed are returned, if set. If :time_range is set to a
+    ``(start, end)`` tuple, only rows with a time of at least start and less than end
+    are returned. Times are read from :time_column, or the first column by default,
+    and must be sorted in ascending order. Parts that do not overlap with the range
+    at all are skipped without being parsed.
+
+    If :as_arrow is set, each part is returned as a :class:`pyarrow.Table`, parsed
+    directly by Arrow. Column types can be set via :dtypes as well.
+
+    If :cache is set, the decoded columns of each part are cached on disk when reading
+    it as arrays, Arrow table or DataFrame, and are memory-mapped on later reads instead of parsing
+    the part again. Set it to True to cache next to the data, or to a directory path
+    to keep the cache there. Cached arrays are read-only. DataFrames that are read
+    in chunks are cached chunk by chunk, so :max_memory still applies on a cache miss.
     """
 
     if as_dataframe:
-        import pandas as pd
+        dfs = _read_parts_dataframes(
+            part_paths, chunksize, max_memory, columns, time_range, time_column, cache
+        )
+        # compact types are chosen once, so all chunks of all parts get the same ones
+        yield from compact_dataframes(dfs, time_column) if compact else dfs
+        return
 
-        for fname in part_paths:
-            df = pd.read_csv(fname, sep=';')
-            yield df
-    else:
-        for fname in part_paths:
-            with open(fname, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f, delimiter=';')
-                for row in reader:
-                    yield row
+    for fname in part_paths:
+        if not _part_in_time_range(fname, time_range, time_column):
+            continue
+        if as_arrow and cache:
+            arrays = _read_cached_arrays(fname, dtypes, cache)
+            yield arrays_to_arrow(slice_arrays(arrays, columns, time_range, time_column, fname))
+        elif as_arrow:
+            yield _read_arrow(fname, dtypes, columns, time_range, time_column)
+        elif as_arrays and cache:
+            arrays = _read_cached_arrays(fname, dtypes, cache)
+            yield slice_arrays(arrays, columns, time_range, time_column, fname)
+        elif as_arrays:
+            yield _read_csv_arrays(
+                fname, dtypes, columns=columns, time_range=time_range, time_column=time_column
+            )
+        else:
+            yield from _read_csv_rows(fname, columns, time_range, time_column)
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Matthias Klumpp <matthias@tenstral.net>
+#
+# Licensed under the GNU Lesser General Public License Version 3
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the license, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this software.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+On-disk cache of decoded tabular data parts.
+
+Decoded columns of a part are stored as one ``.npy`` file per column, which are
+memory-mapped on later reads, so a cached table can be loaded without any parsing.
+Cache entries are only used as long as size, modification time and a hash of
+the head of the part file are unchanged.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import shutil
+import typing as T
+import logging as log
+from pathlib import Path
+
+import numpy as np
+from xxhash import xxh3_64
+
+if T.TYPE_CHECKING:
+    import pandas as pd
+
+# Name of the cache directory created next to the data parts, if no directory is set
+DECODE_CACHE_DIRNAME = '.edlio-cache'
+
+# Amount of bytes at the start of a file that are hashed to detect content changes
+_HEAD_HASH_SIZE = 64 * 1024
+
+# Cache settings as accepted by the loaders: Either a boolean to enable or disable
+# caching next to the data, or the directory to store cache entries in.
+CacheSetting = T.Union[bool, str, os.PathLike]
+
+
+def _fingerprint(fname: Path) -> dict[str, T.Any]:
+    st = os.stat(fname)
+    with open(fname, 'rb') as f:
+        head_hash = xxh3_64(f.read(_HEAD_HASH_SIZE)).hexdigest()
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'head_xxh3': head_hash}
+
+
+def _entry_dir(fname: Path, kind: str, cache: CacheSetting) -> Path:
+    if cache is True:
+        root = fname.parent / DECODE_CACHE_DIRNAME
+        return root / '{}.{}'.format(fname.name, kind)
+    # a shared cache directory may hold entries for parts of many datasets,
+    # so we need the full path to tell them apart
+    path_hash = xxh3_64(str(fname.resolve()).encode('utf-8')).hexdigest()
+    return Path(T.cast(T.Any, cache)) / '{}-{}.{}'.format(fname.name, path_hash, kind)
+
+
+def load_columns(
+    fname: Path, kind: str, cache: CacheSetting, options: dict[str, T.Any] | None = None
+) -> tuple[dict[str, np.ndarray], dict[str, T.Any]] | None:
+    """Load the cached columns of a part.
+
+    Parameters
+    ----------
+    fname
+        Path of the data part.
+    kind
+        Kind of decoded data, as the same part may be decoded in different ways.
+    cache
+        The cache setting passed to the loader.
+    options
+        Decoding options the cached data must have been created with.
+
+    Returns
+    -------
+    A tuple of read-only, memory-mapped column arrays and table attributes,
+    or None if no valid cache entry exists.
+    """
+    if not cache:
+        return None
+    edir = _entry_dir(fname, kind, cache)
+    try:
+        with open(edir / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('key') != _fingerprint(fname) or meta.get('options') != (options or {}):
+            return None
+        columns = {}
+        for i, name in enumerate(meta['columns']):
+            columns[name] = np.load(edir / '{}.npy'.format(i), mmap_mode='r', allow_pickle=False)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        log.debug('Ignoring unreadable decode cache entry {}: {}'.format(edir, e))
+        return None
+
+    return columns, meta.get('attrs', {})
+
+
+def store_columns(
+    fname: Path,
+    kind: str,
+    cache: CacheSetting,
+    columns: T.Mapping[str, np.ndarray],
+    attrs: T.Mapping[str, T.Any] | None = None,
+    options: dict[str, T.Any] | None = None,
+) -> bool:
+    """Store decoded columns of a part in the cache.
+
+    Columns of object type can not be memory-mapped, so tables containing
+    them are not cached.
+
+    Returns
+    -------
+    True if the columns were stored.
+    """
+    if not cache:
+        return False
+    if any(arr.dtype.hasobject for arr in columns.values()):
+        log.debug('Not caching decoded data of {}: It contains Python objects.'.format(fname))
+        return False
+    edir = _entry_dir(fname, kind, cache)
+    tmp_dir = edir.with_name('{}.tmp-{}'.format(edir.name, os.getpid()))
+    try:
+        meta = {
+            'key': _fingerprint(fname),
+            'options': options or {},
+            'columns': list(columns.keys()),
+            'attrs': dict(attrs) if attrs else {},
+        }
+        json_meta = json.dumps(meta)
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        for i, arr in enumerate(columns.values()):
+            np.save(tmp_dir / '{}.npy'.format(i), np.ascontiguousarray(arr), allow_pickle=False)
+        with open(tmp_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            f.write(json_meta)
+
+        # replace the entry as a whole, so readers never see a partially written one
+        if edir.exists():
+            shutil.rmtree(edir)
+        os.replace(tmp_dir, edir)
+    except (OSError, TypeError, ValueError) as e:
+        # the dataset may live on read-only storage, caching is optional
+        log.debug('Unable to write decode cache entry {}: {}'.format(edir, e))
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+    return True
+
+
+# Size of the .npy headers written by ColumnWriter, which must not change once
+# data has been written after them (a multiple of 64, for aligned memory-mapping)
+_NPY_HEADER_SIZE = 128
+
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': ({},), }}".format(
+        np.lib.format.dtype_to_descr(dtype), length
+    )
+    # magic string, format version 1.0 and header length, followed by the padded header
+    header_len = _NPY_HEADER_SIZE - 10
+    if len(header) + 1 > header_len:
+        raise ValueError('Column type {} can not be cached.'.format(dtype))
+    return (
+        b'\x93NUMPY\x01\x00'
+        + header_len.to_bytes(2, 'little')
+        + header.ljust(header_len - 1).encode('latin1')
+        + b'\n'
+    )
+
+
+class ColumnWriter:
+    """Store decoded columns of a part in the cache incrementally, block by block.
+
+    This keeps memory usage bounded when a large part is read in chunks. Every block
+    must have the same columns with the same types, except for text columns, whose
+    width may vary. Otherwise, caching is given up and nothing is stored.
+    """
+
+    def __init__(
+        self,
+        fname: Path,
+        kind: str,
+        cache: CacheSetting,
+        options: dict[str, T.Any] | None = None,
+    ):
+        self._fname = fname
+        self._kind = kind
+        self._cache = cache
+        self._options = options or {}
+        self._edir = _entry_dir(fname, kind, cache)
+        self._tmp_dir = self._edir.with_name('{}.tmp-{}'.format(self._edir.name, os.getpid()))
+        self._names: list[str] | None = None
+        self._files: list[T.BinaryIO] = []
+        # type and row count of every block written, per column
+        self._blocks: list[list[tuple[np.dtype, int]]] = []
+        self._failed = False
+        try:
+            # take the fingerprint first, so changes made while we read invalidate the entry
+            self._key: dict[str, T.Any] | None = _fingerprint(fname)
+        except OSError:
+            self._key = None
+            self._failed = True
+
+    def _fail(self, reason: str) -> None:
+        log.debug('Not caching decoded data of {}: {}'.format(self._fname, reason))
+        self._failed = True
+        self._close_files()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def _close_files(self) -> None:
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def append(self, columns: T.Mapping[str, np.ndarray] | None) -> None:
+        """Append a block of rows, or give up caching if :columns is None."""
+        if self._failed:
+            return
+        if columns is None:
+            self._fail('It can not be represented as plain arrays.')
+            return
+        try:
+            if self._names is None:
+                self._names = list(columns.keys())
+                self._tmp_dir.mkdir(parents=True, exist_ok=True)
+                for i, arr in enumerate(columns.values()):
+                    f = open(self._tmp_dir / '{}.npy'.format(i), 'wb')
+                    self._files.append(f)
+                    f.write(_npy_header(arr.dtype, 0))
+                    self._blocks.append([])
+            elif list(columns.keys()) != self._names:
+                self._fail('Its columns changed between blocks.')
+                return
+
+            for i, arr in enumerate(columns.values()):
+                blocks = self._blocks[i]
+                if arr.dtype.hasobject:
+                    self._fail('It contains Python objects.')
+                    return
+                if (
+                    blocks
+                    and blocks[0][0] != arr.dtype
+                    and not (blocks[0][0].kind == 'U' and arr.dtype.kind == 'U')
+                ):
+                    self._fail('The type of column "{}" changed.'.format(self._names[i]))
+                    return
+                self._files[i].write(np.ascontiguousarray(arr).tobytes())
+                blocks.append((arr.dtype, len(arr)))
+        except (OSError, ValueError) as e:
+            self._fail(str(e))
+
+    def _finish_column(self, i: int) -> None:
+        blocks = self._blocks[i]
+        fname = self._tmp_dir / '{}.npy'.format(i)
+        length = sum(n for _, n in blocks)
+        dtypes = {dt for dt, _ in blocks}
+        if len(dtypes) <= 1:
+            dtype = blocks[0][0] if blocks else np.dtype(np.str_)
+            with open(fname, 'r+b') as f:
+                f.write(_npy_header(dtype, length))
+            return
+
+        # text blocks of different width need to be widened to a common type
+        dtype = max(dtypes, key=lambda dt: dt.itemsize)
+        wide_fname = fname.with_suffix('.wide')
+        with open(fname, 'rb') as src, open(wide_fname, 'wb') as dst:
+            src.seek(_NPY_HEADER_SIZE)
+            dst.write(_npy_header(dtype, length))
+            for block_dtype, n in blocks:
+                block = np.frombuffer(src.read(block_dtype.itemsize * n), dtype=block_dtype)
+                dst.write(block.astype(dtype).tobytes())
+        os.replace(wide_fname, fname)
+
+    def commit(self) -> bool:
+        """Finish writing the cache entry, after all blocks were appended.
+
+        Returns
+        -------
+        True if the columns were stored.
+        """
+        if self._failed:
+            return False
+        if self._names is None:
+            self._fail('No data was read.')
+            return False
+        self._close_files()
+        try:
+            for i in range(len(self._names)):
+                self._finish_column(i)
+            meta = {
+                'key': self._key,
+                'options': self._options,
+                'columns': self._names,
+                'attrs': {},
+            }
+            with open(self._tmp_dir / 'meta.json', 'w', encoding='utf-8') as f:
+                f.write(json.dumps(meta))
+            if self._edir.exists():
+                shutil.rmtree(self._edir)
+            os.replace(self._tmp_dir, self._edir)
+        except (OSError, ValueError) as e:
+            self._fail(str(e))
+            return False
+        return True
+
+    def discard(self) -> None:
+        """Give up caching, e.g. because reading was not completed."""
+        if not self._failed:
+            self._fail('Reading was not completed.')
+
+
+def frame_to_columns(df: pd.DataFrame, ignore_index: bool = False) -> dict[str, np.ndarray] | None:
+    """Convert a DataFrame to plain column arrays for caching.
+
+    Returns None if the DataFrame can not be represented losslessly that way.
+    If :ignore_index is set, the DataFrame may have any row index, which is not kept
+    (e.g. for chunks of a larger table).
+    """
+    import pandas as pd
+
+    if not isinstance(df.index, pd.RangeIndex) or df.index.step != 1:
+        return None
+    if df.index.start != 0 and not ignore_index:
+        return None
+    if not all(isinstance(c, str) for c in df.columns) or df.columns.has_duplicates:
+        return None
+
+    columns = {}
+    for name in df.columns:
+        s = df[name]
+        if isinstance(s.dtype, np.dtype) and s.dtype.kind in 'biufcmM':
+            columns[name] = s.to_numpy()
+        elif pd.api.types.is_string_dtype(s) and len(s) > 0 and not s.isna().any():
+            columns[name] = s.to_numpy(dtype=np.str_)
+        else:
+            return None
+    return columns
+
+
+def columns_to_frame(
+    columns: T.Mapping[str, np.ndarray], attrs: T.Mapping[str, T.Any] | None = None
+) -> pd.DataFrame:
+    """Create a DataFrame from cached column arrays, without copying numeric data."""
+    import pandas as pd
+
+    df = pd.DataFrame(dict(columns), columns=list(columns.keys()), copy=False)
+    if attrs:
+        df.attrs.update(attrs)
+    return df
@@ -20,47 +20,407 @@
 from __future__ import annotations
 
 import json
+import bisect
 import typing as T
 from pathlib import Path
 
+import numpy as np
+
+from .tabular import (
+    TimeRange,
+    slice_arrow,
+    slice_arrays,
+    column_indices,
+    import_pyarrow,
+    arrays_to_arrow,
+    slice_dataframe,
+    time_column_index,
+    compact_dataframes,
+    overlaps_time_range,
+)
+from .compressed import open_part
+from .decodecache import (
+    CacheSetting,
+    load_columns,
+    store_columns,
+    columns_to_frame,
+    frame_to_columns,
+)
+
 if T.TYPE_CHECKING:
     import pandas as pd
+    import pyarrow as pa
 
 
-def _read_pandas_extended_json(fname: Path) -> pd.DataFrame:
-    import pandas as pd
+# Characters that may follow a complete JSON value
+_JSON_DELIMITERS = frozenset(' \t\n\r,:]}')
+
+
+class _JsonStreamScanner:
+    """Minimal scanner to decode a JSON document incrementally from a text stream."""
+
+    def __init__(self, stream: T.IO[str], read_size: int = 1024 * 1024):
+        self._stream = stream
+        self._read_size = read_size
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._fills = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._read_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        self._fills += 1
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\n\r':
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError('Invalid JSON: Expected "{}" at offset {}.'.format(ch, self._pos))
+        self._pos += 1
 
-    if str(fname).endswith('.zst'):
+    def value(self) -> T.Any:
+        """Decode the next (small) JSON value."""
+        self.peek()
+        while True:
+            try:
+                v, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # the value may just be incomplete, so try again with more data
+                if self._fill():
+                    continue
+                raise
+            # a number cut off by the end of the buffer (e.g. "-1." of "-1.5e3") may
+            # continue in the next read, so a value is only complete if a delimiter follows
+            if (end == len(self._buf) or self._buf[end] not in _JSON_DELIMITERS) and self._fill():
+                continue
+            self._pos = end
+            return v
+
+    def _decode_items(self) -> list[T.Any] | None:
+        """Decode all complete array items in the buffer at once, if possible."""
+        # items are only cut off after a closing bracket, which ends a row of a table
+        # if the result is valid JSON (the bracket of a string or nested array does not)
+        end = len(self._buf)
+        for _ in range(2):
+            end = self._buf.rfind(']', self._pos, end)
+            if end < 0:
+                return None
+            try:
+                items = self._decoder.decode('[' + self._buf[self._pos : end + 1] + ']')
+            except json.JSONDecodeError:
+                # the bracket may close the whole array, so try the one before as well
+                continue
+            self._pos = end + 1
+            return items
+        return None
+
+    def array_items(self) -> T.Iterator[list[T.Any]]:
+        """Decode the items of the array whose opening bracket was just consumed.
+
+        Items are decoded in blocks of everything that was read so far, which is much
+        faster than decoding them one by one. The closing bracket is consumed as well.
+        """
+        while True:
+            ch = self.peek()
+            if ch == ']':
+                self._pos += 1
+                return
+            if ch == ',':
+                self._pos += 1
+                continue
+            if not ch:
+                raise ValueError('Invalid JSON: Unterminated array.')
+            items = self._decode_items()
+            if items is None:
+                # decode the rest of the buffer item by item, e.g. as the array ends in it
+                items = []
+                fills = self._fills
+                while fills == self._fills and self.peek() not in (']', ''):
+                    items.append(self.value())
+                    if self.peek() == ',':
+                        self._pos += 1
+            yield items
+
+
+class _ColumnBuilder:
+    """Collects values of a table column into a growing, preallocated typed array."""
+
+    def __init__(self, capacity: int = 65536):
+        self._arr: np.ndarray | None = None
+        self._len = 0
+        self._capacity = capacity
+
+    def extend(self, values: list[T.Any]) -> None:
+        block = np.array(values)
+        if block.dtype.kind not in 'biuf':
+            if all(v is None or isinstance(v, (int, float)) for v in values):
+                # null values of numbers become NaN, as in pandas
+                block = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                block = np.array(values, dtype=object)
+        if self._arr is None:
+            self._arr = np.empty(max(self._capacity, len(block)), dtype=block.dtype)
+        elif block.dtype != self._arr.dtype:
+            if block.dtype == object or self._arr.dtype == object:
+                new_dtype = np.dtype(object)
+            else:
+                new_dtype = np.result_type(self._arr.dtype, block.dtype)
+            self._arr = self._arr.astype(new_dtype)
+        if self._len + len(block) > len(self._arr):
+            grown = np.empty(max(2 * len(self._arr), self._len + len(block)), dtype=self._arr.dtype)
+            grown[: self._len] = self._arr[: self._len]
+            self._arr = grown
+        self._arr[self._len : self._len + len(block)] = block
+        self._len += len(block)
+
+    def finish(self) -> np.ndarray:
+        if self._arr is None:
+            return np.empty(0, dtype=object)
+        arr = self._arr
+        self._arr = None
         try:
-            import zstandard as zstd
-        except ImportError as e:
-            raise ImportError(
-                'Missing optional dependency "zstandard". Please install it with pip!'
-            ) from e
-
-        with open(fname, 'rb') as f:
-            dctx = zstd.ZstdDecompressor()
-            zr = dctx.stream_reader(f)
-            jd = json.load(zr)
-    else:
-        with open(fname, 'r', encoding='utf-8') as f:
-            jd = json.load(f)
+            arr.resize(self._len, refcheck=False)
+            return arr
+        except ValueError:
+            return arr[: self._len].copy()
 
-    jd.pop('collection_id')
-    jd.pop('time_unit')
-    jd.pop('data_unit')
-    df = pd.DataFrame(jd.pop('data'), columns=jd.pop('columns'))
 
-    return df
+def _decode_extended_json(
+    fname: Path,
+    columns: T.Sequence[str] | None = None,
+    time_range: TimeRange | None = None,
+    time_column: str | None = None,
+    block_rows: int = 8192,
+) -> tuple[dict[str, np.ndarray], dict[str, T.Any]] | None:
+    """Decode an extended-pandas JSON document incrementally.
 
+    Rows are decoded from the (decompressed) stream as they are read, and are converted
+    block by block into typed column arrays, so the whole document never needs to
+    exist as Python objects at once.
 
-def load_data(
-    part_paths: T.Iterable[Path], aux_data_entries: T.Any, json_schema: str | None = None
-) -> T.Iterator[pd.DataFrame]:
-    """Entry point for automatic dataset loading.
+    Returns
+    -------
+    A tuple of the column arrays and the metadata of the document (e.g. ``time_unit``),
+    or None if the document has no rows in :time_range.
+    """
+    meta: dict[str, T.Any] = {}
+    all_columns: list[str] | None = None
+    selected: list[int] | None = None
+    builders: list[_ColumnBuilder] = []
+    filter_late = False
+    first_time: T.Any = None
+    last_time: T.Any = None
+    ti = -1
+    range_start, range_end = time_range if time_range is not None else (None, None)
 
-    This function is used internally to load JSON data.
+    with open_part(fname, 'r') as f:
+        sc = _JsonStreamScanner(f)
+        sc.expect('{')
+        while sc.peek() not in ('}', ''):
+            key = sc.value()
+            sc.expect(':')
+            if key == 'columns':
+                all_columns = sc.value()
+            elif key != 'data':
+                meta[key] = sc.value()
+            else:
+                if all_columns is None:
+                    # we can only select data by column while reading if we know the
+                    # column names already, otherwise we need to do this afterwards
+                    filter_late = columns is not None or time_range is not None
+                else:
+                    selected = column_indices(all_columns, columns, fname)
+                    if time_range is not None:
+                        ti = time_column_index(all_columns, time_column, fname)
+
+                stop = False
+                sc.expect('[')
+                for rows in sc.array_items():
+                    if ti >= 0 and rows:
+                        times = [row[ti] for row in rows]
+                        if first_time is None:
+                            first_time = times[0]
+                        # rows are sorted by time, so we can bisect them
+                        start = 0 if range_start is None else bisect.bisect_left(times, range_start)
+                        end = (
+                            len(rows) if range_end is None else bisect.bisect_left(times, range_end)
+                        )
+                        if end < len(rows):
+                            # nothing of interest can follow this row
+                            last_time = times[end]
+                            stop = True
+                        else:
+                            last_time = times[-1]
+                        rows = rows[start:end]
+                    for i in range(0, len(rows), block_rows):
+                        _append_block(builders, rows[i : i + block_rows], selected)
+                    if stop:
+                        # the column header and metadata precede the data in Syntalos files,
+                        # so we can stop reading here
+                        break
+                if stop:
+                    break
+            if sc.peek() == ',':
+                sc.expect(',')
+
+    if all_columns is None:
+        raise ValueError('Invalid extended-pandas JSON in "{}": No columns found.'.format(fname))
+    if time_range is not None and ti >= 0 and first_time is not None:
+        if not overlaps_time_range(first_time, last_time, time_range):
+            return None
+
+    names = all_columns if selected is None else [all_columns[i] for i in selected]
+    arrays = [b.finish() for b in builders]
+    if not arrays:
+        arrays = [np.empty(0, dtype=object) for _ in names]
+    result = dict(zip(names, arrays))
+    if filter_late:
+        result = slice_arrays(result, columns, time_range, time_column, fname)
+
+    return result, meta
+
+
+def _read_pandas_extended_json(
+    fname: Path,
+    columns: T.Sequence[str] | None = None,
+    time_range: TimeRange | None = None,
+    time_column: str | None = None,
+    block_rows: int = 8192,
+) -> pd.DataFrame | None:
+    """Read an extended-pandas JSON document into a DataFrame.
+
+    The metadata of the document is stored in the ``attrs`` of the returned DataFrame.
     """
+    import pandas as pd
+
+    decoded = _decode_extended_json(fname, columns, time_range, time_column, block_rows)
+    if decoded is None:
+        return None
+    arrays, meta = decoded
+    df = pd.DataFrame(arrays, columns=list(arrays.keys()), copy=False)
+    df.attrs.update(meta)
+
+    return df
+
+
+def _read_arrow(
+    fname: Path,
+    json_schema: str | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+) -> pa.Table | None:
+    """Read a JSON part into an Arrow table, without creating a DataFrame."""
+    pa = import_pyarrow()
+
+    if json_schema == 'extended-pandas':
+        decoded = _decode_extended_json(fname, columns, time_range, time_column)
+        if decoded is None:
+            return None
+        return arrays_to_arrow(*decoded)
+
+    with open_part(fname, 'r') as f:
+        doc = json.load(f)
+    names = [str(c) for c in doc.get('columns', [])]
+    rows = doc.get('data', [])
+    table = pa.Table.from_arrays(
+        [pa.array([row[i] for row in rows]) for i in range(len(names))], names=names
+    )
+    if time_range is not None and table.num_rows > 0:
+        times = table.column(time_column_index(names, time_column, fname))
+        if not overlaps_time_range(times[0].as_py(), times[-1].as_py(), time_range):
+            return None
+    return slice_arrow(table, columns, time_range, time_column, fname)
+
+
+def _append_block(
+    builders: list[_ColumnBuilder], block: list[list[T.Any]], selected: list[int] | None = None
+) -> None:
+    if not block:
+        return
+    indices = range(len(block[0])) if selected is None else selected
+    if not builders:
+        builders.extend(_ColumnBuilder() for _ in indices)
+    for col, builder in zip(indices, builders):
+        builder.extend([row[col] for row in block])
+
+
+def _read_cached_part(fname: Path, json_schema: str | None, cache: CacheSetting) -> pd.DataFrame:
+    import pandas as pd
+
+    options = {'json_schema': json_schema}
+    cached = load_columns(fname, 'frame', cache, options)
+    if cached is not None:
+        return columns_to_frame(*cached)
+
+    # the whole table is decoded and cached, so any selection can be served from it later
+    if json_schema == 'extended-pandas':
+        df = T.cast(pd.DataFrame, _read_pandas_extended_json(fname))
+    else:
+        with open_part(fname, 'r') as f:
+            df = pd.read_json(f, orient='split')
+    arrays = frame_to_columns(df)
+    if arrays is not None:
+        store_columns(fname, 'frame', cache, arrays, df.attrs, options)
+    return df
+
+
+def _read_cached_arrow(
+    fname: Path,
+    json_schema: str | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+    cache: CacheSetting,
+) -> pa.Table | None:
+    cached = load_columns(fname, 'frame', cache, {'json_schema': json_schema})
+    if cached is None:
+        # decode the part once to fill the cache
+        df = _read_cached_part(fname, json_schema, cache)
+        arrays = frame_to_columns(df)
+        if arrays is None:
+            return slice_arrow(
+                import_pyarrow().Table.from_pandas(df, preserve_index=False),
+                columns,
+                time_range,
+                time_column,
+                fname,
+            )
+        cached = arrays, df.attrs
+
+    arrays, attrs = cached
+    if time_range is not None and arrays:
+        times = arrays[list(arrays.keys())[time_column_index(list(arrays), time_column, fname)]]
+        if len(times) > 0 and not overlaps_time_range(times[0], times[-1], time_range):
+            return None
+    return arrays_to_arrow(slice_arrays(arrays, columns, time_range, time_column, fname), attrs)
+
+
+def _read_dataframes(
+    part_paths: T.Iterable[Path],
+    json_schema: str | None,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+    cache: CacheSetting,
+) -> T.Iterator[pd.DataFrame]:
     try:
         import pandas as pd
     except ImportError as e:
@@ -68,10 +428,74 @@ def load_data(
             'Missing optional dependency "pandas". Please install it with pip!'
         ) from e
 
-    if json_schema == 'extended-pandas':
+    if json_schema == 'extended-pandas' and not cache:
         for fname in part_paths:
-            yield _read_pandas_extended_json(fname)
-    else:
+            edf = _read_pandas_extended_json(fname, columns, time_range, time_column)
+            if edf is not None:
+                yield edf
+        return
+
+    for fname in part_paths:
+        if cache:
+            df = _read_cached_part(fname, json_schema, cache)
+        else:
+            with open_part(fname, 'r') as f:
+                df = pd.read_json(f, orient='split')
+        if time_range is not None and len(df) > 0:
+            times = df[time_column] if time_column is not None else df.iloc[:, 0]
+            if not overlaps_time_range(times.iloc[0], times.iloc[-1], time_range):
+                continue
+        if columns is not None or time_range is not None:
+            df = slice_dataframe(df, columns, time_range, time_column)
+        yield df
+
+
+def load_data(
+    part_paths: T.Iterable[Path],
+    aux_data_entries: T.Any,
+    json_schema: str | None = None,
+    columns: T.Sequence[str] | None = None,
+    time_range: TimeRange | None = None,
+    time_column: str | None = None,
+    cache: CacheSetting = False,
+    as_arrow: bool = False,
+    compact: bool = False,
+) -> T.Iterator[pd.DataFrame | pa.Table]:
+    """Entry point for automatic dataset loading.
+
+    This function is used internally to load JSON data.
+
+    Only the :columns listed are returned, if set. If :time_range is set to a
+    ``(start, end)`` tuple, only rows with a time of at least start and less than end
+    are returned. Times are read from :time_column, or the first column by default,
+    and must be sorted in ascending order. Parts that do not overlap with the range
+    at all are skipped.
+
+    If :compact is set, DataFrame columns are converted to the smallest lossless types:
+    Numbers are downcast, text columns with few distinct values become categoricals,
+    and the time column is stored as 64-bit integer. Its unit is kept in the
+    ``time_unit`` attribute of the DataFrame, as read from extended-pandas documents.
+    The types are chosen from the first part and used for all following ones.
+
+    If :as_arrow is set, each part is returned as a :class:`pyarrow.Table` instead of
+    a DataFrame, without pandas being involved.
+
+    If :cache is set, the decoded columns of each part are cached on disk, and are
+    memory-mapped on later reads instead of parsing the part again. Set it to True
+    to cache next to the data, or to a directory path to keep the cache there.
+    """
+    if as_arrow:
         for fname in part_paths:
-            df = pd.read_json(fname, orient='split')
-            yield df
+            if cache:
+                table = _read_cached_arrow(
+                    fname, json_schema, columns, time_range, time_column, cache
+                )
+            else:
+                table = _read_arrow(fname, json_schema, columns, time_range, time_column)
+            if table is not None:
+                yield table
+        return
+
+    dfs = _read_dataframes(part_paths, json_schema, columns, time_range, time_column, cache)
+    # compact types are chosen once, so all parts get the same ones
+    yield from compact_dataframes(dfs, time_column) if compact else dfs
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Matthias Klumpp <matthias@tenstral.net>
+#
+# Licensed under the GNU Lesser General Public License Version 3
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the license, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this software.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Helpers shared by the loaders for tabular data (CSV, JSON).
+"""
+
+from __future__ import annotations
+
+import json
+import typing as T
+
+import numpy as np
+
+if T.TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# A (start, end) time interval, including start and excluding end.
+# Either bound may be None for an open interval.
+TimeRange = tuple[T.Any, T.Any]
+
+
+def column_indices(
+    names: T.Sequence[str], columns: T.Sequence[str] | None, fname: T.Any
+) -> list[int]:
+    """Get the positions of the selected :columns in a table with the given column :names."""
+    if columns is None:
+        return list(range(len(names)))
+    indices = []
+    for c in columns:
+        try:
+            indices.append(names.index(c))
+        except ValueError:
+            raise ValueError('Column "{}" does not exist in "{}".'.format(c, fname)) from None
+    return indices
+
+
+def time_column_index(names: T.Sequence[str], time_column: str | None, fname: T.Any) -> int:
+    """Get the position of the time column, which is the first column unless set explicitly."""
+    if not names:
+        raise ValueError('Table "{}" has no columns.'.format(fname))
+    if time_column is None:
+        return 0
+    return column_indices(names, [time_column], fname)[0]
+
+
+def time_before_range(t: T.Any, time_range: TimeRange) -> bool:
+    return time_range[0] is not None and t < time_range[0]
+
+
+def time_after_range(t: T.Any, time_range: TimeRange) -> bool:
+    return time_range[1] is not None and t >= time_range[1]
+
+
+def overlaps_time_range(first: T.Any, last: T.Any, time_range: TimeRange) -> bool:
+    """Check if a sorted table spanning :first to :last times has rows in :time_range."""
+    return not time_before_range(last, time_range) and not time_after_range(first, time_range)
+
+
+def slice_dataframe(
+    df: pd.DataFrame,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+) -> pd.DataFrame:
+    """Select rows in :time_range and the given :columns from a DataFrame sorted by time."""
+    if time_range is not None and len(df.columns) > 0:
+        times = df[time_column] if time_column is not None else df.iloc[:, 0]
+        start = 0 if time_range[0] is None else times.searchsorted(time_range[0], side='left')
+        end = len(df) if time_range[1] is None else times.searchsorted(time_range[1], side='left')
+        df = df.iloc[start:end]
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+def slice_arrays(
+    arrays: T.Mapping[str, np.ndarray],
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+    fname: T.Any,
+) -> dict[str, np.ndarray]:
+    """Select rows in :time_range and the given :columns from column arrays sorted by time."""
+    names = list(arrays.keys())
+    selected = [names[i] for i in column_indices(names, columns, fname)]
+    rows = slice(None)
+    if time_range is not None and names:
+        times = arrays[names[time_column_index(names, time_column, fname)]]
+        start = 0 if time_range[0] is None else times.searchsorted(time_range[0], side='left')
+        end = (
+            len(times) if time_range[1] is None else times.searchsorted(time_range[1], side='left')
+        )
+        rows = slice(int(start), int(end))
+    return {name: arrays[name][rows] for name in selected}
+
+
+def import_pyarrow() -> T.Any:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            'Missing optional dependency "pyarrow". Please install it with pip!'
+        ) from e
+    return pa
+
+
+def arrow_metadata(attrs: T.Mapping[str, T.Any] | None) -> dict[str, str] | None:
+    """Convert table attributes to Arrow schema metadata, JSON-encoding non-text values."""
+    if not attrs:
+        return None
+    return {str(k): v if isinstance(v, str) else json.dumps(v) for k, v in attrs.items()}
+
+
+def arrays_to_arrow(
+    arrays: T.Mapping[str, np.ndarray], attrs: T.Mapping[str, T.Any] | None = None
+) -> pa.Table:
+    """Create an Arrow table from column arrays.
+
+    Numeric arrays are wrapped without copying their data.
+    """
+    pa = import_pyarrow()
+    columns = [
+        pa.array(arr, type=pa.string()) if arr.dtype.kind == 'U' else pa.array(arr)
+        for arr in arrays.values()
+    ]
+    schema = pa.schema(
+        [pa.field(name, col.type) for name, col in zip(arrays.keys(), columns)],
+        metadata=arrow_metadata(attrs),
+    )
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def slice_arrow(
+    table: pa.Table,
+    columns: T.Sequence[str] | None,
+    time_range: TimeRange | None,
+    time_column: str | None,
+    fname: T.Any,
+) -> pa.Table:
+    """Select rows in :time_range and the given :columns from an Arrow table sorted by time.
+
+    Works for record batches as well, and never copies any data.
+    """
+    names = table.schema.names
+    if time_range is not None and names:
+        times = np.asarray(table.column(time_column_index(names, time_column, fname)))
+        start = 0 if time_range[0] is None else times.searchsorted(time_range[0], side='left')
+        end = (
+            len(times) if time_range[1] is None else times.searchsorted(time_range[1], side='left')
+        )
+        table = table.slice(int(start), int(end - start))
+    if columns is not None:
+        table = table.select([names[i] for i in column_indices(names, columns, fname)])
+    return table
+
+
+def concat_arrow(tables: T.Iterable[pa.Table]) -> pa.Table:
+    """Concatenate the Arrow tables read from all parts of a dataset into one table.
+
+    Columns of the result are chunked arrays referencing the data of each part, so
+    nothing is copied unless the column types of the parts differ.
+    """
+    pa = import_pyarrow()
+    tables = list(tables)
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(tables, promote_options='permissive')
+
+
+# Integer types tried in order when downcasting a column, smallest first
+_COMPACT_INT_TYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32, np.int64)
+
+
+def _compact_int_dtype(values: np.ndarray) -> np.dtype:
+    lo, hi = int(values.min()), int(values.max())
+    for itype in _COMPACT_INT_TYPES:
+        info = np.iinfo(itype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(itype)
+    return values.dtype
+
+
+def compact_dataframe(
+    df: pd.DataFrame, time_column: str | None = None, max_category_ratio: float = 0.5
+) -> pd.DataFrame:
+    """Convert the columns of a DataFrame to the most memory-efficient lossless types.
+
+    Integer columns are downcast to the smallest integer type that holds all their
+    values, and floating-point columns to 32-bit floats if no precision is lost.
+    Text columns with at most :max_category_ratio unique values per row become
+    categoricals. The time column (:time_column, or the first column) is stored as
+    64-bit integer if its values are whole numbers, so time arithmetic never overflows.
+    """
+    import pandas as pd
+
+    if len(df) == 0 or len(df.columns) == 0:
+        return df
+
+    if time_column is None:
+        time_column = df.columns[0]
+    new_columns = {}
+    for name in df.columns:
+        s = df[name]
+        dtype = s.dtype
+        if not isinstance(dtype, np.dtype):
+            if pd.api.types.is_string_dtype(s) and s.nunique() <= len(s) * max_category_ratio:
+                new_columns[name] = s.astype('category')
+            continue
+        values = s.to_numpy()
+        if name == time_column:
+            if dtype.kind in 'iu':
+                new_columns[name] = s.astype(np.int64)
+            elif dtype.kind == 'f' and np.isfinite(values).all() and (values % 1 == 0).all():
+                new_columns[name] = s.astype(np.int64)
+        elif dtype.kind in 'iu':
+            new_columns[name] = s.astype(_compact_int_dtype(values))
+        elif dtype.kind == 'f' and dtype.itemsize > 4:
+            as_f32 = values.astype(np.float32)
+            if np.array_equal(as_f32.astype(dtype), values, equal_nan=True):
+                new_columns[name] = pd.Series(as_f32, index=s.index, name=name)
+        elif dtype.kind == 'O':
+            if pd.api.types.is_string_dtype(s) and s.nunique() <= len(s) * max_category_ratio:
+                new_columns[name] = s.astype('category')
+
+    if not new_columns:
+        return df
+    df = df.copy(deep=False)
+    for name, s in new_columns.items():
+        df[name] = s
+    return df
+
+
+def _fits_dtype(values: np.ndarray, dtype: np.dtype) -> bool:
+    with np.errstate(invalid='ignore', over='ignore'):
+        cast = values.astype(dtype)
+        return np.array_equal(
+            cast.astype(values.dtype), values, equal_nan=values.dtype.kind in 'fc'
+        )
+
+
+def _widen_dtype(values: np.ndarray, dtype: np.dtype) -> np.dtype:
+    if dtype.kind in 'iu' and values.dtype.kind in 'iu':
+        dtype = np.promote_types(dtype, _compact_int_dtype(values))
+    else:
+        dtype = np.promote_types(dtype, values.dtype)
+    return dtype if _fits_dtype(values, dtype) else values.dtype
+
+
+def _apply_compact_dtypes(df: pd.DataFrame, dtypes: dict[str, T.Any]) -> pd.DataFrame:
+    """Convert :df to the compact :dtypes, widening them where values do not fit."""
+    import pandas as pd
+
+    new_columns = {}
+    for name in df.columns:
+        dtype = dtypes.get(name)
+        s = df[name]
+        if dtype is None or s.dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            if not pd.api.types.is_string_dtype(s):
+                continue
+            # new values are appended, so the codes of known categories never change
+            unknown = s[s.notna() & ~s.isin(dtype.categories)].unique()
+            if len(unknown) > 0:
+                dtype = pd.CategoricalDtype(list(dtype.categories) + list(unknown))
+                dtypes[name] = dtype
+            new_columns[name] = s.astype(dtype)
+        elif isinstance(dtype, np.dtype) and isinstance(s.dtype, np.dtype):
+            values = s.to_numpy()
+            if not _fits_dtype(values, dtype):
+                dtype = _widen_dtype(values, dtype)
+                dtypes[name] = dtype
+            if dtype != s.dtype:
+                new_columns[name] = s.astype(dtype)
+
+    if not new_columns:
+        return df
+    df = df.copy(deep=False)
+    for name, s in new_columns.items():
+        df[name] = s
+    return df
+
+
+def compact_dataframes(
+    dfs: T.Iterable[pd.DataFrame], time_column: str | None = None, max_category_ratio: float = 0.5
+) -> T.Iterator[pd.DataFrame]:
+    """Convert a series of DataFrames of one read, e.g. chunks of a table, to compact types.
+
+    The types are chosen once, from the first DataFrame that has rows, as by
+    :func:`compact_dataframe`, and all following DataFrames are converted to the same
+    types, so chunks can be processed alike and concatenated. If a later DataFrame holds
+    values that do not fit into the type of a column, that type is widened losslessly
+    and kept for the rest of the read. New text values are appended to the categories
+    of a categorical column, so the codes of earlier values never change.
+    """
+    dtypes: dict[str, T.Any] | None = None
+    for df in dfs:
+        if dtypes is None:
+            if len(df) == 0 or len(df.columns) == 0:
+                yield df
+                continue
+            df = compact_dataframe(df, time_column, max_category_ratio)
+            dtypes = dict(df.dtypes.items())
+            yield df
+        else:
+            yield _apply_compact_dtypes(df, dtypes)
@@ -34,6 +34,10 @@ import numpy as np
 from xxhash import xxh3_64
 
 from .. import ureg
+from .tabular import arrow_metadata, import_pyarrow
+
+if T.TYPE_CHECKING:
+    import pyarrow as pa
 
 __all__ = ['TSyncFile', 'TSyncFileMode', 'TSyncTimeUnit']
 
@@ -330,7 +334,8 @@ class TSyncFile:
                     )
             entries_n = whole_block_count * self._block_size + last_block_len
 
-            self._times = np.zeros((entries_n, 2), dtype=np.int64)
+            # store columns contiguously, so each clock's times can be used without copying
+            self._times = np.zeros((entries_n, 2), dtype=np.int64, order='F')
             self._block_crc = 0
             b_index = 0
             i = 0
@@ -641,7 +646,8 @@ class LegacyTSyncFile:
                     )
             entries_n = whole_block_count * self._block_size + last_block_len
 
-            self._times = np.zeros((entries_n, 2), dtype=np.int64)
+            # store columns contiguously, so each clock's times can be used without copying
+            self._times = np.zeros((entries_n, 2), dtype=np.int64, order='F')
             self._block_crc = 0
             b_index = 0
             i = 0
@@ -683,11 +689,37 @@ class LegacyTSyncFile:
             del self._xxh
 
 
-def load_data(part_paths: T.Iterable[Path], aux_data_list: T.Any) -> T.Iterator[T.Any]:
+def _tsync_to_arrow(tsync: LegacyTSyncFile | TSyncFile) -> pa.Table:
+    pa = import_pyarrow()
+    times = tsync.times
+    fields = [
+        pa.field(label, pa.int64(), metadata={'unit': str(unit)})
+        for label, unit in zip(tsync.time_labels, tsync.time_units)
+    ]
+    metadata = arrow_metadata(
+        {
+            'sync_mode': tsync.sync_mode.name.lower(),
+            'collection_id': str(tsync.collection_id),
+            'generator_name': tsync.generator_name,
+            'time_created': tsync.time_created.isoformat() if tsync.time_created else None,
+        }
+    )
+    return pa.Table.from_arrays(
+        [pa.array(times[:, i], type=pa.int64()) for i in range(2)],
+        schema=pa.schema(fields, metadata=metadata),
+    )
+
+
+def load_data(
+    part_paths: T.Iterable[Path], aux_data_list: T.Any, as_arrow: bool = False
+) -> T.Iterator[T.Any]:
     """Entry point for automatic dataset loading.
 
     This function is used internally to Syntalos' .tsync files
     as data or auxiliary data.
+
+    If :as_arrow is set, the timestamps of each part are returned as a
+    :class:`pyarrow.Table` with one column per clock, instead of the tsync file object.
     """
     for fname in part_paths:
         tsync: LegacyTSyncFile | TSyncFile
@@ -695,4 +727,4 @@ def load_data(part_paths: T.Iterable[Path], aux_data_list: T.Any) -> T.Iterator[
             tsync = LegacyTSyncFile(fname)
         else:
             tsync = TSyncFile(fname)
-        yield tsync
+        yield _tsync_to_arrow(tsync) if as_arrow else tsync
@@ -19,17 +19,27 @@
 
 from __future__ import annotations
 
+import os
+import json
 import typing as T
+import logging as log
 from pathlib import Path
 from collections.abc import Generator
+from concurrent.futures import ProcessPoolExecutor
 
 import cv2 as cv
 import numpy as np
+from xxhash import xxh3_64
 from pint.facets.plain import PlainQuantity
 
 from .. import ureg
-from ..dataset import EDLDataFile
+from ..unit import EDLError
+from ..dataset import EDLDataset, EDLDataFile
 from .tsyncfile import TSyncFileMode
+from .decodecache import CacheSetting
+
+# name of the file in a video dataset directory that caches probed metadata
+PROBE_CACHE_FNAME = '.edlio-videoprobe.json'
 
 
 class Frame:
@@ -54,8 +64,144 @@ class Frame:
         self.index = index
 
 
+class FrameResult:
+    value: T.Any
+    time: int | PlainQuantity[int]
+    index: int
+
+    def __init__(self, value: T.Any, time: int | PlainQuantity[int], index: int):
+        """Result of a per-frame function applied to a video frame.
+
+        Parameters
+        ----------
+        value
+            Return value of the frame function for this frame.
+        time
+            Time as quantity (usually in microseconds)
+        index
+            An optional frame index that increases monotonically.
+        """
+        self.value = value
+        self.time = time
+        self.index = index
+
+
+class VideoPartInfo:
+    """Container metadata of a single video part file."""
+
+    fname: Path
+    frame_count: int
+    fps: float
+    width: int
+    height: int
+    codec: str
+
+    def __init__(
+        self, fname: Path, frame_count: int, fps: float, width: int, height: int, codec: str
+    ):
+        self.fname = fname
+        self.frame_count = frame_count
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.codec = codec
+
+    def __repr__(self) -> str:
+        return 'VideoPartInfo({}, frames={}, fps={}, size={}x{}, codec={})'.format(
+            self.fname, self.frame_count, self.fps, self.width, self.height, self.codec
+        )
+
+
+class VideoProbe:
+    """Result of probing the metadata of a video dataset, without decoding any frames."""
+
+    parts: list[VideoPartInfo]
+    timestamp_count: int | None
+    timestamps_extrapolated: bool
+
+    def __init__(
+        self,
+        parts: list[VideoPartInfo],
+        timestamp_count: int | None = None,
+        timestamps_extrapolated: bool = False,
+    ):
+        self.parts = parts
+        self.timestamp_count = timestamp_count
+        # set if timestamps are interpolated from sync points, in which case the
+        # count is the number of frames up to the last sync point
+        self.timestamps_extrapolated = timestamps_extrapolated
+
+    @property
+    def frame_count(self) -> int:
+        """Total number of frames in all video parts."""
+        return sum(p.frame_count for p in self.parts)
+
+    @property
+    def timestamps_match(self) -> bool:
+        """True if the timestamp data covers exactly all frames, or if there is no timestamp data."""
+        if self.timestamp_count is None:
+            return True
+        if self.timestamps_extrapolated:
+            return self.timestamp_count <= self.frame_count
+        return self.timestamp_count == self.frame_count
+
+    def validate(self) -> None:
+        """Raise a :class:`ValueError` if the timestamp data does not match the video length."""
+        if self.timestamps_match:
+            return
+        raise ValueError(
+            'Video timestamp data does not match the video: the auxiliary timing information '
+            'has {} entries, but the video has {} frames.'.format(
+                self.timestamp_count, self.frame_count
+            )
+        )
+
+    def __repr__(self) -> str:
+        return 'VideoProbe(parts={}, timestamp_count={})'.format(self.parts, self.timestamp_count)
+
+
+def _interpolate_syncpoints(
+    syncpoints: np.ndarray, extrapolate: bool, block_size: int = 8192
+) -> Generator[tuple[int, PlainQuantity[int]], None, None]:
+    """Generate per-frame timestamps from (frame-index, time-in-usec) sync points.
+
+    Frame times between two sync points are interpolated linearly, starting at the
+    first sync point. If :extrapolate is set, times for frames past the last sync point
+    are extrapolated using the frame rate between the last two sync points, indefinitely.
+    """
+    if syncpoints.shape[0] < 2:
+        raise ValueError(
+            'Can not synchronize video timestamps: At least two sync points are required.'
+        )
+    sp_index = syncpoints[:, 0]
+    sp_time = syncpoints[:, 1].astype(np.float64)
+    if np.any(np.diff(sp_index) <= 0):
+        raise ValueError('Can not synchronize video timestamps: Sync points are not sorted.')
+    last_index = int(sp_index[-1])
+    frame_duration = (sp_time[-1] - sp_time[-2]) / (sp_index[-1] - sp_index[-2])
+
+    start = int(sp_index[0])
+    while extrapolate or start <= last_index:
+        end = start + block_size if extrapolate else min(start + block_size, last_index + 1)
+        indices = np.arange(start, end, dtype=np.int64)
+        times = np.interp(indices, sp_index, sp_time)
+        past_end = indices > last_index
+        times[past_end] = sp_time[-1] + (indices[past_end] - last_index) * frame_duration
+        for index, time in zip(indices.tolist(), np.rint(times).astype(np.int64).tolist()):
+            yield index, time * ureg.usec
+        start = end
+
+
+class _TimestampCoverage:
+    """Index of the last frame that timestamp data covers, if frames past it get extrapolated times."""
+
+    last_index: int | None = None
+
+
 def _read_video_aux_data(
     aux_data: EDLDataFile,
+    extrapolate: bool = True,
+    coverage: _TimestampCoverage | None = None,
 ) -> Generator[tuple[int, PlainQuantity[int]], None, None]:
     if aux_data.file_type == 'csv' or aux_data.media_type == 'text/csv':
         for index, timestamp in aux_data.read():
@@ -66,11 +212,8 @@ def _read_video_aux_data(
         return
 
     if aux_data.file_type == 'tsync':
+        syncpoints: list[np.ndarray] = []
         for tsf in aux_data.read():
-            if tsf.sync_mode != TSyncFileMode.CONTINUOUS:
-                raise ValueError(
-                    'Can not synchronize video timestamps using a non-continuous tsync file.'
-                )
             if tsf.time_units[0] != ureg.dimensionless:
                 raise ValueError(
                     'Unit of first time in tsync mapping has to be \'index\' for video files.'
@@ -81,9 +224,25 @@ def _read_video_aux_data(
                         tsf.time_units[1]
                     )
                 )
+            if tsf.sync_mode == TSyncFileMode.SYNCPOINTS:
+                sp = tsf.times.astype(np.int64)
+                if tsf.time_units[1] == ureg.msec:
+                    sp[:, 1] *= 1000
+                syncpoints.append(sp)
+                continue
+            if syncpoints:
+                raise ValueError(
+                    'Can not synchronize video timestamps using a mix of continuous and '
+                    'sync-point tsync files.'
+                )
             for index, timestamp in tsf.times:
                 yield int(index), (int(timestamp) * tsf.time_units[1]).to(ureg.usec)
 
+        if syncpoints:
+            all_syncpoints = np.concatenate(syncpoints)
+            if coverage is not None:
+                coverage.last_index = int(all_syncpoints[-1, 0])
+            yield from _interpolate_syncpoints(all_syncpoints, extrapolate)
         return
 
     raise ValueError(
@@ -93,30 +252,39 @@ def _read_video_aux_data(
     )
 
 
-def load_data(
-    part_paths: T.Iterable[Path], aux_data_entries: T.Sequence[EDLDataFile]
-) -> T.Iterator[Frame]:
-    """Entry point for automatic dataset loading.
-
-    This function is used internally to load data from a video and expose
-    it as stream of frames.
-    """
-    aux_data: EDLDataFile | None = None
+def _find_timestamp_aux_data(aux_data_entries: T.Sequence[EDLDataFile]) -> EDLDataFile | None:
+    """Select the auxiliary data entry that holds the frame timestamps, if any."""
     valid_timestamp_aux_keys = ['tsync', 'csv']
     for adf in aux_data_entries:
         for vtak in valid_timestamp_aux_keys:
             if (adf.file_type and vtak in adf.file_type) or (
                 adf.media_type and vtak in adf.media_type
             ):
-                aux_data = adf
-                break
-        if aux_data is not None:
-            break
+                return adf
+    return None
 
-    sync_map_gen = None
-    if aux_data:
-        sync_map_gen = _read_video_aux_data(aux_data)
 
+def _next_frame_time(
+    sync_map_gen: T.Iterator[tuple[int, PlainQuantity[int]]], frame_index: int
+) -> tuple[int, PlainQuantity[int]]:
+    try:
+        return next(sync_map_gen)
+    except StopIteration:
+        # The auxiliary timestamp data ran out before the video did,
+        # so the sync information does not cover all frames. We raise
+        # an error rather than letting StopIteration escape the calling
+        # generator (PEP 479).
+        raise ValueError(
+            'Video timestamp data is shorter than the video: the auxiliary '
+            'timing information ran out at frame {}. The sync data likely does '
+            'not belong to this video, or the video has extra frames.'.format(frame_index)
+        ) from None
+
+
+def _read_frames(
+    part_paths: T.Iterable[Path],
+    sync_map_gen: T.Iterator[tuple[int, PlainQuantity[int]]] | None,
+) -> T.Iterator[Frame]:
     frame_index = 0
     for fname in part_paths:
         vc = cv.VideoCapture(str(fname))
@@ -127,20 +295,411 @@ def load_data(
             if sync_map_gen is None:
                 frame = Frame(mat, time=-1, index=frame_index)
             else:
-                try:
-                    index, time = next(sync_map_gen)
-                except StopIteration:
-                    # The auxiliary timestamp data ran out before the video did,
-                    # so the sync information does not cover all frames. We raise
-                    # an error rather than letting StopIteration escape this
-                    # generator (PEP 479).
-                    raise ValueError(
-                        'Video timestamp data is shorter than the video: the auxiliary '
-                        'timing information ran out at frame {}. The sync data likely does '
-                        'not belong to this video, or the video has extra frames.'.format(
-                            frame_index
-                        )
-                    ) from None
+                index, time = _next_frame_time(sync_map_gen, frame_index)
                 frame = Frame(mat, time=time, index=index)
             yield frame
             frame_index += 1
+
+
+def _read_frame_times(
+    part_paths: T.Iterable[Path],
+    sync_map_gen: T.Iterator[tuple[int, PlainQuantity[int]]] | None,
+    check_frames: bool,
+    coverage: _TimestampCoverage | None = None,
+) -> T.Iterator[tuple[int, int | PlainQuantity[int]]]:
+    if sync_map_gen is not None and not check_frames:
+        # the timestamp data alone is sufficient, the video does not need to be touched
+        yield from sync_map_gen
+        return
+
+    frame_index = 0
+    for fname in part_paths:
+        vc = cv.VideoCapture(str(fname))
+        try:
+            # grab() only demuxes the next frame, without converting it to an image
+            while vc.grab():
+                if sync_map_gen is None:
+                    yield frame_index, -1
+                else:
+                    yield _next_frame_time(sync_map_gen, frame_index)
+                frame_index += 1
+        finally:
+            vc.release()
+
+    if sync_map_gen is not None:
+        # timestamps left over after the last frame mean that the video is missing frames,
+        # unless they were only extrapolated past the end of the timestamp data
+        surplus = next(sync_map_gen, None)
+        last_index = coverage.last_index if coverage is not None else None
+        if surplus is not None and (last_index is None or surplus[0] <= last_index):
+            raise ValueError(
+                'Video timestamp data is longer than the video: the video ended after '
+                '{} frames, but timing information for more frames exists. The video is '
+                'likely truncated, or the sync data does not belong to it.'.format(frame_index)
+            )
+
+
+def _apply_to_part_frames(fname: Path, frame_func: T.Callable[[np.ndarray], T.Any]) -> list[T.Any]:
+    """Decode all frames of a video part and apply :frame_func to each of them.
+
+    This function is run in a worker process when frames are processed in parallel.
+    """
+    results = []
+    vc = cv.VideoCapture(str(fname))
+    try:
+        while True:
+            ret, mat = vc.read()
+            if not ret:
+                break
+            results.append(frame_func(mat))
+    finally:
+        vc.release()
+    return results
+
+
+def _map_frames(
+    part_paths: T.Iterable[Path],
+    sync_map_gen: T.Iterator[tuple[int, PlainQuantity[int]]] | None,
+    frame_func: T.Callable[[np.ndarray], T.Any],
+    workers: int | None,
+) -> T.Iterator[FrameResult]:
+    part_paths = list(part_paths)
+
+    executor: ProcessPoolExecutor | None = None
+    part_results: T.Iterable[list[T.Any]]
+    if workers == 1 or len(part_paths) <= 1:
+        # no point in spawning worker processes for a single part
+        part_results = (_apply_to_part_frames(fname, frame_func) for fname in part_paths)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        part_results = executor.map(
+            _apply_to_part_frames, part_paths, [frame_func] * len(part_paths)
+        )
+
+    try:
+        frame_index = 0
+        # executor.map() hands results back in submission order, so the parts are
+        # reassembled in their correct sequence no matter which worker finished first
+        for results in part_results:
+            for value in results:
+                if sync_map_gen is None:
+                    yield FrameResult(value, time=-1, index=frame_index)
+                else:
+                    index, time = _next_frame_time(sync_map_gen, frame_index)
+                    yield FrameResult(value, time=time, index=index)
+                frame_index += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def load_data(
+    part_paths: T.Iterable[Path],
+    aux_data_entries: T.Sequence[EDLDataFile],
+    *,
+    frame_func: T.Callable[[np.ndarray], T.Any] | None = None,
+    workers: int | None = None,
+    timestamps_only: bool = False,
+    check_frames: bool = False,
+) -> T.Iterator[Frame] | T.Iterator[FrameResult] | T.Iterator[tuple[int, T.Any]]:
+    """Entry point for automatic dataset loading.
+
+    This function is used internally to load data from a video and expose
+    it as stream of frames.
+
+    If :frame_func is set, the video parts are decoded in a pool of worker
+    processes instead, :frame_func is applied to the image matrix of every frame
+    in the workers, and its results are returned as :class:`FrameResult` objects,
+    in global frame order and with their synchronized timestamps.
+    The function must be picklable (e.g. defined at module level).
+    :workers sets the maximum number of worker processes, and defaults to the
+    number of CPUs of this machine.
+
+    If :timestamps_only is set, only ``(index, time)`` tuples are returned and no image
+    data is decoded. The times are read from the timestamp auxiliary data alone, unless
+    :check_frames is set (or no timestamp data exists), in which case the video is stepped
+    through frame by frame to verify that the timestamps cover every frame, and that
+    there are no timestamps for frames missing from the video.
+
+    Timestamps stored as tsync sync points are interpolated for every frame. Frames past
+    the last sync point get extrapolated times, except in :timestamps_only mode without
+    :check_frames, where the times end at the last sync point.
+    """
+    aux_data = _find_timestamp_aux_data(aux_data_entries)
+
+    sync_map_gen = None
+    coverage = _TimestampCoverage()
+    if aux_data:
+        # without looking at the video, sync-point times can only be known up to the last
+        # sync point, so we must not extrapolate them indefinitely in that case
+        extrapolate = not timestamps_only or check_frames
+        sync_map_gen = _read_video_aux_data(aux_data, extrapolate=extrapolate, coverage=coverage)
+
+    if timestamps_only:
+        return _read_frame_times(part_paths, sync_map_gen, check_frames, coverage)
+    if frame_func is not None:
+        return _map_frames(part_paths, sync_map_gen, frame_func, workers)
+    return _read_frames(part_paths, sync_map_gen)
+
+
+def _probe_cache_fname(dset: EDLDataset, cache: CacheSetting) -> Path:
+    if cache is True:
+        return dset.path / PROBE_CACHE_FNAME
+    # a shared cache directory may hold entries for many datasets,
+    # so we need the full path to tell them apart
+    path_hash = xxh3_64(str(dset.path.resolve()).encode('utf-8')).hexdigest()
+    return Path(T.cast(T.Any, cache)) / '{}-{}.videoprobe.json'.format(dset.name, path_hash)
+
+
+def _file_cache_key(fname: Path) -> dict[str, int]:
+    st = os.stat(fname)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _probe_part(fname: Path) -> VideoPartInfo:
+    vc = cv.VideoCapture(str(fname))
+    try:
+        if not vc.isOpened():
+            raise ValueError('Unable to open video file: {}'.format(fname))
+        fourcc = int(vc.get(cv.CAP_PROP_FOURCC))
+        return VideoPartInfo(
+            fname,
+            frame_count=int(vc.get(cv.CAP_PROP_FRAME_COUNT)),
+            fps=float(vc.get(cv.CAP_PROP_FPS)),
+            width=int(vc.get(cv.CAP_PROP_FRAME_WIDTH)),
+            height=int(vc.get(cv.CAP_PROP_FRAME_HEIGHT)),
+            codec=fourcc.to_bytes(4, 'little').decode('ascii', errors='replace').strip('\x00 '),
+        )
+    finally:
+        vc.release()
+
+
+def _count_timestamps(aux_data: EDLDataFile, fname: Path) -> tuple[int, bool]:
+    """Count the frame times in an aux data part, and whether they are sync points."""
+    if aux_data.file_type == 'tsync':
+        from .tsyncfile import load_data as load_tsync_data
+
+        count = 0
+        syncpoints = False
+        for tsf in load_tsync_data([fname], []):
+            if tsf.sync_mode == TSyncFileMode.SYNCPOINTS:
+                syncpoints = True
+                if tsf.times.shape[0] > 0:
+                    count += int(tsf.times[-1, 0] - tsf.times[0, 0]) + 1
+            else:
+                count += tsf.times.shape[0]
+        return count, syncpoints
+
+    from .csvdata import load_data as load_csv_data
+
+    rows = T.cast(T.Iterator[list[str]], load_csv_data([fname], []))
+    return sum(1 for row in rows if row and row[0] != 'frame'), False
+
+
+def probe_dataset(dset: EDLDataset, *, cache: CacheSetting = False) -> VideoProbe:
+    """Probe the video parts of a dataset for their metadata, without decoding any frames.
+
+    Frame counts, framerate, resolution and codec are read from the container of each
+    video part. The length of the timestamp auxiliary data is determined as well, so
+    mismatches can be detected via :meth:`VideoProbe.validate` before any frame is decoded.
+
+    Frame counts are as reported by the container, which may be an estimate for
+    some files.
+
+    Parameters
+    ----------
+    dset
+        The video dataset to probe.
+    cache
+        Cache results, and reuse them for as long as size and modification time of
+        a file do not change. Set it to True to cache in a hidden file in the dataset
+        directory (which changes the directory, and so invalidates a metadata index
+        entry of the dataset), or to a directory path to keep the cache there.
+
+    Returns
+    -------
+    VideoProbe
+        Metadata of all video parts and the number of known frame timestamps.
+    """
+    cache_fname = _probe_cache_fname(dset, cache) if cache else None
+    cached: dict[str, T.Any] = {}
+    if cache_fname is not None and cache_fname.is_file():
+        try:
+            with open(cache_fname, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            log.debug('Ignoring unreadable video probe cache {}: {}'.format(cache_fname, e))
+            cached = {}
+    new_cache: dict[str, T.Any] = {}
+
+    def cached_entry(fname: Path) -> tuple[str, dict[str, int], dict[str, T.Any] | None]:
+        key = str(Path(fname).relative_to(dset.path))
+        fkey = _file_cache_key(fname)
+        entry = cached.get(key)
+        if (
+            entry
+            and entry.get('size') == fkey['size']
+            and entry.get('mtime_ns') == fkey['mtime_ns']
+        ):
+            return key, fkey, entry
+        return key, fkey, None
+
+    parts = []
+    for fname in dset.data.part_paths():
+        fname = Path(fname)
+        key, fkey, entry = cached_entry(fname)
+        if entry is not None:
+            info = VideoPartInfo(
+                fname,
+                frame_count=int(entry['frame_count']),
+                fps=float(entry['fps']),
+                width=int(entry['width']),
+                height=int(entry['height']),
+                codec=str(entry['codec']),
+            )
+        else:
+            info = _probe_part(fname)
+        parts.append(info)
+        new_cache[key] = dict(
+            fkey,
+            frame_count=info.frame_count,
+            fps=info.fps,
+            width=info.width,
+            height=info.height,
+            codec=info.codec,
+        )
+
+    timestamp_count = None
+    timestamps_extrapolated = False
+    aux_data = _find_timestamp_aux_data(dset.aux_data)
+    if aux_data:
+        timestamp_count = 0
+        for fname in aux_data.part_paths():
+            fname = Path(fname)
+            key, fkey, entry = cached_entry(fname)
+            if entry is not None:
+                count, syncpoints = int(entry['count']), bool(entry.get('syncpoints', False))
+            else:
+                count, syncpoints = _count_timestamps(aux_data, fname)
+            timestamp_count += count
+            timestamps_extrapolated = timestamps_extrapolated or syncpoints
+            new_cache[key] = dict(fkey, count=count, syncpoints=syncpoints)
+
+    if cache_fname is not None and new_cache != cached:
+        try:
+            cache_fname.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_fname, 'w', encoding='utf-8') as f:
+                json.dump(new_cache, f, indent=2)
+        except OSError as e:
+            # the dataset may live on read-only storage, caching is optional
+            log.debug('Unable to write video probe cache {}: {}'.format(cache_fname, e))
+
+    return VideoProbe(parts, timestamp_count, timestamps_extrapolated)
+
+
+def convert_to_zarr(
+    dset: EDLDataset,
+    name: str | None = None,
+    *,
+    transform: T.Callable[[np.ndarray], np.ndarray] | None = None,
+    chunk_frames: int = 32,
+    compression_level: int = 3,
+    as_aux: bool = False,
+) -> EDLDataset:
+    """Decode a video dataset once and store its frames in a chunked, compressed Zarr store.
+
+    Frames are written to a ``data`` array with the frame number as first axis, the
+    frame timestamps are stored in a separate ``timestamps`` array, using the same
+    layout as Zarr data written by Syntalos. The resulting data can be read back quickly
+    and repeatedly, without decoding the video again.
+
+    Parameters
+    ----------
+    dset
+        The video dataset to convert.
+    name
+        Name of the new dataset to create next to :dset. Defaults to the name of
+        :dset with a ``-zarr`` suffix. Ignored if :as_aux is set.
+    transform
+        Optional function that is applied to every frame before it is stored.
+        It must return arrays of the same shape and type for every frame.
+    chunk_frames
+        Number of frames that are stored together in one chunk.
+    compression_level
+        Zstandard compression level for the stored data.
+    as_aux
+        Register the Zarr store as auxiliary data of :dset, instead of creating
+        a new dataset.
+
+    Returns
+    -------
+    EDLDataset
+        The dataset the Zarr store was registered with.
+    """
+    try:
+        from zarr.codecs import ZstdCodec
+    except ImportError as e:
+        raise ImportError('Missing optional dependency "zarr". Please install it with pip!') from e
+
+    from .zarr import create_part
+    from ..group import EDLGroup
+
+    if as_aux:
+        target = dset
+        dfile = EDLDataFile(dset.path)
+        store_fname = '{}_frames.zarr'.format(dset.name)
+    else:
+        if not isinstance(dset.parent, EDLGroup):
+            raise EDLError(
+                'Dataset "{}" has no parent group to add a new dataset to.'.format(dset.name)
+            )
+        if not name:
+            name = '{}-zarr'.format(dset.name)
+        if dset.parent.dataset_by_name(name) is not None:
+            raise ValueError('A dataset with name "{}" already exists.'.format(name))
+        target = T.cast(EDLDataset, dset.parent.dataset_by_name(name, create=True))
+        dfile = target.data
+        store_fname = '{}.zarr'.format(target.name)
+
+    root = None
+    buffer: list[np.ndarray] = []
+    times: list[int] = []
+
+    def flush() -> None:
+        if buffer:
+            T.cast(T.Any, root)['data'].append(np.stack(buffer), axis=0)
+            buffer.clear()
+
+    for frame in T.cast(T.Iterator[Frame], dset.read_data()):
+        mat = transform(frame.mat) if transform is not None else frame.mat
+        if root is None:
+            # the layout is set explicitly, the preset only selects how timestamps are stored
+            root = create_part(
+                dfile,
+                store_fname,
+                (0,) + mat.shape,
+                mat.dtype,
+                chunks=(chunk_frames,) + mat.shape,
+                compressor=ZstdCodec(level=compression_level, checksum=True),
+                preset='timeseries',
+                attributes={'source_dataset': str(dset.name)},
+                time_unit='index' if isinstance(frame.time, int) else 'microseconds',
+            )
+        buffer.append(mat)
+        if len(buffer) >= chunk_frames:
+            flush()
+
+        if isinstance(frame.time, int):
+            times.append(frame.index)
+        else:
+            times.append(int(frame.time.to(ureg.usec).magnitude))
+    flush()
+
+    if root is None:
+        raise ValueError('Video dataset "{}" has no frames to convert.'.format(dset.name))
+    T.cast(T.Any, root)['timestamps'].append(np.array(times, dtype=np.uint64))
+
+    if as_aux:
+        dset.add_aux_data(dfile)
+    target.save()
+    return target
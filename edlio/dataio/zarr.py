@@ -22,26 +22,318 @@ from __future__ import annotations
 import typing as T
 from pathlib import Path
 
+import numpy as np
+
 from ..dataset import EDLDataFile
 
+if T.TYPE_CHECKING:
+    import zarr
+
+
+def _import_zarr() -> T.Any:
+    try:
+        import zarr
+    except ImportError as e:
+        raise ImportError('Missing optional dependency "zarr". Please install it with pip!') from e
+    return zarr
+
+
+def _open_store(store_path: Path) -> zarr.Group:
+    zarr = _import_zarr()
+    # We need to open from a local store explicitly, because otherwise, if the local
+    # path string contains any URL element like "#" or "?", the Zarr parser will drop
+    # it. On newer Zarr versions, passing in a pathlib.Path will work, but we don't
+    # want to rely on that just yet.
+    store = zarr.storage.LocalStore(store_path)
+    return zarr.open(store, mode='r')
+
+
+# Chunking and compression presets for new Zarr parts:
+# * timeseries: Long chunks along the time axis of about 1 MiB, covering all channels,
+#   with byte-shuffled compression which works well for slowly changing signals.
+# * images: One frame per chunk for fast random access to individual frames, with
+#   64 frames grouped into one shard to keep the number of files low.
+ZARR_PRESETS = ('timeseries', 'images')
+
+
+def _preset_layout(
+    preset: str, shape: tuple[int, ...], dtype: np.dtype
+) -> tuple[tuple[int, ...], tuple[int, ...] | None, T.Any]:
+    """Get the default chunk shape, shard shape and compressor of a preset."""
+    from zarr.codecs import ZstdCodec, BloscCodec
+
+    row_shape = tuple(max(d, 1) for d in shape[1:])
+    if preset == 'timeseries':
+        row_bytes = dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+        chunk_rows = max(1, (1024 * 1024) // row_bytes)
+        compressor = BloscCodec(typesize=dtype.itemsize, cname='zstd', clevel=5, shuffle='shuffle')
+        return (chunk_rows,) + row_shape, None, compressor
+    if preset == 'images':
+        return (1,) + row_shape, (64,) + row_shape, ZstdCodec(level=3)
+    raise ValueError(
+        'Unknown Zarr preset "{}", expected one of: {}'.format(preset, ', '.join(ZARR_PRESETS))
+    )
+
+
+def create_part(
+    dfile: EDLDataFile,
+    name: str,
+    shape: T.Sequence[int],
+    dtype: T.Any,
+    *,
+    chunks: T.Sequence[int] | None = None,
+    compressor: T.Any = None,
+    preset: str = 'timeseries',
+    shards: T.Sequence[int] | None = None,
+    index: int = -1,
+    attributes: dict[str, T.Any] | None = None,
+    time_unit: str | None = 'microseconds',
+) -> zarr.Group:
+    """Create a new Zarr store as part of a data file.
+
+    See :meth:`edlio.EDLDataset.create_zarr_part` for details.
+    """
+    zarr = _import_zarr()
+
+    if not name.endswith('.zarr'):
+        name += '.zarr'
+    shape = tuple(int(d) for d in shape)
+    if not shape:
+        raise ValueError('Zarr parts need at least one (time) dimension.')
+    dtype = np.dtype(dtype)
+
+    def_chunks, def_shards, def_compressor = _preset_layout(preset, shape, dtype)
+    chunks = tuple(chunks) if chunks is not None else def_chunks
+    if len(chunks) != len(shape):
+        raise ValueError(
+            'Chunk shape {} does not match the array dimensions {}.'.format(chunks, shape)
+        )
+    if shards is None and def_shards is not None:
+        # shards need to consist of whole chunks
+        shards = tuple(-(-s // c) * c for s, c in zip(def_shards, chunks))
+    if compressor is None:
+        compressor = def_compressor
+
+    if dfile.base_path is not None and (dfile.base_path / name).exists():
+        raise ValueError('Zarr store "{}" already exists.'.format(dfile.base_path / name))
+    _, store_path = dfile.new_part(Path(name), index)
+
+    root = zarr.open_group(zarr.storage.LocalStore(store_path), mode='w')
+    root.create_array(
+        'data',
+        shape=shape,
+        dtype=dtype,
+        chunks=chunks,
+        shards=tuple(shards) if shards is not None else None,
+        compressors=compressor,
+        dimension_names=('time',) + (None,) * (len(shape) - 1),
+        attributes=attributes or {},
+    )
+    if time_unit is not None:
+        root.create_array(
+            'timestamps',
+            shape=(shape[0],),
+            dtype=np.uint64,
+            chunks=(max(1024, chunks[0]),),
+            compressors=def_compressor if preset == 'timeseries' else compressor,
+            dimension_names=('time',),
+            attributes={'time_unit': time_unit},
+        )
+    return root
+
+
+class ConcatenatedArray:
+    """Read-only view of the arrays with the same name in all parts of a Zarr dataset.
+
+    The arrays are concatenated along their first (time) axis. Slicing the view only
+    reads the chunks needed from the parts that overlap with the selection.
+    """
+
+    def __init__(self, name: str, arrays: T.Sequence[zarr.Array]):
+        if not arrays:
+            raise ValueError('Can not concatenate "{}": No arrays given.'.format(name))
+        first = arrays[0]
+        for arr in arrays[1:]:
+            if arr.shape[1:] != first.shape[1:] or arr.dtype != first.dtype:
+                raise ValueError(
+                    'Can not concatenate "{}": Parts have different shapes or types '
+                    '({} {} vs. {} {}).'.format(
+                        name, first.shape, first.dtype, arr.shape, arr.dtype
+                    )
+                )
+        self._name = name
+        self._arrays = list(arrays)
+        # start offset of each part along the first axis, plus the total length
+        self._offsets = np.cumsum([0] + [arr.shape[0] for arr in self._arrays])
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def arrays(self) -> list[zarr.Array]:
+        """The arrays of the individual parts."""
+        return self._arrays
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Index of the first element of each part along the first axis."""
+        return self._offsets[:-1]
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return (int(self._offsets[-1]),) + tuple(self._arrays[0].shape[1:])
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._arrays[0].dtype
+
+    @property
+    def attrs(self) -> T.Mapping[str, T.Any]:
+        """Attributes of the array in the first part."""
+        return T.cast(T.Mapping[str, T.Any], self._arrays[0].attrs)
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __repr__(self) -> str:
+        return 'ConcatenatedArray(name={}, shape={}, dtype={}, parts={})'.format(
+            self._name, self.shape, self.dtype, len(self._arrays)
+        )
+
+    def __array__(self, dtype: T.Any = None, copy: T.Any = None) -> np.ndarray:
+        data = self[:]
+        return data if dtype is None else data.astype(dtype)
+
+    def _read_range(self, rows: range, rest: tuple[T.Any, ...]) -> np.ndarray:
+        """Read the rows of a range with a positive step."""
+        blocks = []
+        first_part = int(np.searchsorted(self._offsets, rows.start, side='right')) - 1
+        for i in range(max(first_part, 0), len(self._arrays)):
+            part_start, part_end = int(self._offsets[i]), int(self._offsets[i + 1])
+            if part_start >= rows.stop:
+                break
+            if part_end <= rows.start:
+                continue
+            # first row of the range in this part, keeping the step alignment
+            start = max(rows.start, part_start)
+            start += (rows.start - start) % rows.step
+            if start >= min(part_end, rows.stop):
+                continue
+            local = slice(start - part_start, min(part_end, rows.stop) - part_start, rows.step)
+            blocks.append(np.asarray(self._arrays[i][(local,) + rest]))
+        if not blocks:
+            empty = np.asarray(self._arrays[0][(slice(0, 0),) + rest])
+            return empty
+        return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+    def __getitem__(self, key: T.Any) -> T.Any:
+        if not isinstance(key, tuple):
+            key = (key,)
+        if not key or key[0] is Ellipsis:
+            key = (slice(None),) + key
+        sel, rest = key[0], tuple(key[1:])
+
+        if isinstance(sel, (int, np.integer)):
+            index = int(sel)
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(
+                    'Index {} is out of bounds for "{}" of length {}.'.format(
+                        sel, self._name, len(self)
+                    )
+                )
+            part = int(np.searchsorted(self._offsets, index, side='right')) - 1
+            return self._arrays[part][(index - int(self._offsets[part]),) + rest]
+
+        if not isinstance(sel, slice):
+            raise TypeError(
+                'Concatenated arrays can only be indexed by integers or slices along '
+                'their first axis, not {}.'.format(type(sel).__name__)
+            )
+        rows = range(*sel.indices(len(self)))
+        if rows.step > 0:
+            return self._read_range(rows, rest)
+        if len(rows) == 0:
+            return self._read_range(range(0, 0), rest)
+        # read negative steps forward, and reverse the result afterwards
+        fwd = range(rows[-1], rows[0] + 1, -rows.step)
+        return self._read_range(fwd, rest)[::-1]
+
+
+class ConcatenatedGroup:
+    """Read-only view of all parts of a Zarr dataset as if they were a single store.
+
+    Arrays are accessed by name, and are concatenated along their first axis.
+    Stores are opened once and kept open for as long as this view exists.
+    """
+
+    def __init__(self, part_paths: T.Iterable[Path]):
+        self._part_paths = [Path(p) for p in part_paths]
+        self._groups: list[zarr.Group] | None = None
+        self._arrays: dict[str, ConcatenatedArray] = {}
+
+    @property
+    def groups(self) -> list[zarr.Group]:
+        """The root groups of the individual parts."""
+        if self._groups is None:
+            self._groups = [_open_store(p) for p in self._part_paths]
+        return self._groups
+
+    @property
+    def attrs(self) -> T.Mapping[str, T.Any]:
+        """Attributes of the root group of the first part."""
+        if not self.groups:
+            return {}
+        return T.cast(T.Mapping[str, T.Any], self.groups[0].attrs)
+
+    def array_keys(self) -> list[str]:
+        """Names of the arrays present in the first part."""
+        if not self.groups:
+            return []
+        return list(self.groups[0].array_keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.array_keys()
+
+    def __getitem__(self, name: str) -> ConcatenatedArray:
+        arr = self._arrays.get(name)
+        if arr is None:
+            arrays = []
+            for path, group in zip(self._part_paths, self.groups):
+                if name not in group.array_keys():
+                    raise KeyError('Array "{}" does not exist in "{}".'.format(name, path))
+                arrays.append(T.cast('zarr.Array', group[name]))
+            arr = ConcatenatedArray(name, arrays)
+            self._arrays[name] = arr
+        return arr
+
+    def __repr__(self) -> str:
+        return 'ConcatenatedGroup(parts={})'.format(len(self._part_paths))
+
 
 def load_data(
-    part_paths: T.Iterable[Path], aux_data_entries: T.Sequence[EDLDataFile]
+    part_paths: T.Iterable[Path],
+    aux_data_entries: T.Sequence[EDLDataFile],
+    concat: bool = False,
 ) -> T.Iterator[T.Any]:
     """Entry point for automatic dataset loading.
 
     Opens each Zarr store and yields its root group. Callers can access
     arrays and attributes directly via the zarr API.
+
+    If :concat is set, a single :class:`ConcatenatedGroup` is yielded instead, which
+    provides each array concatenated across all parts along its first axis.
     """
-    try:
-        import zarr
-    except ImportError as e:
-        raise ImportError('Missing optional dependency "zarr". Please install it with pip!') from e
+    _import_zarr()
 
+    if concat:
+        yield ConcatenatedGroup(part_paths)
+        return
     for store_path in part_paths:
-        # We need to open from a local store explicitly, because otherwise, if the local
-        # path string contains any URL element like "#" or "?", the Zarr parser will drop
-        # it. On newer Zarr versions, passing in a pathlib.Path will work, but we don't
-        # want to rely on that just yet.
-        store = zarr.storage.LocalStore(store_path)
-        yield zarr.open(store, mode='r')
+        yield _open_store(store_path)
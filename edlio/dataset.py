@@ -21,24 +21,54 @@ from __future__ import annotations
 
 import os
 import typing as T
+import asyncio
+import operator
 import functools
+import concurrent.futures
 from pathlib import Path
 
 from .unit import EDLUnit, EDLError
 from .dataio import DATA_LOADERS, load_dataio_module
+from .dataio.compressed import (
+    COMPRESSION_MEDIA_TYPES,
+    file_type_of,
+    strip_compression_ext,
+)
+
+
+def _normalize_part_name(fname: str) -> str:
+    # parts are almost always plain file names, which do not need to be normalized
+    if '/' in fname or '\\' in fname or fname.startswith('.'):
+        return str(Path(fname))
+    return fname
 
 
 @functools.total_ordering
 class EDLDataPart:
     """Describes a part of a data block that has been split into multiple files."""
 
-    index: int = -1
-    fname: Path
+    # datasets may have a huge amount of parts, so we keep them small
+    __slots__ = ('_fname', 'index')
+
+    index: int
+
+    # number of renames of any part, so part lists know when their name index is outdated
+    _renames: T.ClassVar[int] = 0
 
-    def __init__(self, fname: os.PathLike[str], index: int = -1):
-        self.fname = Path(fname)
+    def __init__(self, fname: os.PathLike[str] | str, index: int = -1):
+        self._fname = _normalize_part_name(os.fspath(fname))
         self.index = index
 
+    @property
+    def fname(self) -> Path:
+        """File name of this part, relative to the dataset directory."""
+        return Path(self._fname)
+
+    @fname.setter
+    def fname(self, fname: os.PathLike[str] | str) -> None:
+        self._fname = _normalize_part_name(os.fspath(fname))
+        EDLDataPart._renames += 1
+
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, EDLDataPart):
             return NotImplemented
@@ -54,19 +84,87 @@ class EDLDataPart:
         return 'EDLDataPart(' + str(self.fname) + idx_str + ')'
 
 
+class _DataPartList(list):
+    """List of data parts, which can quickly find a part by its file name."""
+
+    def __init__(self, parts: T.Iterable[EDLDataPart] = ()):
+        super().__init__(parts)
+        self._reindex()
+
+    def __reduce__(self) -> tuple[T.Any, ...]:
+        return (self.__class__, (list(self),))
+
+    def _reindex(self) -> None:
+        self._by_name: dict[str, EDLDataPart] = {}
+        self._indexed_renames = EDLDataPart._renames
+        for part in self:
+            self._by_name.setdefault(part._fname, part)
+
+    def find(self, fname: os.PathLike[str] | str) -> EDLDataPart | None:
+        """Get the part with file name :fname, or None if there is none."""
+        if self._indexed_renames != EDLDataPart._renames:
+            # parts were renamed, which is rare, so we just rebuild the index
+            self._reindex()
+        return self._by_name.get(_normalize_part_name(os.fspath(fname)))
+
+    def append(self, part: EDLDataPart) -> None:
+        super().append(part)
+        self._by_name.setdefault(part._fname, part)
+
+    def insert(self, i: T.SupportsIndex, part: EDLDataPart) -> None:
+        super().insert(i, part)
+        self._by_name.setdefault(part._fname, part)
+
+    def extend(self, parts: T.Iterable[EDLDataPart]) -> None:
+        parts = list(parts)
+        super().extend(parts)
+        for part in parts:
+            self._by_name.setdefault(part._fname, part)
+
+    def __iadd__(self, parts: T.Iterable[EDLDataPart]) -> T.Self:  # type: ignore[override, misc]
+        self.extend(parts)
+        return self
+
+    # removing parts is rare, so we just rebuild the index in that case
+
+    def __setitem__(self, i: T.Any, v: T.Any) -> None:
+        super().__setitem__(i, v)
+        self._reindex()
+
+    def __delitem__(self, i: T.Any) -> None:
+        super().__delitem__(i)
+        self._reindex()
+
+    def __imul__(self, n: T.SupportsIndex) -> T.Self:
+        super().__imul__(n)
+        self._reindex()
+        return self
+
+    def remove(self, part: EDLDataPart) -> None:
+        super().remove(part)
+        self._reindex()
+
+    def pop(self, i: T.SupportsIndex = -1) -> EDLDataPart:
+        part = super().pop(i)
+        self._reindex()
+        return part
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_name.clear()
+
+
 class EDLDataFile:
     """A data file, associated with a dataset"""
 
-    parts: list[EDLDataPart]
-
     def __init__(
         self,
         base_path: os.PathLike[str] | None,
         media_type: str | None = None,
         file_type: str | None = None,
-        unit_attrs: dict[str, T.Any] | None = None,
+        unit_attrs: T.Mapping[str, T.Any] | T.Callable[[], T.Mapping[str, T.Any]] | None = None,
     ):
-        if not unit_attrs:
+        if unit_attrs is None:
             unit_attrs = {}
 
         self._base_path = Path(base_path) if base_path else None
@@ -74,7 +172,22 @@ class EDLDataFile:
         self._file_type = file_type
         self._unit_attrs = unit_attrs
         self._summary: str | None = None
-        self.parts = []
+        self._parts = _DataPartList()
+
+    @property
+    def parts(self) -> list[EDLDataPart]:
+        """The parts of this data, in their reading order."""
+        return self._parts
+
+    @parts.setter
+    def parts(self, parts: T.Iterable[EDLDataPart]) -> None:
+        self._parts = parts if isinstance(parts, _DataPartList) else _DataPartList(parts)
+
+    def _unit_attributes(self) -> T.Mapping[str, T.Any]:
+        # attributes of the dataset may be passed as function, to only be read when needed
+        if callable(self._unit_attrs):
+            return self._unit_attrs()
+        return self._unit_attrs
 
     @property
     def data_type(self) -> tuple[str | None, str | None]:
@@ -136,17 +249,15 @@ class EDLDataFile:
         """
         if not self._base_path:
             raise RuntimeError('Base path for this data file is not set.')
-        for part in self.parts:
-            yield self._base_path.joinpath(part.fname)
+        for part in self._parts:
+            yield self._base_path.joinpath(part._fname)
 
     def new_part(
         self, fname: os.PathLike[str], index: int = -1, *, allow_exists: bool = False
     ) -> tuple[EDLDataPart, Path]:
         if not fname:
             raise ValueError('File name is not valid.')
-        _, fext = os.path.splitext(str(fname))
-        if fext and fext.startswith('.'):
-            fext = fext[1:]
+        fext = file_type_of(fname)
         if not self._file_type:
             self._file_type = fext
         elif self._file_type != fext:
@@ -159,14 +270,14 @@ class EDLDataFile:
         if not self._base_path:
             raise RuntimeError('Can not add data part: Base path is not set.')
 
-        for ep in self.parts:
-            if ep.fname == Path(fname):
-                if allow_exists:
-                    return ep, self._base_path.joinpath(ep.fname)
-                raise ValueError('A file part with name "{}" already exists.'.format(fname))
+        ep = self._parts.find(fname)
+        if ep is not None:
+            if allow_exists:
+                return ep, self._base_path.joinpath(ep._fname)
+            raise ValueError('A file part with name "{}" already exists.'.format(fname))
         part = EDLDataPart(fname, index)
-        self.parts.append(part)
-        return part, self._base_path.joinpath(part.fname)
+        self._parts.append(part)
+        return part, self._base_path.joinpath(part._fname)
 
     def read(
         self, aux_data_entries: T.Optional[T.Sequence[EDLDataFile]] = None, **kwargs: T.Any
@@ -187,15 +298,18 @@ class EDLDataFile:
                     'probably invalid, or this file does not exist.'
                 )
             )
+        if dclass in COMPRESSION_MEDIA_TYPES and self.file_type:
+            # the file type tells us what the compressed data actually is
+            dclass = self.file_type
+        # compressed parts are decompressed transparently by the loaders
+        dclass = strip_compression_ext(dclass)
+
         if dclass.startswith('video/'):
             dclass = 'video'
         elif dclass.startswith('text/csv'):
             dclass = 'csv'
         elif dclass == 'application/json':
             dclass = 'json'
-        elif dclass == 'application/zstd':
-            if self.file_type == 'json.zst':
-                dclass = 'json'
         elif 'json' in dclass:
             dclass = 'json'
 
@@ -204,7 +318,14 @@ class EDLDataFile:
 
         if dclass == 'json':
             # knowing the JSON schema in advance is very useful
-            kwargs['json_schema'] = self._unit_attrs.get('json_schema')
+            kwargs['json_schema'] = self._unit_attributes().get('json_schema')
+        elif (
+            dclass == 'csv'
+            and (kwargs.get('as_arrays') or kwargs.get('as_arrow'))
+            and 'dtypes' not in kwargs
+        ):
+            # column types may be hinted at in the dataset attributes
+            kwargs['dtypes'] = self._unit_attributes().get('csv_dtypes')
 
         load_data = load_dataio_module(dclass)
         return load_data(self.part_paths(), aux_data_entries, **kwargs)
@@ -228,9 +349,12 @@ class EDLDataset(EDLUnit):
             Name of this dataset, or None
         """
         EDLUnit.__init__(self, name)
-        self._data = EDLDataFile(None, unit_attrs=self.attributes)
+        self._data = EDLDataFile(None, unit_attrs=self._get_attributes)
         self._aux_data: list[EDLDataFile] = []
 
+    def _get_attributes(self) -> dict[str, T.Any]:
+        return self.attributes
+
     @property
     def root_path(self) -> Path | None:
         return self._root_path
@@ -263,17 +387,21 @@ class EDLDataset(EDLUnit):
 
     def _parse_data_md(self, d: dict[str, T.Any]) -> EDLDataFile:
         df = EDLDataFile(
-            self.path, d.get('media_type'), d.get('file_type'), unit_attrs=self.attributes
+            self.path, d.get('media_type'), d.get('file_type'), unit_attrs=self._get_attributes
         )
         df.summary = d.get('summary')
-        for pi in d.get('parts', []):
-            df.parts.append(EDLDataPart(pi['fname'], pi.get('index', -1)))
-        if df.parts:
-            df.parts.sort()
+        parts = [EDLDataPart(pi['fname'], pi.get('index', -1)) for pi in d.get('parts', [])]
+        # sort by key, as comparing parts via Python methods is slow for many parts
+        parts.sort(key=operator.attrgetter('index'))
+        df.parts = parts
         return df
 
     def load(
-        self, path: os.PathLike[str], mf: T.Optional[T.MutableMapping[str, T.Any]] = None
+        self,
+        path: os.PathLike[str],
+        mf: T.Optional[T.MutableMapping[str, T.Any]] = None,
+        *,
+        attrs: dict[str, T.Any] | None = None,
     ) -> None:
         """
         Load an EDL dataset from a path.
@@ -284,12 +412,14 @@ class EDLDataset(EDLUnit):
             Filesystem path of this dataset.
         mf
             Manifest file data as dictionary, if data from :path should not be used.
+        attrs
+            Attribute data as dictionary, if data from :path should not be used.
         """
         if not mf:
             mf = {}
-        EDLUnit.load(self, path, mf)
+        EDLUnit.load(self, path, mf, attrs=attrs)
 
-        self._data = EDLDataFile(self.path, unit_attrs=self.attributes)
+        self._data = EDLDataFile(self.path, unit_attrs=self._get_attributes)
         self._aux_data = []
         if 'data' in mf:
             self._data = self._parse_data_md(mf['data'])
@@ -311,19 +441,20 @@ class EDLDataset(EDLUnit):
             d['file_type'] = df.file_type
         if df.summary:
             d['summary'] = df.summary
-        d['parts'] = []
-        for part in df.parts:
-            pd: dict[str, T.Any] = {'fname': str(part.fname)}
-            if part.index >= 0:
-                pd['index'] = part.index
-            d['parts'].append(pd)
+        d['parts'] = [
+            (
+                {'fname': part._fname, 'index': part.index}
+                if part.index >= 0
+                else {'fname': part._fname}
+            )
+            for part in df.parts
+        ]
         return d
 
     def save(self) -> None:
         """Save dataset changes to their current location on disk."""
         if not self.path:
             raise ValueError('No path set for EDL group "{}"'.format(self.name))
-        self.path.mkdir(parents=True, exist_ok=True)
 
         mf = self._make_manifest_dict()
         mf['data'] = self._serialize_data_md(self._data)
@@ -333,7 +464,80 @@ class EDLDataset(EDLUnit):
                 adf_list.append(self._serialize_data_md(adf))
             mf['data_aux'] = adf_list
 
-        self._save_metadata(mf, self.attributes)
+        self._save_metadata(mf)
+
+    def create_zarr_part(
+        self,
+        name: str,
+        shape: T.Sequence[int],
+        dtype: T.Any,
+        *,
+        chunks: T.Sequence[int] | None = None,
+        compressor: T.Any = None,
+        preset: str = 'timeseries',
+        shards: T.Sequence[int] | None = None,
+        index: int = -1,
+        attributes: dict[str, T.Any] | None = None,
+        time_unit: str | None = 'microseconds',
+    ) -> T.Any:
+        """Create a new Zarr store as data part of this dataset, and register it.
+
+        The store uses the same layout as Zarr data written by Syntalos: Values are
+        stored in a ``data`` array with time as its first axis, and the time of each
+        row in a ``timestamps`` array. The time axis may start with a length of zero,
+        and be grown later (e.g. via ``append``).
+
+        Chunks (or shards, if sharding is used) are stored independently of each other,
+        so separate threads or processes can write to them in parallel, as long as
+        each writes whole chunks or shards.
+
+        Parameters
+        ----------
+        name
+            File name of the new store. A ``.zarr`` suffix is added if missing.
+        shape
+            Initial shape of the data array.
+        dtype
+            Type of the data array.
+        chunks
+            Chunk shape of the data array, overriding the preset.
+        compressor
+            A Zarr codec to compress the data with, overriding the preset.
+        preset
+            Chunking and compression defaults, one of ``timeseries`` (long chunks
+            along the time axis) or ``images`` (one frame per chunk, sharded).
+        shards
+            Shard shape of the data array, which must consist of whole chunks.
+            Sharding groups multiple chunks into a single file.
+        index
+            Index of the new part, if parts are numbered.
+        attributes
+            Attributes of the data array, e.g. ``signal_names`` or ``data_unit``.
+        time_unit
+            Unit of the timestamps, or None to not create a timestamps array.
+
+        Returns
+        -------
+        zarr.Group
+            The writable root group of the new store.
+        """
+        from .dataio.zarr import create_part
+
+        root = create_part(
+            self._data,
+            name,
+            shape,
+            dtype,
+            chunks=chunks,
+            compressor=compressor,
+            preset=preset,
+            shards=shards,
+            index=index,
+            attributes=attributes,
+            time_unit=time_unit,
+        )
+        self.save()
+        return root
 
     def read_data(self, **kwargs: T.Any) -> T.Any:
         """Read data from this dataset.
@@ -345,6 +549,42 @@ class EDLDataset(EDLUnit):
             return None
         return self._data.read(self._aux_data, **kwargs)
 
+    async def aread_data(
+        self, *, executor: concurrent.futures.Executor | None = None, **kwargs: T.Any
+    ) -> T.AsyncIterator[T.Any]:
+        """Read data from this dataset asynchronously.
+
+        This is the asynchronous variant of :meth:`read_data`, which yields the same
+        chunks of data. Opening the data and reading each chunk is done in :executor
+        (or the default executor of the event loop), so the event loop is not blocked
+        and multiple datasets can be read at the same time.
+        """
+        loop = asyncio.get_running_loop()
+        it = await loop.run_in_executor(executor, functools.partial(self.read_data, **kwargs))
+        if it is None:
+            return
+        it = iter(it)
+
+        end = object()
+        pending: asyncio.Future[T.Any] | None = None
+        try:
+            while True:
+                pending = loop.run_in_executor(executor, next, it, end)
+                item = await pending
+                pending = None
+                if item is end:
+                    break
+                yield item
+        finally:
+            if pending is not None:
+                # we were cancelled while the reader was busy, and can only close it once it is done
+                await asyncio.wait([pending])
+                if not pending.cancelled():
+                    pending.exception()
+            close = getattr(it, 'close', None)
+            if close is not None:
+                await loop.run_in_executor(executor, close)
+
     def read_aux_data(self, key: str | None = None, **kwargs: T.Any) -> T.Any | None:
         """
         Read auxiliary data from this dataset.
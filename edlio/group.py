@@ -22,13 +22,21 @@ from __future__ import annotations
 import os
 import uuid
 import typing as T
+import asyncio
+import functools
+import concurrent.futures
 from pathlib import Path
 
-import tomlkit as toml
-
 from .unit import EDLUnit, EDLError
+from .walk import iter_units
+from .utils import load_toml, sanitize_name
 from .dataset import EDLDataset
 
+if T.TYPE_CHECKING:
+    from .index import MetadataIndex
+
+_UnitT = T.TypeVar('_UnitT', bound=EDLUnit)
+
 
 class EDLGroup(EDLUnit):
     """
@@ -49,9 +57,16 @@ class EDLGroup(EDLUnit):
         """
         EDLUnit.__init__(self, name)
         self._children: list[EDLUnit] = []
+        self._children_by_name: dict[str, EDLUnit] = {}
+        # set if children exist on disk which were not loaded yet
+        self._children_pending = False
+        self._lazy = False
+        self._index: MetadataIndex | None = None
+        self._jobs = 1
 
     @property
     def children(self) -> list[EDLUnit]:
+        self._load_pending_children()
         return self._children
 
     @property
@@ -60,6 +75,9 @@ class EDLGroup(EDLUnit):
 
     @root_path.setter
     def root_path(self, path: os.PathLike[str]) -> None:
+        if self._children_pending and self._root_path and Path(path) != self._root_path:
+            # children that were not loaded yet would be missing at the new location
+            self._load_pending_children()
         self._root_path = Path(path)
         for c in self._children:
             c.root_path = self.path
@@ -79,11 +97,25 @@ class EDLGroup(EDLUnit):
         for c in self._children:
             c.root_path = self.path
 
+    def _moved_on_disk(self, old_dir: Path, new_dir: Path) -> None:
+        # the data of all loaded children moved along with our directory
+        EDLUnit._moved_on_disk(self, old_dir, new_dir)
+        for c in self._children:
+            c._moved_on_disk(old_dir, new_dir)
+
     def add_child(self, child: EDLUnit) -> None:
         if not isinstance(child, EDLUnit):
             raise ValueError('Can only have EDL units as children.')
         if not child.name:
             raise ValueError('Child unit must have a name.')
+        if self._child_by_name(child.name, EDLUnit) is not None:
+            raise ValueError(
+                'A unit with name "{}" already exists in "{}".'.format(child.name, self.name)
+            )
+        self._attach_child(child)
+
+    def _attach_child(self, child: EDLUnit) -> None:
+        assert child.name
         old_path = None
         if child.root_path:
             old_path = child.path
@@ -93,27 +125,59 @@ class EDLGroup(EDLUnit):
 
         if old_path and old_path.is_dir():
             old_path.rename(child.path)
+            child._moved_on_disk(old_path, child.path)
         self._children.append(child)
+        self._children_by_name[child.name] = child
+
+    def _attach_loaded_child(self, child: EDLUnit) -> None:
+        """Attach a child that was just loaded from its directory below ours.
+
+        Unlike :meth:`_attach_child`, this never touches the filesystem, as the child
+        is already where it belongs.
+        """
+        assert child.name
+        child._parent = self
+        child.collection_id = self.collection_id
+        self._children.append(child)
+        self._children_by_name[child.name] = child
+
+    def _rename_child(self, child: EDLUnit, old_name: str | None) -> None:
+        """Update the name index after :child was renamed from :old_name."""
+        if old_name and self._children_by_name.get(old_name) is child:
+            del self._children_by_name[old_name]
+        if child.name:
+            self._children_by_name[child.name] = child
 
     @property
     def datasets(self) -> T.Iterator[EDLDataset]:
-        for child in self._children:
+        for child in self.children:
             if isinstance(child, EDLDataset):
                 yield child
 
     @property
     def groups(self) -> T.Iterator[EDLGroup]:
-        for child in self._children:
+        for child in self.children:
             if isinstance(child, EDLGroup):
                 yield child
 
+    def _child_by_name(self, name: str, cls: type[_UnitT]) -> _UnitT | None:
+        """Find a child by its name, loading only this child if children are pending."""
+        child = self._children_by_name.get(name)
+        if child is not None:
+            return child if isinstance(child, cls) else None
+        if not self._children_pending or sanitize_name(name) != name:
+            return None
+        entry = self._index.lookup(self.path) if self._index else None
+        if entry is not None and name not in entry['children']:
+            return None
+        child = self._load_child(self.path / name)
+        return child if isinstance(child, cls) else None
+
     def group_by_name(self, name: str, *, create: bool = False) -> EDLGroup | None:
-        group: EDLGroup | None
-        for group in self.groups:
-            if group.name == name:
-                return group
+        group = self._child_by_name(name, EDLGroup)
+        if group is not None:
+            return group
 
-        group = None
         if create:
             group = EDLGroup(name)
             self.add_child(group)
@@ -122,12 +186,10 @@ class EDLGroup(EDLUnit):
         return group
 
     def dataset_by_name(self, name: str, *, create: bool = False) -> EDLDataset | None:
-        dset: EDLDataset | None
-        for dset in self.datasets:
-            if dset.name == name:
-                return dset
+        dset = self._child_by_name(name, EDLDataset)
+        if dset is not None:
+            return dset
 
-        dset = None
         if create:
             dset = EDLDataset(name)
             self.add_child(dset)
@@ -135,40 +197,211 @@ class EDLGroup(EDLUnit):
 
         return dset
 
+    def resolve(self, path: str) -> EDLUnit | None:
+        """
+        Find a unit in the tree below this group by its relative path.
+
+        Parameters
+        ----------
+        path
+            Names of the units to descend into, separated by slashes,
+            e.g. ``videos/generic-camera``.
+
+        Returns
+        -------
+        The unit, or None if no unit exists at :path.
+        """
+        unit: EDLUnit = self
+        for name in path.split('/'):
+            if not name or name == '.':
+                continue
+            if not isinstance(unit, EDLGroup):
+                return None
+            child = unit._child_by_name(name, EDLUnit)
+            if child is None:
+                return None
+            unit = child
+        return unit
+
+    def __getitem__(self, path: str) -> EDLUnit:
+        """Get a unit by its relative path, see :meth:`resolve`."""
+        unit = self.resolve(path)
+        if unit is None:
+            raise KeyError(path)
+        return unit
+
+    def __contains__(self, path: str) -> bool:
+        return self.resolve(path) is not None
+
+    def __iter__(self) -> T.Iterator[EDLUnit]:
+        return iter(self.children)
+
+    def walk(
+        self,
+        *,
+        unit_type: str | T.Iterable[str] | None = None,
+        media_type: str | T.Iterable[str] | None = None,
+    ) -> T.Iterator[tuple[Path, str, dict[str, T.Any]]]:
+        """Iterate over this group and all units below it, as they are stored on disk.
+
+        This only reads manifest files, see :func:`edlio.iter_units` for details.
+        """
+        return iter_units(self.path, unit_type=unit_type, media_type=media_type)
+
     def save(self) -> None:
+        """Save changes of this group and its children to disk.
+
+        Only units which were modified since they were last loaded or saved are written.
+        """
         if not self.path:
             raise ValueError('No path set for EDL group "{}"'.format(self.name))
-        self.path.mkdir(parents=True, exist_ok=True)
 
         mf = self._make_manifest_dict()
-        self._save_metadata(mf, self.attributes)
+        self._save_metadata(mf)
+        # children that were never loaded are unchanged on disk
         for child in self._children:
             child.save()
 
-    def load(self, path: os.PathLike[str], mf: T.MutableMapping[str, T.Any] | None = None) -> None:
+    def _read_child_metadata(
+        self, unit_path: Path
+    ) -> tuple[dict[str, T.Any], dict[str, T.Any] | None] | None:
+        """Read the manifest of a child, or return None if it is no EDL unit.
+
+        Attributes are only returned if they are known without reading them.
+        """
+        entry = self._index.lookup(unit_path) if self._index else None
+        if entry is not None:
+            return entry['manifest'], entry['attributes'] or {}
+        # just try to open the file, which is cheaper than checking for it first
+        try:
+            mf = load_toml(unit_path / 'manifest.toml')
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return mf, None
+
+    def _load_child(
+        self,
+        unit_path: Path,
+        metadata: tuple[dict[str, T.Any], dict[str, T.Any] | None] | None = None,
+    ) -> EDLUnit | None:
+        if metadata is None:
+            metadata = self._read_child_metadata(unit_path)
+            if metadata is None:
+                return None
+        mf, attrs = metadata
+
+        unit_type = mf.get('type')
+        unit: EDLGroup | EDLDataset
+        if unit_type == 'group':
+            unit = EDLGroup()
+            unit.load(
+                unit_path, mf, lazy=self._lazy, attrs=attrs, index=self._index, jobs=self._jobs
+            )
+        elif unit_type == 'dataset':
+            unit = EDLDataset()
+            unit.load(unit_path, mf, attrs=attrs)
+        else:
+            raise EDLError(
+                'EDL unit type "{}" is unknown, data can not be loaded.'.format(unit_type)
+            )
+        self._attach_loaded_child(unit)
+        return unit
+
+    def _load_pending_children(self) -> None:
+        if not self._children_pending:
+            return
+        # unset this first, so adding children does not recurse into loading them again
+        self._children_pending = False
+        entry = self._index.lookup(self.path) if self._index else None
+        if entry is not None:
+            # the index knows our children, as long as our directory did not change
+            names = entry['children']
+        else:
+            with os.scandir(self.path) as it:
+                names = sorted(e.name for e in it if e.is_dir())
+        unit_paths = [self.path / name for name in names if name not in self._children_by_name]
+
+        if self._jobs > 1 and len(unit_paths) > 1:
+            # reading the files of many units one by one is slow on network filesystems,
+            # so read them in parallel, and assemble the units in order afterwards
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self._jobs, len(unit_paths))
+            ) as executor:
+                metadata = list(executor.map(self._read_child_metadata, unit_paths))
+            for unit_path, md in zip(unit_paths, metadata):
+                if md is not None:
+                    self._load_child(unit_path, md)
+
+        else:
+            for unit_path in unit_paths:
+                self._load_child(unit_path)
+
+        # children loaded by name were appended in the order they were accessed,
+        # but should be in the same order as if all were loaded at once
+        on_disk = [self._children_by_name[name] for name in names if name in self._children_by_name]
+        on_disk_ids = {id(c) for c in on_disk}
+        self._children = on_disk + [c for c in self._children if id(c) not in on_disk_ids]
+
+    def load(
+        self,
+        path: os.PathLike[str],
+        mf: T.MutableMapping[str, T.Any] | None = None,
+        *,
+        lazy: bool = False,
+        attrs: dict[str, T.Any] | None = None,
+        index: MetadataIndex | None = None,
+        jobs: int | None = None,
+    ) -> None:
+        """
+        Load an EDL group from a path.
+
+        Parameters
+        ----------
+        path
+            Filesystem path of this group.
+        mf
+            Manifest file data as dictionary, if data from :path should not be used.
+        lazy
+            Only load child units once they are accessed, instead of loading the
+            whole tree right away.
+        attrs
+            Attribute data as dictionary, if data from :path should not be used.
+        index
+            Metadata index to take data of child units from, where it is up to date.
+        jobs
+            Number of threads to read the metadata of child units with.
+            By default, metadata is read in the calling thread.
+        """
         if not mf:
             mf = {}
-        EDLUnit.load(self, path, mf)
+        EDLUnit.load(self, path, mf, attrs=attrs)
 
-        for unit_path in self.path.iterdir():
-            if not unit_path.is_dir():
-                continue
-            mf_path = unit_path / 'manifest.toml'
-            if not mf_path.is_file():
-                continue
+        self._children = []
+        self._children_by_name = {}
+        self._lazy = lazy
+        self._index = index
+        self._jobs = jobs or 1
+        self._children_pending = True
+        if not lazy:
+            self._load_pending_children()
 
-            with open(mf_path, 'r', encoding='utf-8') as f:
-                mf = toml.load(f)
-
-            unit_type = mf.get('type')
-            unit: EDLGroup | EDLDataset
-            if unit_type == 'group':
-                unit = EDLGroup()
-            elif unit_type == 'dataset':
-                unit = EDLDataset()
-            else:
-                raise EDLError(
-                    'EDL unit type "{}" is unknown, data can not be loaded.'.format(unit_type)
-                )
-            unit.load(unit_path, mf)
-            self.add_child(unit)
+    async def aload(
+        self,
+        path: os.PathLike[str],
+        mf: T.MutableMapping[str, T.Any] | None = None,
+        *,
+        lazy: bool = False,
+        jobs: int | None = None,
+        executor: concurrent.futures.Executor | None = None,
+    ) -> None:
+        """
+        Load an EDL group from a path asynchronously.
+
+        This is the asynchronous variant of :meth:`load`, which reads all files in
+        :executor (or the default executor of the event loop).
+        Children of a group loaded with :lazy are still read synchronously on access.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            executor, functools.partial(self.load, path, mf, lazy=lazy, jobs=jobs)
+        )
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Matthias Klumpp <matthias@tenstral.net>
+#
+# Licensed under the GNU Lesser General Public License Version 3
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the license, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this software.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Metadata index of a whole collection, to open it without reading every unit's files.
+
+The index stores manifest, attributes and child units of every unit in the
+collection, together with the modification time of the unit's directory and
+the modification time and size of its metadata files. Entries are only used
+while these are unchanged, i.e. as long as no file in the directory was added,
+removed or replaced, and the metadata files were not edited in place.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import typing as T
+import logging as log
+from pathlib import Path
+from datetime import date, time, datetime
+
+from .utils import load_toml
+
+# File name of the index, stored in the directory of a collection
+INDEX_FNAME = '.edlio-index.json'
+
+# version of the index file format
+_INDEX_VERSION = 2
+
+# Metadata files of a unit, which may be edited in place without changing the directory
+_UNIT_FILES = ('manifest.toml', 'attributes.toml')
+
+
+def _json_default(v: T.Any) -> T.Any:
+    # TOML has date and time types which JSON lacks, so we tag them
+    if isinstance(v, datetime):
+        return {'$datetime': v.isoformat()}
+    if isinstance(v, date):
+        return {'$date': v.isoformat()}
+    if isinstance(v, time):
+        return {'$time': v.isoformat()}
+    raise TypeError('Value of type {} can not be stored in the index.'.format(type(v).__name__))
+
+
+def _json_object_hook(d: dict[str, T.Any]) -> T.Any:
+    if len(d) == 1:
+        if '$datetime' in d:
+            return datetime.fromisoformat(d['$datetime'])
+        if '$date' in d:
+            return date.fromisoformat(d['$date'])
+        if '$time' in d:
+            return time.fromisoformat(d['$time'])
+    return d
+
+
+def _file_stamps(path: os.PathLike[str] | str) -> dict[str, list[int] | None]:
+    """Get modification time and size of the metadata files of the unit at :path."""
+    stamps: dict[str, list[int] | None] = {}
+    for fname in _UNIT_FILES:
+        try:
+            st = os.stat(os.path.join(path, fname))
+        except OSError:
+            stamps[fname] = None
+        else:
+            stamps[fname] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+class MetadataIndex:
+    """The metadata index of a collection, as read from disk."""
+
+    def __init__(self, root: Path, units: dict[str, dict[str, T.Any]]):
+        self._root = root
+        self._units = units
+        self._checked: dict[str, dict[str, T.Any] | None] = {}
+
+    @classmethod
+    def read(cls, root: os.PathLike[str] | str) -> MetadataIndex | None:
+        """Read the index of the collection at :root, or return None if it has none."""
+        # unit paths are resolved when loading, so we need to compare against a resolved path
+        root = Path(root).resolve()
+        try:
+            with open(root / INDEX_FNAME, 'r', encoding='utf-8') as f:
+                data = json.load(f, object_hook=_json_object_hook)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.debug('Ignoring unreadable metadata index in {}: {}'.format(root, e))
+            return None
+        if not isinstance(data, dict) or data.get('version') != _INDEX_VERSION:
+            return None
+        return cls(root, data.get('units', {}))
+
+    def lookup(self, path: os.PathLike[str] | str) -> dict[str, T.Any] | None:
+        """Get the index entry of the unit at :path, or None if it is missing or stale.
+
+        Entries have the keys ``manifest``, ``attributes`` (None if the unit has
+        no attributes file) and ``children`` (names of the child units).
+        """
+        try:
+            key = Path(path).relative_to(self._root).as_posix()
+        except ValueError:
+            return None
+        if key in self._checked:
+            return self._checked[key]
+
+        entry = self._units.get(key)
+        if entry is not None:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns != entry.get('mtime_ns') or _file_stamps(path) != entry.get('files'):
+                entry = None
+        self._checked[key] = entry
+        return entry
+
+
+def _scan_unit(
+    path: Path, key: str, units: dict[str, dict[str, T.Any]], previous: MetadataIndex | None
+) -> None:
+    # entries of the previous index are still valid for units that did not change
+    prev_entry = previous.lookup(path) if previous else None
+    if prev_entry is not None:
+        units[key] = prev_entry
+        for name in prev_entry['children']:
+            child_key = name if key == '.' else '{}/{}'.format(key, name)
+            _scan_unit(path / name, child_key, units, previous)
+        return
+
+    # take the time before reading, so changes made while we read invalidate the entry
+    mtime_ns = os.stat(path).st_mtime_ns
+    files = _file_stamps(path)
+    mf = load_toml(path / 'manifest.toml')
+    attrs = None
+    if files['attributes.toml'] is not None:
+        attrs = load_toml(path / 'attributes.toml')
+
+    children = []
+    if mf.get('type') in ('collection', 'group'):
+        for entry in sorted(os.scandir(path), key=lambda e: e.name):
+            if entry.is_dir() and os.path.isfile(os.path.join(entry.path, 'manifest.toml')):
+                children.append(entry.name)
+                child_key = entry.name if key == '.' else '{}/{}'.format(key, entry.name)
+                _scan_unit(Path(entry.path), child_key, units, previous)
+
+    units[key] = {
+        'mtime_ns': mtime_ns,
+        'files': files,
+        'manifest': mf,
+        'attributes': attrs,
+        'children': children,
+    }
+
+
+def write_index(path: os.PathLike[str] | str) -> None:
+    """Create or update the metadata index of the collection at :path.
+
+    All units are read from disk, so the index reflects the state of the files,
+    not of any units in memory that were not saved yet. Units which did not change
+    since an existing index was written are taken from it, instead of being read again.
+    """
+    path = Path(path)
+    index_fname = path / INDEX_FNAME
+    previous = MetadataIndex.read(path)
+
+    # creating the index file changes the modification time of the collection
+    # directory, so we need to create it before recording that time
+    index_fname.touch()
+    units: dict[str, dict[str, T.Any]] = {}
+    _scan_unit(path.resolve(), '.', units, previous)
+    data = json.dumps(
+        {'version': _INDEX_VERSION, 'units': units}, default=_json_default, ensure_ascii=False
+    )
+
+    # overwrite in place, as replacing the file would change the directory time again
+    with open(index_fname, 'w', encoding='utf-8') as f:
+        f.write(data)
@@ -20,14 +20,13 @@
 from __future__ import annotations
 
 import os
+import copy
 import uuid
 import typing as T
 from pathlib import Path
 from datetime import datetime
 
-import tomlkit as toml
-
-from .utils import listify, sanitize_name
+from .utils import listify, load_toml, save_toml, sanitize_name
 
 # version of the EDL specification
 EDL_FORMAT_VERSION: str = '1'
@@ -64,12 +63,18 @@ class EDLUnit:
         self._collection_id = make_collection_uuid()
         self._root_path: Path | None = None
         self._authors: list[T.Any] = []
-        self._attrs: dict[str, T.Any] = {}
+        # None if the attributes were not read from disk yet
+        self._attrs: dict[str, T.Any] | None = {}
         self._format_version = EDL_FORMAT_VERSION
         self._generator_id: str | None = None
         self._unit_type = self._type_as_unittype()
         self._time_created = datetime.now().replace(microsecond=0)
 
+        # metadata as last read from or written to disk, so unchanged units are not rewritten
+        self._stored_path: Path | None = None
+        self._stored_manifest: T.Mapping[str, T.Any] | None = None
+        self._stored_attrs: dict[str, T.Any] | None = None
+
     @property
     def parent(self) -> EDLUnit | None:
         return self._parent
@@ -118,6 +123,8 @@ class EDLUnit:
 
     @property
     def attributes(self) -> dict:
+        if self._attrs is None:
+            self._attrs = self._load_attributes()
         return self._attrs
 
     @attributes.setter
@@ -125,7 +132,20 @@ class EDLUnit:
         self._attrs = v
 
     def change_name(self, new_name: str) -> None:
+        from .group import EDLGroup
+
         old_name = self.name
+        parent = self._parent if isinstance(self._parent, EDLGroup) else None
+        sanitized_name = sanitize_name(new_name)
+        if (
+            parent is not None
+            and sanitized_name
+            and sanitized_name != old_name
+            and sanitized_name in parent
+        ):
+            raise ValueError(
+                'A unit with name "{}" already exists in "{}".'.format(sanitized_name, parent.name)
+            )
         # An in-memory unit may not have a path yet (no root_path/name set);
         # in that case there is no directory to rename, we just update the name.
         old_dir_path = self.path if (self._root_path and self._name) else None
@@ -141,8 +161,27 @@ class EDLUnit:
             except Exception as e:
                 self._name = old_name
                 raise ValueError('Unable to set new unit name: {}'.format(str(e))) from e
-
-    def load(self, path: os.PathLike[str], mf: T.MutableMapping[str, T.Any] | None = None) -> None:
+            self._moved_on_disk(old_dir_path, self.path)
+        if parent is not None:
+            parent._rename_child(self, old_name)
+
+    def _moved_on_disk(self, old_dir: Path, new_dir: Path) -> None:
+        """Update where our stored data is, after directory :old_dir was moved to :new_dir."""
+        if self._stored_path is None:
+            return
+        try:
+            rel_path = self._stored_path.relative_to(old_dir)
+        except ValueError:
+            return
+        self._stored_path = new_dir / rel_path
+
+    def load(
+        self,
+        path: os.PathLike[str],
+        mf: T.MutableMapping[str, T.Any] | None = None,
+        *,
+        attrs: dict[str, T.Any] | None = None,
+    ) -> None:
         """
         Load an EDL unit from a path or path/data combination.
 
@@ -152,6 +191,8 @@ class EDLUnit:
             Filesystem path of this dataset.
         mf
             Manifest file data as dictionary, if data from :path should not be used.
+        attrs
+            Attribute data as dictionary, if data from :path should not be used.
         """
         path = Path(path)
         if not path.is_dir():
@@ -167,9 +208,9 @@ class EDLUnit:
         self._root_path = path.resolve().parent
 
         self._attrs = {}
+        self._stored_attrs = None
         if not mf:
-            with open(self.path / 'manifest.toml', 'r', encoding='utf-8') as f:
-                mf = toml.load(f)
+            mf = load_toml(self.path / 'manifest.toml')
 
         self._format_version = str(mf.get('format_version', 'unknown'))
         if self._format_version != EDL_FORMAT_VERSION:
@@ -191,9 +232,10 @@ class EDLUnit:
             )
             raise EDLError(msg)
 
-        if (self.path / 'attributes.toml').is_file():
-            with open(self.path / 'attributes.toml', 'r', encoding='utf-8') as f:
-                self._attrs = toml.load(f)
+        # attributes are read once they are used, as many tools never look at them
+        self._attrs = attrs
+        if attrs is not None:
+            self._stored_attrs = copy.deepcopy(attrs)
 
         raw_time_created = mf['time_created']
         if raw_time_created:
@@ -205,6 +247,9 @@ class EDLUnit:
         if 'authors' in mf:
             self._authors = listify(mf['authors'])
 
+        self._stored_path = self.path
+        self._stored_manifest = mf
+
     def _type_as_unittype(self) -> str:
         from .group import EDLGroup
         from .dataset import EDLDataset
@@ -236,21 +281,51 @@ class EDLUnit:
             doc['generator'] = self._generator_id
 
         if self._authors:
-            doc['authors'] = self._authors
+            # the manifest is kept to detect changes, so it must not share mutable data
+            doc['authors'] = copy.deepcopy(self._authors)
 
         return doc
 
-    def _save_metadata(self, manifest: dict[str, T.Any], attributes: dict[str, T.Any]) -> None:
+    def _load_attributes(self) -> dict[str, T.Any]:
+        attrs: dict[str, T.Any] = {}
+        if self._stored_path:
+            try:
+                attrs = load_toml(self._stored_path / 'attributes.toml')
+            except FileNotFoundError:
+                pass
+        self._stored_attrs = copy.deepcopy(attrs)
+        return attrs
+
+    def _save_metadata(self, manifest: dict[str, T.Any]) -> None:
+        """Write manifest and attributes of this unit, if they differ from what is on disk."""
         if not self.path:
             raise EDLError('No path is set for this EDL unit')
-        self.path.mkdir(parents=True, exist_ok=True)
-
-        with open(self.path / 'manifest.toml', 'w', encoding='utf-8') as f:
-            toml.dump(manifest, f)
-
-        if attributes:
-            with open(self.path / 'attributes.toml', 'w', encoding='utf-8') as f:
-                toml.dump(attributes, f)
+        path = self.path
+        attributes: dict[str, T.Any] | None
+        if self._stored_path != path:
+            # attributes that were not read yet need to be taken along to the new location
+            attributes = self.attributes
+            # we know nothing about the data at a new location, and do not remove
+            # attributes there just because none could be read from the old one
+            self._stored_manifest = None
+            self._stored_attrs = {}
+        else:
+            # attributes that were never read are unchanged
+            attributes = self._attrs
+
+        if manifest != self._stored_manifest:
+            path.mkdir(parents=True, exist_ok=True)
+            # manifests are machine-written and may list very many data parts, so we
+            # do not need to keep their formatting, but do need to write them fast
+            save_toml(path / 'manifest.toml', manifest, keep_format=False)
+            self._stored_manifest = manifest
+        if attributes is not None and attributes != self._stored_attrs:
+            if attributes:
+                save_toml(path / 'attributes.toml', attributes)
+            else:
+                (path / 'attributes.toml').unlink(missing_ok=True)
+            self._stored_attrs = copy.deepcopy(attributes)
+        self._stored_path = path
 
     def save(self) -> None:
         raise NotImplementedError('Subclasses need to implement save().')
@@ -17,11 +17,19 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this software.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import re
+import json
+import math
 import random
 import string
 import typing as T
+import tomllib
+import datetime
 import collections
 
+import tomlkit
+
 _T = T.TypeVar('_T')
 
 
@@ -72,3 +80,153 @@ def listify(item: T.Any) -> list[T.Any]:
     if isinstance(item, collections.abc.Sequence):
         return list(item)
     return [item]
+
+
+def load_toml(fname: os.PathLike[str] | str) -> dict[str, T.Any]:
+    """
+    Read a TOML file into plain Python containers.
+
+    This uses the fast, read-only TOML parser of the standard library.
+    """
+    with open(fname, 'rb') as f:
+        return tomllib.load(f)
+
+
+def _update_toml_container(container: T.Any, data: T.Mapping[str, T.Any]) -> None:
+    for key in [k for k in container if k not in data]:
+        del container[key]
+    for key, value in data.items():
+        if key in container:
+            current = container[key]
+            if isinstance(value, collections.abc.Mapping) and isinstance(
+                current, collections.abc.MutableMapping
+            ):
+                _update_toml_container(current, value)
+                continue
+            if current == value:
+                # keep the existing formatting of unchanged values
+                continue
+        container[key] = value
+
+
+_TOML_BARE_KEY_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def _toml_key(key: str) -> str:
+    if _TOML_BARE_KEY_RE.match(key):
+        return key
+    return _toml_string(key)
+
+
+def _toml_string(s: str) -> str:
+    # JSON escapes all characters TOML needs escaped, except for DEL
+    return json.dumps(s, ensure_ascii=False).replace('\x7f', '\\u007f')
+
+
+def _toml_value(v: T.Any) -> str:
+    if isinstance(v, str):
+        return _toml_string(v)
+    if isinstance(v, bool):
+        return 'true' if v else 'false'
+    if isinstance(v, int):
+        return str(v)
+    if isinstance(v, float):
+        if math.isnan(v):
+            return 'nan'
+        if math.isinf(v):
+            return 'inf' if v > 0 else '-inf'
+        return repr(v)
+    if isinstance(v, (datetime.datetime, datetime.date, datetime.time)):
+        return v.isoformat()
+    if isinstance(v, collections.abc.Mapping):
+        if not v:
+            return '{}'
+        return '{ ' + ', '.join(_toml_key(k) + ' = ' + _toml_value(x) for k, x in v.items()) + ' }'
+    if isinstance(v, (list, tuple)):
+        return '[' + ', '.join(_toml_value(x) for x in v) + ']'
+    raise TypeError('Value of type {} can not be written as TOML.'.format(type(v).__name__))
+
+
+def _is_toml_table_array(v: T.Any) -> bool:
+    return (
+        isinstance(v, (list, tuple))
+        and len(v) > 0
+        and all(isinstance(x, collections.abc.Mapping) for x in v)
+    )
+
+
+def _format_toml_table(lines: list[str], prefix: str, data: T.Mapping[str, T.Any]) -> None:
+    tables = []
+    table_arrays = []
+    for key, value in data.items():
+        if isinstance(value, collections.abc.Mapping):
+            tables.append((key, value))
+        elif _is_toml_table_array(value):
+            table_arrays.append((key, value))
+        else:
+            lines.append(_toml_key(key) + ' = ' + _toml_value(value))
+    for key, value in tables:
+        name = prefix + _toml_key(key)
+        lines.append('')
+        lines.append('[' + name + ']')
+        _format_toml_table(lines, name + '.', value)
+    for key, value in table_arrays:
+        name = prefix + _toml_key(key)
+        header = '[[' + name + ']]'
+        for item in value:
+            lines.append('')
+            lines.append(header)
+            _format_toml_table(lines, name + '.', item)
+
+
+def format_toml(data: T.Mapping[str, T.Any]) -> str:
+    """
+    Format plain Python data as TOML document.
+
+    This is much faster than creating a document with tomlkit, and is used
+    for large, machine-written files whose formatting does not need to be kept.
+    """
+    lines: list[str] = []
+    _format_toml_table(lines, '', data)
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def save_toml(
+    fname: os.PathLike[str] | str, data: T.Mapping[str, T.Any], *, keep_format: bool = True
+) -> None:
+    """
+    Write :data to a TOML file.
+
+    If the file already exists, only values that have changed are replaced,
+    so comments and formatting of the existing file are preserved, unless
+    :keep_format is False.
+    The file is replaced atomically.
+    """
+    text: str
+    if not keep_format:
+        text = format_toml(data)
+    else:
+        doc: T.Any = None
+        try:
+            with open(fname, 'r', encoding='utf-8') as f:
+                doc = tomlkit.load(f)
+        except (FileNotFoundError, tomlkit.exceptions.ParseError):
+            doc = None
+        if doc is None:
+            doc = data
+        else:
+            _update_toml_container(doc, data)
+        text = tomlkit.dumps(doc)
+
+    # replace the file atomically, so readers never see a partially written file,
+    # and the modification time of the directory tells that its contents changed
+    tmp_fname = '{}.tmp-{}'.format(os.fspath(fname), os.getpid())
+    try:
+        with open(tmp_fname, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_fname, fname)
+    except BaseException:
+        if os.path.exists(tmp_fname):
+            os.unlink(tmp_fname)
+        raise
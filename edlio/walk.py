@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Matthias Klumpp <matthias@tenstral.net>
+#
+# Licensed under the GNU Lesser General Public License Version 3
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the license, or
+# (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this software.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Iterate over the units of an EDL tree on disk, without loading them as objects.
+"""
+
+from __future__ import annotations
+
+import os
+import typing as T
+from pathlib import Path
+
+from .unit import EDLError
+from .utils import listify, load_toml
+
+
+def _read_manifest(path: str) -> dict[str, T.Any] | None:
+    # just try to open the manifest, which is cheaper than checking for it first
+    try:
+        return load_toml(os.path.join(path, 'manifest.toml'))
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        return None
+
+
+def _media_type_of(mf: T.Mapping[str, T.Any]) -> str | None:
+    data = mf.get('data')
+    if isinstance(data, dict):
+        return data.get('media_type')
+    return None
+
+
+def iter_units(
+    path: str | os.PathLike[str],
+    *,
+    unit_type: str | T.Iterable[str] | None = None,
+    media_type: str | T.Iterable[str] | None = None,
+) -> T.Iterator[tuple[Path, str, dict[str, T.Any]]]:
+    """
+    Iterate over an EDL unit and all units below it, depth-first.
+
+    Only the manifest files are read, no unit objects are created, so this is
+    much faster than :func:`edlio.load` for getting an overview of many units.
+    Units are visited in the order of their names, parents before their children.
+
+    Parameters
+    ----------
+    path
+        The filesystem location of the EDL unit to start at.
+    unit_type
+        Only yield units of this type (or types), e.g. ``dataset``.
+        Units of other types are still descended into.
+    media_type
+        Only yield datasets whose main data has this media type (or one of these types).
+
+    Returns
+    -------
+    Iterator of tuples of unit path, unit type and the unit's manifest data.
+    """
+    unit_types = set(listify(unit_type)) if unit_type is not None else None
+    media_types = set(listify(media_type)) if media_type is not None else None
+
+    root = os.fspath(path)
+    mf = _read_manifest(root)
+    if mf is None:
+        raise EDLError('The directory "{}" is no valid EDL unit.'.format(root))
+
+    stack: list[tuple[str, dict[str, T.Any] | None]] = [(root, mf)]
+    while stack:
+        upath, umf = stack.pop()
+        if umf is None:
+            umf = _read_manifest(upath)
+            if umf is None:
+                # not an EDL unit
+                continue
+        utype = umf.get('type')
+        if (unit_types is None or utype in unit_types) and (
+            media_types is None or _media_type_of(umf) in media_types
+        ):
+            yield Path(upath), str(utype), umf
+        if utype not in ('collection', 'group'):
+            continue
+
+        with os.scandir(upath) as it:
+            child_paths = sorted((e.path for e in it if e.is_dir()), reverse=True)
+        stack.extend((child_path, None) for child_path in child_paths)
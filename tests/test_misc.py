@@ -18,6 +18,7 @@
 # along with this software.  If not, see <http://www.gnu.org/licenses/>.
 
 import string
+import tomllib
 from pathlib import Path
 
 import pytest
@@ -32,7 +33,7 @@ from edlio import (
     EDLDataPart,
     EDLCollection,
 )
-from edlio.utils import listify, sanitize_name
+from edlio.utils import listify, load_toml, format_toml, sanitize_name
 
 
 def test_sanitize_name_replaces_path_separators() -> None:
@@ -69,6 +70,54 @@ def test_listify() -> None:
     assert listify([]) == []
 
 
+def test_attributes_load_as_plain_dicts_and_keep_formatting(tmp_path: Path) -> None:
+    coll = EDLCollection('rec')
+    coll.root_path = tmp_path
+    dset = coll.dataset_by_name('dd', create=True)
+    dset.attributes['subject'] = {'id': 'mouse01', 'age_days': 60}
+    dset.attributes['note'] = 'first'
+    dset.save()
+
+    attrs_fname = dset.path / 'attributes.toml'
+    attrs_fname.write_text(
+        '# hand-written comment\n' + attrs_fname.read_text(encoding='utf-8'), encoding='utf-8'
+    )
+
+    reloaded = edlio.load(dset.path)
+    assert type(reloaded.attributes) is dict
+    assert type(reloaded.attributes['subject']) is dict
+    assert reloaded.attributes == dset.attributes
+
+    reloaded.attributes['note'] = 'second'
+    del reloaded.attributes['subject']['age_days']
+    reloaded.save()
+    text = attrs_fname.read_text(encoding='utf-8')
+    assert text.startswith('# hand-written comment\n')
+    assert load_toml(attrs_fname) == {'subject': {'id': 'mouse01'}, 'note': 'second'}
+
+
+def test_format_toml_roundtrips_plain_data() -> None:
+    import datetime
+
+    data = {
+        'text': 'quote " backslash \\ newline \n del \x7f',
+        'number': 12,
+        'ratio': 0.25,
+        'flag': True,
+        'when': datetime.datetime(2026, 1, 2, 3, 4, 5),
+        'odd key': [1, [2, 3], {'inline': 'table'}],
+        'empty': [],
+        'data': {
+            'file_type': 'csv',
+            'parts': [{'fname': 'a.csv', 'index': 0}, {'fname': 'b.csv', 'index': 1}],
+        },
+        'data_aux': [{'parts': [{'fname': 'a.tsync'}]}],
+    }
+    text = format_toml(data)
+    assert '[[data.parts]]' in text
+    assert tomllib.loads(text) == data
+
+
 def test_datapart_ordering_and_equality() -> None:
     parts = [EDLDataPart('c', 2), EDLDataPart('a', 0), EDLDataPart('b', 1)]
     parts.sort()
@@ -95,6 +144,45 @@ def test_add_child_propagates_collection_id_and_path() -> None:
     assert dset.root_path == group.path
 
 
+def test_unit_names_are_unique_and_resolvable() -> None:
+    coll = EDLCollection('rec')
+    coll.root_path = Path('/tmp/does-not-need-to-exist')
+    videos = EDLGroup('videos')
+    coll.add_child(videos)
+    camera = EDLDataset('camera')
+    videos.add_child(camera)
+
+    with pytest.raises(ValueError):
+        videos.add_child(EDLDataset('camera'))
+    with pytest.raises(ValueError):
+        coll.add_child(EDLGroup('videos'))
+
+    assert coll['videos/camera'] is camera
+    assert coll.resolve('/videos//camera/') is camera
+    assert coll.resolve('videos') is videos
+    assert coll.resolve('') is coll
+    assert coll.resolve('videos/missing') is None
+    assert coll.resolve('videos/camera/deeper') is None
+    assert 'videos/camera' in coll
+    with pytest.raises(KeyError):
+        coll['nothing']
+    assert list(coll) == [videos]
+    assert [c.name for c in videos] == ['camera']
+
+    # the name index follows renames
+    other = EDLDataset('other')
+    videos.add_child(other)
+    with pytest.raises(ValueError):
+        other.change_name('camera')
+    assert other.name == 'other'
+    camera.change_name('camera2')
+    assert videos.dataset_by_name('camera') is None
+    assert videos.dataset_by_name('camera2') is camera
+    assert coll['videos/camera2'] is camera
+    other.change_name('camera')
+    assert videos.dataset_by_name('camera') is other
+
+
 def test_change_name_in_memory_unit() -> None:
     # renaming a unit that was never saved must not raise (no path to move)
     dset = EDLDataset('old')
@@ -116,6 +204,273 @@ def test_change_name_on_disk(tmp_path: Path) -> None:
     assert not old_dir.exists()
 
 
+def test_lazy_load_only_loads_accessed_children(tmp_path: Path) -> None:
+    coll = EDLCollection('rec')
+    coll.root_path = tmp_path
+    for gname in ('a', 'b'):
+        group = coll.group_by_name(gname, create=True)
+        group.dataset_by_name('d1', create=True)
+        group.dataset_by_name('d2', create=True)
+    coll.dataset_by_name('top', create=True)
+    coll.save()
+
+    # a broken branch does not matter, as long as it is never accessed
+    (tmp_path / 'rec' / 'b' / 'd2' / 'manifest.toml').write_text('type = ', encoding='utf-8')
+    with pytest.raises(ValueError):
+        edlio.load(tmp_path / 'rec')
+
+    lazy_coll = edlio.load(tmp_path / 'rec', lazy=True)
+    assert isinstance(lazy_coll, EDLCollection)
+    group_a = lazy_coll.group_by_name('a')
+    assert group_a is not None
+    assert group_a.collection_id == coll.collection_id
+    assert sorted(str(d.name) for d in group_a.datasets) == ['d1', 'd2']
+    group_b = lazy_coll.group_by_name('b')
+    assert group_b is not None
+    d1 = group_b.dataset_by_name('d1')
+    assert d1 is not None
+    assert d1.path == tmp_path / 'rec' / 'b' / 'd1'
+    assert lazy_coll.group_by_name('top') is None
+    assert lazy_coll.dataset_by_name('top') is not None
+    assert lazy_coll.dataset_by_name('missing') is None
+
+    # listing all children loads the remaining ones, without duplicating loaded ones,
+    # in the same order as an eager load
+    lazy_coll = edlio.load(tmp_path / 'rec', lazy=True)
+    assert lazy_coll.dataset_by_name('top') is not None
+    group_b = lazy_coll.group_by_name('b')
+    assert group_b is not None
+    assert [str(c.name) for c in lazy_coll.children] == ['a', 'b', 'top']
+    with pytest.raises(ValueError):
+        list(group_b.datasets)
+
+    # moving a group to a new location takes children along that were not loaded yet
+    (tmp_path / 'rec' / 'b' / 'd2' / 'manifest.toml').unlink()
+    lazy_coll = edlio.load(tmp_path / 'rec', lazy=True)
+    lazy_coll.root_path = tmp_path / 'copy'
+    lazy_coll.save()
+    copied = edlio.load(tmp_path / 'copy' / 'rec')
+    assert [str(c.name) for c in copied.children] == ['a', 'b', 'top']
+    assert [str(d.name) for d in copied['a'].children] == ['d1', 'd2']
+
+
+def test_attributes_are_read_on_first_access(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import edlio.unit
+
+    coll = EDLCollection('rec')
+    coll.root_path = tmp_path / 'a'
+    coll.attributes = {'subject_id': 'm1'}
+    group = coll.group_by_name('g', create=True)
+    group.attributes = {'kind': 'video'}
+    ds = group.dataset_by_name('d', create=True)
+    ds.attributes = {'csv_dtypes': {'x': 'int32'}}
+    coll.save()
+
+    reads: list[Path] = []
+
+    def counting_load_toml(fname: Path) -> dict:
+        reads.append(Path(fname))
+        return load_toml(fname)
+
+    monkeypatch.setattr(edlio.unit, 'load_toml', counting_load_toml)
+    loaded = edlio.load(tmp_path / 'a' / 'rec', use_index=False)
+    assert [str(c.name) for c in loaded.children] == ['g']
+    loaded.save()
+    assert reads == []
+
+    lds = loaded.resolve('g/d')
+    assert lds.data._unit_attributes() == {'csv_dtypes': {'x': 'int32'}}
+    assert reads == [lds.path / 'attributes.toml']
+    lds.attributes = {'csv_dtypes': {'x': 'int64'}}
+    assert lds.data._unit_attributes() == {'csv_dtypes': {'x': 'int64'}}
+
+    # attributes which were not read yet are taken along when saving to a new location
+    loaded.root_path = tmp_path / 'b'
+    loaded.save()
+    moved = edlio.load(tmp_path / 'b' / 'rec')
+    assert moved.attributes == {'subject_id': 'm1'}
+    assert moved.resolve('g').attributes == {'kind': 'video'}
+    assert moved.resolve('g/d').attributes == {'csv_dtypes': {'x': 'int64'}}
+
+
+def test_unread_attributes_survive_moving_parents(tmp_path: Path) -> None:
+    coll = EDLCollection('rec')
+    coll.root_path = tmp_path / 'a'
+    coll.group_by_name('g', create=True).dataset_by_name('d', create=True).attributes = {
+        'subject': 'mouse1'
+    }
+    coll.save()
+
+    # renaming a group moves the files of its children, whose attributes were never read
+    loaded = edlio.load(tmp_path / 'a' / 'rec')
+    loaded.resolve('g').change_name('h')
+    loaded.save()
+    assert edlio.load(tmp_path / 'a' / 'rec').resolve('h/d').attributes == {'subject': 'mouse1'}
+    assert loaded.resolve('h/d').attributes == {'subject': 'mouse1'}
+
+    # moving a group to a new location takes the unread attributes of its children along
+    loaded = edlio.load(tmp_path / 'a' / 'rec')
+    group = loaded.resolve('h')
+    group.root_path = tmp_path / 'b'
+    group.save()
+    assert edlio.load(tmp_path / 'b' / 'h').resolve('d').attributes == {'subject': 'mouse1'}
+    assert edlio.load(tmp_path / 'a' / 'rec').resolve('h/d').attributes == {'subject': 'mouse1'}
+
+    # moving a unit into another group takes its unread attributes along
+    loaded = edlio.load(tmp_path / 'a' / 'rec')
+    loaded.group_by_name('g2', create=True).add_child(loaded['h/d'])
+    loaded.save()
+    assert not (tmp_path / 'a' / 'rec' / 'h' / 'd').exists()
+    assert loaded['g2/d'].attributes == {'subject': 'mouse1'}
+    assert edlio.load(tmp_path / 'a' / 'rec')['g2/d'].attributes == {'subject': 'mouse1'}
+
+
+def test_parallel_load_gives_same_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    coll = EDLCollection('rec')
+    coll.root_path = tmp_path
+    for gname in ('g3', 'g1', 'g2'):
+        group = coll.group_by_name(gname, create=True)
+        for i in range(5):
+            ds = group.dataset_by_name('d{}'.format(i), create=True)
+            ds.attributes = {'n': i}
+    coll.save()
+    (tmp_path / 'rec' / 'nounit').mkdir()
+
+    def tree(unit: EDLGroup) -> list:
+        return [
+            (str(c.name), c.attributes, tree(c) if isinstance(c, EDLGroup) else None)
+            for c in unit.children
+        ]
+
+    expected = tree(edlio.load(tmp_path / 'rec'))
+    assert [name for name, _, _ in expected] == ['g1', 'g2', 'g3']
+
+    # loaded units are already in place, so nothing is renamed
+    with monkeypatch.context() as m:
+        m.setattr(Path, 'rename', lambda *args: pytest.fail('Unit was renamed while loading.'))
+        assert tree(edlio.load(tmp_path / 'rec', jobs=4)) == expected
+        assert tree(edlio.load(tmp_path / 'rec', jobs=4, lazy=True)) == expected
+
+    # errors of units read in worker threads are raised to the caller
+    (tmp_path / 'rec' / 'g2' / 'd3' / 'manifest.toml').write_text('type = ', encoding='utf-8')
+    with pytest.raises(ValueError):
+        edlio.load(tmp_path / 'rec', jobs=4)
+
+
+def test_metadata_index_is_used_while_up_to_date(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import datetime
+
+    import edlio.unit
+    import edlio.group
+    from edlio.index import INDEX_FNAME
+
+    coll = EDLCollection('rec')
+    coll.root_path = tmp_path
+    coll.attributes = {'when': datetime.datetime(2026, 1, 2, 3, 4, 5), 'subject': 'm1'}
+    for gname in ('a', 'b'):
+        group = coll.group_by_name(gname, create=True)
+        ds = group.dataset_by_name('d1', create=True)
+        ds.attributes = {'gain': 2.5}
+    coll.save()
+    coll.write_index()
+    assert (tmp_path / 'rec' / INDEX_FNAME).is_file()
+
+    reads: list[Path] = []
+    orig_load_toml = load_toml
+
+    def counting_load_toml(fname: Path) -> dict:
+        reads.append(Path(fname))
+        return orig_load_toml(fname)
+
+    for mod in (edlio, edlio.unit, edlio.group):
+        monkeypatch.setattr(mod, 'load_toml', counting_load_toml)
+
+    indexed = edlio.load(tmp_path / 'rec')
+    assert reads == []
+    assert isinstance(indexed, EDLCollection)
+    assert indexed.collection_id == coll.collection_id
+    assert indexed.attributes == coll.attributes
+    assert sorted(str(c.name) for c in indexed.children) == ['a', 'b']
+    ds_a = indexed.resolve('a/d1')
+    assert isinstance(ds_a, EDLDataset)
+    assert ds_a.attributes == {'gain': 2.5}
+    assert ds_a.path == tmp_path / 'rec' / 'a' / 'd1'
+
+    # a unit changed after the index was written is read from disk again
+    ds_b = coll.resolve('b/d1')
+    ds_b.attributes = {'gain': 4.0}
+    ds_b.save()
+    reads.clear()
+    indexed = edlio.load(tmp_path / 'rec')
+    assert indexed.resolve('b/d1').attributes == {'gain': 4.0}
+    assert indexed.resolve('a/d1').attributes == {'gain': 2.5}
+    assert {p.parent.name for p in reads} == {'d1'}
+    assert all(p.parent.parent.name == 'b' for p in reads)
+
+    # saving the whole collection refreshes the index
+    coll.save()
+    reads.clear()
+    assert edlio.load(tmp_path / 'rec').resolve('b/d1').attributes == {'gain': 4.0}
+    assert reads == []
+
+    reads.clear()
+    edlio.load(tmp_path / 'rec', use_index=False)
+    assert len(reads) > 0
+
+    # metadata files edited in place, which keeps the directory time, are read again
+    attrs_fname = tmp_path / 'rec' / 'a' / 'd1' / 'attributes.toml'
+    st = (tmp_path / 'rec' / 'a' / 'd1').stat()
+    with open(attrs_fname, 'w', encoding='utf-8') as f:
+        f.write('gain = 2.5\nfoo = 1\n')
+    assert (tmp_path / 'rec' / 'a' / 'd1').stat().st_mtime_ns == st.st_mtime_ns
+    indexed = edlio.load(tmp_path / 'rec')
+    ds_a = indexed.resolve('a/d1')
+    assert ds_a.attributes == {'gain': 2.5, 'foo': 1}
+    ds_a.attributes['gain'] = 3.0
+    indexed.save()
+    assert edlio.load(tmp_path / 'rec', use_index=False).resolve('a/d1').attributes == {
+        'gain': 3.0,
+        'foo': 1,
+    }
+
+
+def test_iter_units_walks_tree_on_disk(tmp_path: Path) -> None:
+    coll = EDLCollection('rec')
+    coll.root_path = tmp_path
+    videos = coll.group_by_name('videos', create=True)
+    cam = videos.dataset_by_name('cam', create=True)
+    cam.data.media_type = 'video/x-matroska'
+    cam.data.new_part('cam.mkv')
+    coll.dataset_by_name('events', create=True)
+    coll.save()
+    # directories which are no units are skipped
+    (tmp_path / 'rec' / 'videos' / 'junk').mkdir()
+
+    rec = tmp_path / 'rec'
+    units = [(p.relative_to(tmp_path).as_posix(), t) for p, t, _ in edlio.iter_units(rec)]
+    assert units == [
+        ('rec', 'collection'),
+        ('rec/events', 'dataset'),
+        ('rec/videos', 'group'),
+        ('rec/videos/cam', 'dataset'),
+    ]
+    assert [p for p, _, _ in edlio.iter_units(rec, unit_type=['group', 'collection'])] == [
+        rec,
+        rec / 'videos',
+    ]
+    found = list(edlio.iter_units(rec, media_type='video/x-matroska'))
+    assert [p for p, _, _ in found] == [rec / 'videos' / 'cam']
+    assert found[0][2]['data']['parts'] == [{'fname': 'cam.mkv'}]
+    assert [p for p, _, _ in videos.walk(unit_type='dataset')] == [rec / 'videos' / 'cam']
+
+    with pytest.raises(EDLError):
+        list(edlio.iter_units(tmp_path))
+
+
 def test_load_non_edl_directory_raises(tmp_path: Path) -> None:
     with pytest.raises(EDLError):
         edlio.load(tmp_path)
@@ -17,6 +17,8 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this software.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
+import json
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -189,6 +191,181 @@ def test_load_video_tsync_keeps_frame_index_unitless() -> None:
     assert not hasattr(frame.index, 'units')
 
 
+def test_load_video_tsync_syncpoints(samples_dir: Path) -> None:
+    from edlio.dataio.tsyncfile import TSyncFileMode
+
+    dataset_path = samples_dir / 'blink1' / 'videos' / 'generic-camera'
+    aux_data = EDLDataFile(dataset_path, file_type='tsync')
+    aux_data.parts.append(EDLDataPart('video_timestamps.tsync', 0))
+    tsync = next(aux_data.read())
+    expected = list(load_video_data([], [aux_data], timestamps_only=True))
+
+    # reduce the continuous mapping to a few sync points, like a writer in
+    # sync-point mode would have stored it
+    tsync.sync_mode = TSyncFileMode.SYNCPOINTS
+    full_times = tsync.times
+    tsync.times = full_times[list(range(0, 900, 100)) + [900]]
+
+    class SyncPointsDataFile(EDLDataFile):
+        def read(self, *args: object, **kwargs: object) -> object:
+            return iter([tsync])
+
+    sp_aux = SyncPointsDataFile(dataset_path, file_type='tsync')
+    times = list(load_video_data([], [sp_aux], timestamps_only=True))
+    assert len(times) == 901
+    for (index, time), (exp_index, exp_time) in zip(times, expected):
+        assert index == exp_index
+        # interpolated times are close to the real ones, and exact at each sync point
+        assert abs(time - exp_time) < 20 * ureg.msec
+        # (frame numbers of this legacy file start at 1)
+        if index % 100 == 1:
+            assert time == exp_time
+
+    # frames past the last sync point get extrapolated times
+    frames = list(
+        load_video_data(
+            [dataset_path / 'video.mkv'], [sp_aux], timestamps_only=True, check_frames=True
+        )
+    )
+    assert len(frames) == 971
+    assert frames[:901] == times
+    assert abs(frames[-1][1] - expected[-1][1]) < 100 * ureg.msec
+
+
+def test_load_video_timestamps_only(samples_dir: Path) -> None:
+    test_coll = edlio.load(samples_dir / 'blink1')
+    dset = test_coll.group_by_name('videos').dataset_by_name('generic-camera')
+    tsync = next(dset.read_aux_data('tsync'))
+
+    times = list(dset.read_data(timestamps_only=True))
+    assert len(times) == tsync.times.shape[0]
+    assert times[0] == (tsync.times[0, 0], tsync.times[0, 1] * ureg.msec)
+
+    checked = list(dset.read_data(timestamps_only=True, check_frames=True))
+    assert checked == times
+
+    # without timestamp data, the frames are counted
+    untimed = list(load_video_data([dset.path / 'video.mkv'], [], timestamps_only=True))
+    assert untimed == [(i, -1) for i in range(971)]
+
+
+def test_convert_video_to_zarr(tmp_path: Path, samples_dir: Path) -> None:
+    import shutil
+
+    from edlio.dataio.video import convert_to_zarr
+
+    shutil.copytree(samples_dir / 'blink1' / 'videos', tmp_path / 'videos')
+    videos = edlio.load(tmp_path / 'videos')
+    dset = videos.dataset_by_name('generic-camera')
+    frames = list(dset.read_data())
+
+    zdset = convert_to_zarr(dset, transform=lambda mat: mat[:, :, 0], chunk_frames=100)
+    assert zdset.name == 'generic-camera-zarr'
+
+    reloaded = edlio.load(tmp_path / 'videos').dataset_by_name('generic-camera-zarr')
+    root = next(reloaded.read_data())
+    data = root['data']
+    assert data.shape == (971, 160, 160)
+    assert data.chunks == (100, 160, 160)
+    assert (data[5] == frames[5].mat[:, :, 0]).all()
+    timestamps = root['timestamps']
+    assert timestamps.attrs['time_unit'] == 'microseconds'
+    assert timestamps[-1] * ureg.usec == frames[-1].time
+
+    with pytest.raises(ValueError):
+        convert_to_zarr(dset)
+
+    # an existing store is not overwritten, and not registered as a part
+    (tmp_path / 'videos' / 'stale' / 'stale.zarr').mkdir(parents=True)
+    with pytest.raises(ValueError):
+        convert_to_zarr(dset, name='stale')
+    assert videos.dataset_by_name('stale').data.parts == []
+
+    # the store may also be attached to the video dataset itself
+    convert_to_zarr(dset, as_aux=True)
+    reloaded = edlio.load(tmp_path / 'videos').dataset_by_name('generic-camera')
+    root = next(reloaded.read_aux_data('zarr'))
+    assert root['data'].shape == (971, 160, 160, 3)
+    assert len(list(reloaded.read_data(timestamps_only=True))) == 971
+
+
+def _frame_mean(mat: np.ndarray) -> float:
+    return float(mat.mean())
+
+
+def test_load_video_parallel_frame_func(samples_dir: Path) -> None:
+    test_coll = edlio.load(samples_dir / 'blink1')
+    dset = test_coll.group_by_name('videos').dataset_by_name('generic-camera')
+
+    expected = [(f.index, f.time, _frame_mean(f.mat)) for f in dset.read_data()]
+    results = list(dset.read_data(frame_func=_frame_mean, workers=2))
+    assert [(r.index, r.time, r.value) for r in results] == expected
+
+    # parts decoded by different workers are reassembled in their global order
+    video_fname = dset.path / 'video.mkv'
+    results = list(
+        load_video_data([video_fname, video_fname], [], frame_func=_frame_mean, workers=2)
+    )
+    assert len(results) == 2 * len(expected)
+    assert [r.index for r in results] == list(range(len(results)))
+    assert [r.value for r in results] == [e[2] for e in expected] * 2
+
+
+def test_probe_video_dataset(
+    tmp_path: Path, samples_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import shutil
+
+    from edlio.dataio import video
+
+    shutil.copytree(samples_dir / 'blink1' / 'videos' / 'generic-camera', tmp_path / 'camera')
+    dset = edlio.load(tmp_path / 'camera')
+    dir_mtime_ns = dset.path.stat().st_mtime_ns
+
+    # probing only reads the dataset, unless caching next to it was requested
+    cache_dir = tmp_path / 'cache'
+    probe = video.probe_dataset(dset, cache=cache_dir)
+    assert len(probe.parts) == 1
+    part = probe.parts[0]
+    assert part.fname == dset.path / 'video.mkv'
+    assert part.frame_count == 971
+    assert part.fps == 15.0
+    assert (part.width, part.height) == (160, 160)
+    assert part.codec == 'VP90'
+    assert probe.timestamp_count == 971
+    assert probe.timestamps_match
+    probe.validate()
+    assert dset.path.stat().st_mtime_ns == dir_mtime_ns
+    assert not (dset.path / video.PROBE_CACHE_FNAME).exists()
+    assert len(list(cache_dir.iterdir())) == 1
+    assert repr(video.probe_dataset(dset)) == repr(probe)
+    assert repr(video.probe_dataset(dset, cache=True)) == repr(probe)
+    assert (dset.path / video.PROBE_CACHE_FNAME).is_file()
+
+    # a second probe must be answered from the cache alone
+    def fail(*args: object) -> None:
+        raise AssertionError('video was probed again')
+
+    monkeypatch.setattr(video, '_probe_part', fail)
+    monkeypatch.setattr(video, '_count_timestamps', fail)
+    for cache in (cache_dir, True):
+        cached = video.probe_dataset(dset, cache=cache)
+        assert repr(cached) == repr(probe)
+    monkeypatch.undo()
+
+    # replacing the timestamps with a too short table is reported up front
+    dset.aux_data.clear()
+    aux = EDLDataFile(dset.path, media_type='text/csv')
+    _, csv_fname = aux.new_part('timestamps.csv')
+    csv_fname.write_text('frame;timestamp\n0;100\n1;200\n', encoding='utf-8')
+    dset.add_aux_data(aux)
+    probe = video.probe_dataset(dset)
+    assert probe.timestamp_count == 2
+    assert not probe.timestamps_match
+    with pytest.raises(ValueError):
+        probe.validate()
+
+
 def test_load_json_csv(samples_dir: Path) -> None:
     jcstore = edlio.load(samples_dir / 'jsoncsv1')
     assert isinstance(jcstore, edlio.EDLCollection)
@@ -245,6 +422,470 @@ def test_load_json_csv(samples_dir: Path) -> None:
     assert rows[-1] == ['20015', 'beta', 'eLcwGIFVu1A9NV']
 
 
+def test_load_csv_as_arrays(tmp_path: Path, samples_dir: Path) -> None:
+    from edlio.dataio.csvdata import load_data as load_csv_data
+
+    jcstore = edlio.load(samples_dir / 'jsoncsv1')
+    dset = jcstore.dataset_by_name('table-csv')
+    tables = list(dset.read_data(as_arrays=True))
+    assert len(tables) == 1
+    table = tables[0]
+    assert list(table.keys()) == ['Time', 'Tag', 'Value']
+    assert table['Time'].dtype == np.int64
+    assert table['Time'].tolist() == [4004, 8007, 12008, 16013, 20015]
+    assert table['Tag'].dtype.kind == 'U'
+    assert table['Value'][-1] == 'eLcwGIFVu1A9NV'
+
+    # dtype hints from the dataset attributes take precedence over guessed types
+    dset.attributes['csv_dtypes'] = {'Time': 'uint32'}
+    table = next(dset.read_data(as_arrays=True))
+    assert table['Time'].dtype == np.uint32
+
+    # columns are widened if later blocks do not fit the type guessed first
+    fname = tmp_path / 'mixed.csv'
+    fname.write_text('a;b;c\n1;2;3\n4;5.5;x\n', encoding='utf-8')
+    table = next(load_csv_data([fname], [], as_arrays=True))
+    assert table['a'].dtype == np.int64
+    assert table['b'].dtype == np.float64
+    assert table['b'].tolist() == [2.0, 5.5]
+    assert table['c'].tolist() == ['3', 'x']
+
+    # ...also when a text value only shows up in a later block
+    from edlio.dataio.csvdata import _read_csv_arrays
+
+    table = _read_csv_arrays(fname, None, block_rows=1)
+    assert table['b'].dtype == np.float64
+    assert table['c'].tolist() == ['3', 'x']
+
+    with pytest.raises(ValueError):
+        next(load_csv_data([fname], [], as_arrays=True, dtypes={'c': 'int64'}))
+
+
+def test_load_csv_dataframe_chunks(samples_dir: Path) -> None:
+    jcstore = edlio.load(samples_dir / 'jsoncsv1')
+    dset = jcstore.dataset_by_name('table-csv')
+    full = next(dset.read_data(as_dataframe=True))
+
+    chunks = list(dset.read_data(as_dataframe=True, chunksize=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    for chunk in chunks:
+        assert chunk.columns.tolist() == ['Time', 'Tag', 'Value']
+    assert chunks[-1]['Value'].tolist() == ['eLcwGIFVu1A9NV']
+
+    # a tiny memory budget results in single-row chunks
+    chunks = list(dset.read_data(as_dataframe=True, max_memory=1))
+    assert [len(c) for c in chunks] == [1] * len(full)
+    assert list(chunks[0].dtypes) == list(full.dtypes)
+
+
+def test_load_tables_columns_time_range(tmp_path: Path, samples_dir: Path) -> None:
+    jcstore = edlio.load(samples_dir / 'jsoncsv1')
+
+    dset = jcstore.dataset_by_name('table-csv')
+    rows = list(dset.read_data(columns=['Value', 'Tag'], time_range=(8007, 16013)))
+    assert rows == [['Value', 'Tag'], ['iS1IzdPFEGpdil', 'beta'], ['wsllZC1qCdptDh', 'alpha']]
+
+    table = next(dset.read_data(as_arrays=True, columns=['Tag'], time_range=(8000, None)))
+    assert list(table.keys()) == ['Tag']
+    assert table['Tag'].tolist() == ['beta', 'alpha', 'beta', 'beta']
+
+    df = next(dset.read_data(as_dataframe=True, columns=['Value'], time_range=(None, 12009)))
+    assert df.columns.tolist() == ['Value']
+    assert df.shape == (3, 1)
+    chunks = list(dset.read_data(as_dataframe=True, chunksize=2, time_range=(12000, 20000)))
+    assert [c['Time'].tolist() for c in chunks] == [[12008, 16013]]
+
+    dset = jcstore.dataset_by_name('numbers-json')
+    full = next(dset.read_data())
+    df = next(dset.read_data(columns=['Int 1'], time_range=(1000, 2000)))
+    assert df.columns.tolist() == ['Int 1']
+    times = full['timestamp_msec']
+    expected = full[(times >= 1000) & (times < 2000)]
+    assert df['Int 1'].tolist() == expected['Int 1'].tolist()
+
+    dset = jcstore.dataset_by_name('sines-json')
+    df = next(dset.read_data(columns=['Sine 2'], time_range=(1000, 2000)))
+    assert df.columns.tolist() == ['Sine 2']
+    assert len(df) == len(expected)
+
+    # parts outside of the time range are skipped entirely
+    coll = edlio.EDLCollection('rec')
+    coll.root_path = tmp_path
+    dset = coll.dataset_by_name('events', create=True)
+    for i in range(3):
+        _, fname = dset.data.new_part('events-{}.csv'.format(i), i)
+        fname.write_text('time;value\n{};a\n{};b\n'.format(i * 100, i * 100 + 50), encoding='utf-8')
+    tables = list(dset.read_data(as_arrays=True, time_range=(120, 260)))
+    assert len(tables) == 2
+    assert [t['time'].tolist() for t in tables] == [[150], [200, 250]]
+
+
+def test_load_tables_decode_cache(tmp_path: Path, samples_dir: Path) -> None:
+    import os
+
+    from edlio.dataio.csvdata import load_data as load_csv_data
+    from edlio.dataio.jsondata import load_data as load_json_data
+
+    fname = tmp_path / 'table.csv'
+    fname.write_text(
+        'time;value;label\n' + ''.join('{};{};l{}\n'.format(i, i * 0.5, i) for i in range(100)),
+        encoding='utf-8',
+    )
+    expected = next(load_csv_data([fname], [], as_arrays=True))
+    table = next(load_csv_data([fname], [], as_arrays=True, cache=True))
+    assert (tmp_path / '.edlio-cache' / 'table.csv.arrays' / 'meta.json').is_file()
+    assert not isinstance(table['time'], np.memmap)
+
+    # the second read maps the cached columns
+    table = next(load_csv_data([fname], [], as_arrays=True, cache=True))
+    assert isinstance(table['time'], np.memmap)
+    for name, arr in expected.items():
+        assert table[name].dtype == arr.dtype
+        assert table[name].tolist() == arr.tolist()
+    table = next(
+        load_csv_data(
+            [fname], [], as_arrays=True, cache=True, columns=['value'], time_range=(10, 12)
+        )
+    )
+    assert list(table.keys()) == ['value']
+    assert table['value'].tolist() == [5.0, 5.5]
+
+    # different dtypes are decoded anew
+    table = next(load_csv_data([fname], [], as_arrays=True, cache=True, dtypes={'time': 'uint16'}))
+    assert table['time'].dtype == np.uint16
+
+    df = next(load_csv_data([fname], [], as_dataframe=True, cache=True))
+    chunks = list(load_csv_data([fname], [], as_dataframe=True, cache=True, chunksize=40))
+    assert [len(c) for c in chunks] == [40, 40, 20]
+    assert chunks[2]['label'].tolist() == df['label'].tolist()[80:]
+
+    # changing the file invalidates the cache, even if size and mtime are unchanged
+    st = fname.stat()
+    fname.write_text(fname.read_text().replace('time;', 'tick;'), encoding='utf-8')
+    os.utime(fname, ns=(st.st_atime_ns, st.st_mtime_ns))
+    table = next(load_csv_data([fname], [], as_arrays=True, cache=True))
+    assert list(table.keys())[0] == 'tick'
+
+    # read-only sample data can be cached in a separate directory
+    cache_dir = tmp_path / 'cache'
+    jcstore = edlio.load(samples_dir / 'jsoncsv1')
+    dset = jcstore.dataset_by_name('numbers-json')
+    expected_df = next(dset.read_data())
+    for _ in range(2):
+        df = next(dset.read_data(cache=cache_dir, time_range=(1000, None)))
+        assert df.attrs['time_unit'] == 'milliseconds'
+        assert df.values.tolist() == expected_df[expected_df.iloc[:, 0] >= 1000].values.tolist()
+    assert len(list(cache_dir.iterdir())) == 1
+    assert not (samples_dir / 'jsoncsv1' / 'numbers-json' / '.edlio-cache').exists()
+
+    fname = tmp_path / 'split.json'
+    fname.write_text(
+        '{"columns": ["t", "x"], "index": [0, 1], "data": [[1, 0.5], [2, 1.5]]}', encoding='utf-8'
+    )
+    for _ in range(2):
+        df = next(load_json_data([fname], [], cache=True))
+        assert df['x'].tolist() == [0.5, 1.5]
+
+
+def test_load_csv_decode_cache_bounded_memory(tmp_path: Path, monkeypatch) -> None:
+    import pandas as pd
+
+    from edlio.dataio.csvdata import load_data as load_csv_data
+
+    fname = tmp_path / 'table.csv'
+    fname.write_text(
+        'time;value;label\n'
+        + ''.join('{};{};l{}\n'.format(i, i * 0.5, i % 120) for i in range(5000)),
+        encoding='utf-8',
+    )
+    expected = next(load_csv_data([fname], [], as_dataframe=True))
+
+    # with a cold cache, the part must still only be parsed in chunks
+    read_csv = pd.read_csv
+    unbounded_reads = []
+
+    def checked_read_csv(*args, **kwargs):
+        if not kwargs.get('chunksize') and not kwargs.get('nrows'):
+            unbounded_reads.append(kwargs)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_csv', checked_read_csv)
+    cache_dir = tmp_path / 'cache'
+    for _ in range(2):
+        chunks = list(
+            load_csv_data(
+                [fname],
+                [],
+                as_dataframe=True,
+                cache=cache_dir,
+                max_memory=20_000,
+                columns=['label'],
+                time_range=(100, 4000),
+            )
+        )
+        assert len(chunks) > 1
+        assert all(c.memory_usage(deep=True).sum() < 20_000 * 1.2 for c in chunks)
+        df = pd.concat(chunks)
+        assert list(df.columns) == ['label']
+        assert df['label'].tolist() == expected['label'].tolist()[100:4000]
+        assert not unbounded_reads
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # the cache holds the whole table, not just the selection it was filled by
+    df = next(load_csv_data([fname], [], as_dataframe=True, cache=cache_dir))
+    assert df.values.tolist() == expected.values.tolist()
+    assert not unbounded_reads
+
+    # reading only part of the table does not leave an incomplete cache entry
+    fname.write_text(fname.read_text(encoding='utf-8') + '5000;1.0;l0\n', encoding='utf-8')
+    chunks = load_csv_data([fname], [], as_dataframe=True, cache=cache_dir, chunksize=100)
+    next(chunks)
+    chunks.close()
+    assert not [p for p in cache_dir.iterdir() if '.tmp-' in p.name]
+    df = next(load_csv_data([fname], [], as_dataframe=True, cache=cache_dir))
+    assert len(df) == 5001
+
+
+def test_load_tables_compact(tmp_path: Path, samples_dir: Path) -> None:
+    from edlio.dataio.csvdata import load_data as load_csv_data
+
+    jcstore = edlio.load(samples_dir / 'jsoncsv1')
+    dset = jcstore.dataset_by_name('numbers-json')
+    df = next(dset.read_data())
+    cdf = next(dset.read_data(compact=True))
+    assert cdf['timestamp_msec'].dtype == np.int64
+    assert cdf['Int 1'].dtype.itemsize < df['Int 1'].dtype.itemsize
+    assert cdf['Int 1'].tolist() == df['Int 1'].tolist()
+    assert cdf.attrs['time_unit'] == 'milliseconds'
+    assert cdf.memory_usage().sum() < df.memory_usage().sum()
+
+    fname = tmp_path / 'table.csv'
+    fname.write_text(
+        'time;x;y;tag;name\n'
+        + ''.join(
+            '{}.0;{};{};{};n{}\n'.format(i, i * 0.5, i / 3, 'ab'[i % 2], i) for i in range(100)
+        ),
+        encoding='utf-8',
+    )
+    df = next(load_csv_data([fname], [], as_dataframe=True, compact=True))
+    assert df['time'].dtype == np.int64
+    assert df['x'].dtype == np.float32
+    assert df['x'].tolist() == [i * 0.5 for i in range(100)]
+    assert df['y'].dtype == np.float64
+    assert df['tag'].dtype == 'category'
+    assert df['tag'].tolist()[:3] == ['a', 'b', 'a']
+    assert df['name'].dtype != 'category'
+    chunks = list(load_csv_data([fname], [], as_dataframe=True, compact=True, chunksize=30))
+    assert all(c['tag'].dtype == 'category' for c in chunks)
+
+    # all chunks of a read get the types chosen for the first one
+    fname.write_text(
+        'time;k;n;tag;name\n'
+        + ''.join(
+            '{};{};{};{};n{}\n'.format(i, i % 7, i if i < 50 else i * 10, 'ab'[i % 2], i % 5)
+            for i in range(50)
+        )
+        + ''.join(
+            '{};{};{};{};n{}\n'.format(i, i % 7, i * 10, 'abc'[i % 3], i) for i in range(50, 100)
+        ),
+        encoding='utf-8',
+    )
+    chunks = list(load_csv_data([fname], [], as_dataframe=True, compact=True, chunksize=50))
+    assert len(chunks) == 2
+    assert chunks[0]['k'].dtype == chunks[1]['k'].dtype == np.int8
+    # the second chunk alone has too many distinct names to become categorical
+    assert all(c['name'].dtype == 'category' for c in chunks)
+    assert chunks[1]['name'].tolist() == ['n{}'.format(i) for i in range(50, 100)]
+    # values that do not fit widen the type, keeping the codes of known categories
+    assert chunks[0]['n'].dtype == np.int8
+    assert chunks[1]['n'].dtype == np.int16
+    assert chunks[1]['n'].tolist() == [i * 10 for i in range(50, 100)]
+    assert chunks[1]['tag'].cat.categories.tolist() == ['a', 'b', 'c']
+    assert chunks[0]['tag'].cat.categories.tolist() == ['a', 'b']
+    assert chunks[1]['tag'].tolist() == ['abc'[i % 3] for i in range(50, 100)]
+
+
+def test_load_tables_as_arrow(tmp_path: Path, samples_dir: Path) -> None:
+    import pyarrow as pa
+
+    from edlio.dataio.csvdata import load_data as load_csv_data
+    from edlio.dataio.tabular import concat_arrow
+
+    jcstore = edlio.load(samples_dir / 'jsoncsv1')
+    table = next(jcstore.dataset_by_name('table-csv').read_data(as_arrow=True))
+    assert isinstance(table, pa.Table)
+    assert table.schema.names == ['Time', 'Tag', 'Value']
+    assert table.column('Time').type == pa.int64()
+    assert table.column('Time').to_pylist() == [4004, 8007, 12008, 16013, 20015]
+    table = next(
+        jcstore.dataset_by_name('table-csv').read_data(
+            as_arrow=True, columns=['Tag'], time_range=(8007, 16013)
+        )
+    )
+    assert table.schema.names == ['Tag']
+    assert table.num_rows == 2
+
+    # extended-pandas JSON keeps its metadata
+    dset = jcstore.dataset_by_name('numbers-json')
+    df = next(dset.read_data())
+    table = next(dset.read_data(as_arrow=True))
+    assert table.schema.names == df.columns.tolist()
+    assert table.column(1).to_pylist() == df.iloc[:, 1].tolist()
+    assert table.schema.metadata[b'time_unit'] == b'milliseconds'
+    for cache in (tmp_path / 'cache', tmp_path / 'cache'):
+        table = next(dset.read_data(as_arrow=True, cache=cache, columns=['Int 1']))
+        assert table.column(0).to_pylist() == df['Int 1'].tolist()
+
+    df = next(jcstore.dataset_by_name('table-json').read_data())
+    table = next(jcstore.dataset_by_name('table-json').read_data(as_arrow=True))
+    # values keep the type they have in the JSON document
+    assert table.column('Time').type == pa.string()
+    assert table.column('Value').to_pylist() == df['Value'].tolist()
+
+    # parts are concatenated without copying their data
+    fnames = []
+    for i in range(2):
+        fname = tmp_path / 'part{}.csv'.format(i)
+        fname.write_text(
+            't;v\n' + ''.join('{};{}\n'.format(j, j * 2) for j in range(i * 10, i * 10 + 10)),
+            encoding='utf-8',
+        )
+        fnames.append(fname)
+    parts = list(load_csv_data(fnames, [], as_arrow=True, dtypes={'v': 'float32'}))
+    table = concat_arrow(parts)
+    assert table.num_rows == 20
+    assert table.column('v').type == pa.float32()
+    assert table.column('t').num_chunks == 2
+    assert (
+        table.column('t').chunk(1).buffers()[1].address
+        == parts[1].column('t').chunk(0).buffers()[1].address
+    )
+
+    # timestamps of tsync files
+    tsync_dir = samples_dir / 'tsync'
+    from edlio.dataio.tsyncfile import load_data as load_tsync_data
+
+    table = next(load_tsync_data([tsync_dir / 'syntalos-3.x-valid.tsync'], [], as_arrow=True))
+    assert table.schema.names == ['frame-no', 'master-time']
+    assert table.schema.field('master-time').metadata[b'unit'] == b'microsecond'
+    assert table.schema.metadata[b'generator_name'] == b'VR Raw'
+    assert table.num_rows == 3125
+    assert table.column('master-time')[-1].as_py() == 125006924
+
+
+def test_load_compressed_csv(tmp_path: Path) -> None:
+    import gzip
+
+    import zstandard as zstd
+
+    text = 'time;value\n' + ''.join('{};{}\n'.format(i, i * 2) for i in range(100000))
+
+    coll = edlio.EDLCollection('rec')
+    coll.root_path = tmp_path
+    for ext in ('zst', 'gz'):
+        dset = coll.dataset_by_name('table-' + ext, create=True)
+        dset.data.media_type = 'text/csv'
+        _, fname = dset.data.new_part('table.csv.' + ext)
+        assert dset.data.file_type == 'csv.' + ext
+        if ext == 'zst':
+            fname.write_bytes(zstd.ZstdCompressor().compress(text.encode('utf-8')))
+        else:
+            fname.write_bytes(gzip.compress(text.encode('utf-8')))
+    coll.save()
+
+    for ext in ('zst', 'gz'):
+        dset = edlio.load(tmp_path / 'rec').dataset_by_name('table-' + ext)
+        rows = list(dset.read_data())
+        assert len(rows) == 100001
+        assert rows[-1] == ['99999', '199998']
+
+        table = next(dset.read_data(as_arrays=True))
+        assert table['value'].sum() == 2 * sum(range(100000))
+        df = next(dset.read_data(as_dataframe=True))
+        assert df.shape == (100000, 2)
+
+        # stopping early closes the decompressing stream while it is still being read
+        table = next(dset.read_data(as_arrays=True, time_range=(10, 20)))
+        assert table['time'].tolist() == list(range(10, 20))
+
+    # the file type tells the loader what is inside of generically compressed data
+    dset = coll.dataset_by_name('table-zst')
+    dset.data.media_type = 'application/zstd'
+    assert len(list(dset.read_data())) == 100001
+
+
+def test_load_extended_json_streaming(tmp_path: Path, samples_dir: Path) -> None:
+    from edlio.dataio import jsondata
+    from edlio.dataio.compressed import open_part
+
+    fname = samples_dir / 'jsoncsv1' / 'numbers-json' / 'data.json.zst'
+    df = jsondata._read_pandas_extended_json(fname)
+    assert df is not None
+    assert df.attrs == {
+        'collection_id': '336077ed-ea8d-44ce-97b4-42ba1779a25f',
+        'time_unit': 'milliseconds',
+        'data_unit': 'au',
+    }
+    assert df.shape == (4524, 2)
+
+    # tiny blocks and reads must give the same result
+    with open_part(fname, 'r') as f:
+        expected = json.load(f)
+    df = jsondata._read_pandas_extended_json(fname, block_rows=7)
+    assert df is not None
+    assert df.values.tolist() == expected['data']
+
+    # mixed types are promoted, and a column header following the data is fine
+    fname = tmp_path / 'mixed.json'
+    fname.write_text(
+        '{"data": [[1, 2, "a"], [2, 2.5, null], [3, 4, "c"]], "time_unit": "usec", '
+        '"columns": ["t", "x", "label"]}',
+        encoding='utf-8',
+    )
+    df = jsondata._read_pandas_extended_json(fname, block_rows=1)
+    assert df is not None
+    assert df.columns.tolist() == ['t', 'x', 'label']
+    assert df['t'].dtype == np.int64
+    assert df['x'].dtype == np.float64
+    assert df['x'].tolist() == [2.0, 2.5, 4.0]
+    assert df['label'].isna().tolist() == [False, True, False]
+    assert df.attrs == {'time_unit': 'usec'}
+    df = jsondata._read_pandas_extended_json(fname, columns=['x'], time_range=(2, None))
+    assert df is not None
+    assert df['x'].tolist() == [2.5, 4.0]
+
+    # null values in numeric columns are NaN, also if they are in a block of their own
+    fname.write_text(
+        '{"columns": ["t", "v"], "data": [[1, 1.5], [2, null], [3, 2], [4, null]]}',
+        encoding='utf-8',
+    )
+    for block_rows in (1, 8192):
+        df = jsondata._read_pandas_extended_json(fname, block_rows=block_rows)
+        assert df is not None
+        assert df['t'].dtype == np.int64
+        assert df['v'].dtype == np.float64
+        assert df['v'].isna().tolist() == [False, True, False, True]
+
+    # values split between reads are only decoded once they are complete
+    doc = '{"n": 12345, "rows": [[1, "a]"], [2, [3, 4]], [3, "]"]], "x": -1.5e3}'
+    for read_size in (1, 4, 7, 1024):
+        sc = jsondata._JsonStreamScanner(io.StringIO(doc), read_size=read_size)
+        sc.expect('{')
+        assert sc.value() == 'n'
+        sc.expect(':')
+        assert sc.value() == 12345
+        sc.expect(',')
+        assert sc.value() == 'rows'
+        sc.expect(':')
+        sc.expect('[')
+        assert [row for rows in sc.array_items() for row in rows] == json.loads(doc)['rows']
+        sc.expect(',')
+        assert sc.value() == 'x'
+        sc.expect(':')
+        assert sc.value() == -1500.0
+        sc.expect('}')
+
+
 def test_load_zarr(samples_dir: Path) -> None:
     import zarr
 
@@ -323,3 +964,118 @@ def test_load_zarr(samples_dir: Path) -> None:
     assert timestamps.shape == (86,)
     assert timestamps.dtype == np.uint64
     assert timestamps.attrs['time_unit'] == 'microseconds'
+
+
+def test_load_zarr_concatenated(tmp_path: Path) -> None:
+    import zarr
+
+    from edlio.dataio.zarr import ConcatenatedGroup
+
+    coll = edlio.EDLCollection('rec')
+    coll.root_path = tmp_path
+    dset = coll.dataset_by_name('signal', create=True)
+    expected = []
+    start = 0
+    for i, length in enumerate((10, 7, 13)):
+        _, store_path = dset.data.new_part('signal{}.zarr'.format(i), i)
+        root = zarr.open_group(zarr.storage.LocalStore(store_path), mode='w')
+        data = np.arange(start * 3, (start + length) * 3, dtype=np.int32).reshape(length, 3)
+        root.create_array('data', data=data, chunks=(4, 3))
+        root.create_array('timestamps', data=np.arange(start, start + length, dtype=np.uint64))
+        expected.append(data)
+        start += length
+    coll.save()
+    full = np.concatenate(expected)
+
+    dset = edlio.load(tmp_path / 'rec').dataset_by_name('signal')
+    zgroup = next(dset.read_data(concat=True))
+    assert isinstance(zgroup, ConcatenatedGroup)
+    assert sorted(zgroup.array_keys()) == ['data', 'timestamps']
+    data = zgroup['data']
+    assert zgroup['data'] is data
+    assert data.shape == (30, 3)
+    assert data.dtype == np.int32
+    assert data.offsets.tolist() == [0, 10, 17]
+    assert np.array_equal(np.asarray(data), full)
+    assert np.array_equal(zgroup['timestamps'][:], np.arange(30))
+
+    for sel in (
+        slice(None),
+        slice(8, 12),
+        slice(9, 25, 3),
+        slice(1, 29, 4),
+        slice(None, None, -1),
+        slice(25, 3, -5),
+        slice(17, 17),
+        slice(-5, None),
+    ):
+        assert np.array_equal(data[sel], full[sel]), sel
+    assert np.array_equal(data[5:20, 1], full[5:20, 1])
+    assert np.array_equal(data[..., 2], full[..., 2])
+    assert np.array_equal(data[17], full[17])
+    assert data[-1, 0] == full[-1, 0]
+    with pytest.raises(IndexError):
+        data[30]
+    with pytest.raises(TypeError):
+        data[[1, 2]]
+
+
+def test_async_load_and_read(samples_dir: Path) -> None:
+    import asyncio
+
+    async def read_all(dset: edlio.EDLDataset) -> list:
+        return [chunk async for chunk in dset.aread_data()]
+
+    async def run() -> tuple[list, list, int]:
+        jcstore = await edlio.aload(samples_dir / 'jsoncsv1')
+        assert isinstance(jcstore, edlio.EDLCollection)
+        coll = edlio.EDLCollection()
+        await coll.aload(samples_dir / 'jsoncsv1', lazy=True)
+        assert coll.dataset_by_name('table-csv') is not None
+
+        # read several datasets at once
+        json_chunks, csv_chunks = await asyncio.gather(
+            read_all(jcstore.dataset_by_name('numbers-json')),
+            read_all(jcstore.dataset_by_name('table-csv')),
+        )
+
+        # stopping early closes the underlying reader
+        n = 0
+        agen = jcstore.dataset_by_name('table-csv').aread_data(chunksize=2)
+        async for _ in agen:
+            n += 1
+            break
+        await agen.aclose()
+        return json_chunks, csv_chunks, n
+
+    json_chunks, csv_chunks, n = asyncio.run(run())
+    jcstore = edlio.load(samples_dir / 'jsoncsv1')
+    expected_json = list(jcstore.dataset_by_name('numbers-json').read_data())
+    expected_csv = list(jcstore.dataset_by_name('table-csv').read_data())
+    assert len(json_chunks) == len(expected_json)
+    assert all(a.equals(b) for a, b in zip(json_chunks, expected_json))
+    assert csv_chunks == expected_csv
+    assert n == 1
+
+
+def test_load_video_check_frames_detects_surplus_timestamps(
+    tmp_path: Path, samples_dir: Path
+) -> None:
+    video_fname = samples_dir / 'blink1' / 'videos' / 'generic-camera' / 'video.mkv'
+    for n_times, ok in ((971, True), (972, False)):
+        ts_dir = tmp_path / str(n_times)
+        ts_dir.mkdir()
+        (ts_dir / 'times.csv').write_text(
+            'frame;timestamp\n' + ''.join('{};{}\n'.format(i, i * 1000) for i in range(n_times)),
+            encoding='utf-8',
+        )
+        aux_data = EDLDataFile(ts_dir, file_type='csv')
+        aux_data.parts.append(EDLDataPart('times.csv'))
+
+        times = load_video_data([video_fname], [aux_data], timestamps_only=True, check_frames=True)
+        if ok:
+            assert len(list(times)) == 971
+        else:
+            # the video has fewer frames than there are timestamps
+            with pytest.raises(ValueError):
+                list(times)
@@ -18,6 +18,10 @@
 # along with this software.  If not, see <http://www.gnu.org/licenses/>.
 
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
 
 import edlio
 from edlio import EDLDataFile
@@ -97,3 +101,146 @@ def test_save_dataset_without_parts_omits_data(tmp_path: Path) -> None:
     dset = reloaded.dataset_by_name('empty')
     assert dset is not None
     assert dset.data.parts == []
+
+
+def test_save_only_writes_modified_units(tmp_path: Path) -> None:
+    coll = _build_collection(tmp_path)
+    coll.save()
+
+    def file_ids() -> dict[str, int]:
+        # files are replaced on save, so their inode tells whether they were written
+        return {str(p.relative_to(tmp_path)): p.stat().st_ino for p in tmp_path.rglob('*.toml')}
+
+    before = file_ids()
+    coll.save()
+    assert file_ids() == before
+
+    # adding a dataset writes only the files of the new dataset
+    videos = coll.group_by_name('videos')
+    videos.dataset_by_name('camera2', create=True)
+    coll.save()
+    after = file_ids()
+    assert set(after) - set(before) == {'myrec/videos/camera2/manifest.toml'}
+    assert {k: v for k, v in after.items() if k in before} == before
+
+    # in-place changes of attributes and parts are detected
+    dset = videos.dataset_by_name('camera')
+    dset.attributes['fps'] = 30
+    coll.save()
+    changed = {k for k, v in file_ids().items() if after.get(k) != v}
+    assert changed == {'myrec/videos/camera/attributes.toml'}
+
+    before = file_ids()
+    dset.data.new_part('camera-2.mkv')
+    coll.save()
+    changed = {k for k, v in file_ids().items() if before.get(k) != v}
+    assert changed == {'myrec/videos/camera/manifest.toml'}
+
+    # a reloaded collection is not written again, and removed attributes are removed on disk
+    reloaded = edlio.load(tmp_path / 'myrec')
+    before = file_ids()
+    reloaded.save()
+    assert file_ids() == before
+    rdset = reloaded.resolve('videos/camera')
+    assert [str(p.fname) for p in rdset.data.parts] == ['camera.mkv', 'camera-2.mkv']
+    rdset.attributes = {}
+    reloaded.save()
+    assert not (rdset.path / 'attributes.toml').exists()
+    assert edlio.load(rdset.path).attributes == {}
+
+
+def test_many_parts_are_indexed_and_roundtrip(tmp_path: Path) -> None:
+    import copy
+
+    coll = edlio.EDLCollection('rec')
+    coll.root_path = tmp_path
+    dset = coll.dataset_by_name('numbers', create=True)
+    n_parts = 2000
+    for i in range(n_parts):
+        dset.data.new_part('values-{:05d}.csv'.format(i), i)
+    with pytest.raises(ValueError):
+        dset.data.new_part('values-00042.csv')
+    part, _ = dset.data.new_part('./values-00042.csv', allow_exists=True)
+    assert part is dset.data.parts[42]
+    assert not hasattr(part, '__dict__')
+
+    # changing the part list directly keeps the index in sync
+    dset.data.parts.remove(part)
+    dset.data.new_part('values-00042.csv', 42)
+    dset.data.parts = [p for p in dset.data.parts if p.index != 7]
+    dset.data.new_part('values-00007.csv', 7)
+    assert copy.deepcopy(dset.data.parts) == dset.data.parts
+
+    # renamed parts are found by their new name
+    part = dset.data.parts[3]
+    part.fname = 'renamed.csv'
+    assert str(part.fname) == 'renamed.csv'
+    assert dset.data.parts.find('renamed.csv') is part
+    assert dset.data.parts.find('values-00003.csv') is None
+    part.fname = 'values-00003.csv'
+    with pytest.raises(ValueError):
+        dset.data.new_part('values-00003.csv')
+    coll.save()
+
+    reloaded = edlio.load(tmp_path / 'rec').dataset_by_name('numbers')
+    parts = reloaded.data.parts
+    assert [p.index for p in parts] == list(range(n_parts))
+    assert [str(p.fname) for p in parts[:2]] == ['values-00000.csv', 'values-00001.csv']
+    with pytest.raises(ValueError):
+        reloaded.data.new_part('values-01999.csv')
+
+
+def test_create_zarr_parts(tmp_path: Path) -> None:
+    pytest.importorskip('zarr')
+
+    coll = edlio.EDLCollection('rec')
+    coll.root_path = tmp_path
+    dset = coll.dataset_by_name('signal', create=True)
+
+    # time series data, written chunk by chunk from multiple threads
+    root = dset.create_zarr_part(
+        'signal0', (10000, 4), 'float32', index=0, attributes={'data_unit': 'au'}
+    )
+    data = root['data']
+    # about 1 MiB of rows per chunk
+    assert data.chunks == (65536, 4)
+    assert data.metadata.dimension_names == ('time', None)
+    expected = np.random.default_rng(0).random((10000, 4), dtype=np.float32)
+    step = 2048
+    data = dset.create_zarr_part(
+        'signal1', (10000, 4), 'float32', index=1, chunks=(step, 4), time_unit=None
+    )['data']
+
+    def write_block(start: int) -> None:
+        data[start : start + step] = expected[start : start + step]
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(write_block, range(0, 10000, step)))
+    root['data'][:] = expected
+    root['timestamps'][:] = np.arange(10000, dtype=np.uint64) * 1000
+
+    with pytest.raises(ValueError):
+        dset.create_zarr_part('signal0.zarr', (1,), 'int8')
+    with pytest.raises(ValueError):
+        dset.create_zarr_part('bad', (1,), 'int8', preset='unknown')
+
+    # image stacks are sharded, and may grow over time
+    frames = coll.dataset_by_name('frames', create=True)
+    root = frames.create_zarr_part('frames', (0, 32, 24), 'uint8', preset='images')
+    assert root['data'].chunks == (1, 32, 24)
+    assert root['data'].shards == (64, 32, 24)
+    root['data'].append(np.ones((100, 32, 24), dtype=np.uint8))
+
+    # the parts are registered in the dataset manifests right away
+    dset = edlio.load(tmp_path / 'rec' / 'signal')
+    assert [str(p.fname) for p in dset.data.parts] == ['signal0.zarr', 'signal1.zarr']
+    stores = list(dset.read_data())
+    assert stores[0]['data'].attrs['data_unit'] == 'au'
+    assert stores[0]['timestamps'].attrs['time_unit'] == 'microseconds'
+    assert 'timestamps' not in stores[1]
+    assert np.array_equal(stores[0]['data'][:], expected)
+    assert np.array_equal(stores[1]['data'][:], expected)
+
+    zgroup = next(edlio.load(tmp_path / 'rec' / 'frames').read_data(concat=True))
+    assert zgroup['data'].shape == (100, 32, 24)
+    assert zgroup['data'][99].sum() == 32 * 24